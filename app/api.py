@@ -0,0 +1,47 @@
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
+
+from app.services import export, jobid, metrics
+
+LOCAL_HOSTS = ("127.0.0.1", "::1", "localhost")
+
+api = FastAPI()
+
+
+@api.get("/api/transactions/export")
+def export_transactions(token: str) -> StreamingResponse:
+    """Stream a signed transaction export (see `WalletState.export_transactions`)."""
+    try:
+        request = export.verify(token)
+    except export.InvalidLink as e:
+        raise HTTPException(status_code=403, detail=str(e)) from e
+    if not export.available(request.format):
+        raise HTTPException(
+            status_code=501, detail=f"{request.format} export is not installed"
+        )
+    return StreamingResponse(
+        export.stream(request),
+        media_type=export.FORMATS[request.format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{request.filename}"'
+        },
+    )
+
+
+@api.get("/api/jobid/{digest}")
+def download_job_id(digest: str) -> FileResponse:
+    """Serve a JobID bundle built by `ProfileState.download_job_id`."""
+    path = jobid.path_of(digest)
+    if not jobid.DIGEST_PATTERN.fullmatch(digest) or not path.exists():
+        raise HTTPException(status_code=404, detail="Unknown JobID bundle")
+    return FileResponse(path, media_type="application/zip", filename="jobid.zip")
+
+
+@api.get("/api/metrics")
+def prometheus_metrics(request: Request) -> PlainTextResponse:
+    """Per-handler event costs and service counters, for local scrapers only."""
+    if request.client is None or request.client.host not in LOCAL_HOSTS:
+        raise HTTPException(status_code=403, detail="Metrics are local only")
+    return PlainTextResponse(
+        metrics.registry.prometheus(), media_type="text/plain; version=0.0.4"
+    )
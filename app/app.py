@@ -1,6 +1,8 @@
-import sqlite3
-conn = sqlite3.connect(":memory:") 
-from app.components import header, main_content
+import reflex as rx
+from app import middleware, state_manager
+from app.api import api
+from app.services import ledger, pubsub, search
+from app.components import debug_overlay, header, main_content
 from app.state import AppState
 from app.states.chat_state import ChatState
 from app.states.wallet_state import WalletState
@@ -8,11 +10,18 @@ from app.states.projects_state import ProjectsState
 from app.states.profile_state import ProfileState
 
 
+def client_connected(token: str) -> bool:
+    """Whether a socket for this client token is open on the event namespace."""
+    namespace = app.event_namespace
+    return namespace is None or token in namespace.token_to_sid
+
+
 def index() -> rx.Component:
     """The main view of the app."""
     return rx.el.div(
         header(),
         main_content(),
+        debug_overlay(),
         class_name=rx.cond(AppState.is_dark_mode, "dark bg-gray-900", "bg-white"),
     )
 
@@ -28,7 +37,11 @@ app = rx.App(
             rel="stylesheet",
         ),
     ],
+    api_transformer=api,
 )
-app.add_page(
-    index, on_load=[AppState.on_load, ProjectsState.on_load, ProfileState.on_load]
-)
+state_manager.install(app)
+middleware.install(app)
+app.register_lifespan_task(ledger.migrate)
+app.register_lifespan_task(search.start)
+pubsub.set_connection_check(client_connected)
+app.add_page(index, on_load=AppState.on_load)
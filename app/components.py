@@ -1,5 +1,15 @@
 import reflex as rx
-from app.state import AppState, Suggestion, Proposal
+from app.state import (
+    AppState,
+    Suggestion,
+    Proposal,
+    SUGGESTION_COLUMNS,
+    SUGGESTION_ROW_HEIGHT,
+    SUGGESTION_VIEWPORT_HEIGHT,
+)
+from app.services import metrics, windowing
+from app.services.search import SearchHit
+from app.services.transactions import TxType
 from app.states.chat_state import ChatState, Message
 
 
@@ -11,6 +21,7 @@ def header() -> rx.Component:
                 rx.el.span("Assura", class_name="text-2xl font-bold text-white"),
                 class_name="flex items-center gap-3",
             ),
+            search_bar(),
             rx.el.div(
                 rx.el.nav(
                     rx.foreach(AppState.tabs, lambda item: nav_item(item)),
@@ -51,6 +62,66 @@ def header() -> rx.Component:
     )
 
 
+def search_bar() -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.icon("search", class_name="h-4 w-4 text-gray-400"),
+            rx.el.input(
+                placeholder="Search people, projects, proposals...",
+                value=AppState.search_query,
+                on_change=AppState.set_search_query.debounce(150),
+                class_name="flex-1 bg-transparent text-sm text-white placeholder-gray-400 focus:outline-none",
+            ),
+            rx.cond(
+                AppState.search_query != "",
+                rx.el.button(
+                    rx.icon("x", class_name="h-4 w-4"),
+                    on_click=AppState.clear_search,
+                    class_name="text-gray-400 hover:text-white",
+                ),
+                None,
+            ),
+            class_name="flex items-center gap-2 px-3 py-2 rounded-lg bg-gray-800/70 border border-gray-700",
+        ),
+        rx.cond(
+            AppState.search_results.length() > 0,
+            rx.el.div(
+                rx.foreach(AppState.search_results, search_result_item),
+                class_name="absolute left-0 right-0 mt-2 rounded-lg shadow-2xl overflow-hidden border "
+                + rx.cond(
+                    AppState.is_dark_mode,
+                    "bg-gray-800 border-gray-700 text-gray-100",
+                    "bg-white border-gray-200 text-gray-900",
+                ),
+            ),
+            None,
+        ),
+        class_name="relative flex-1 max-w-md mx-4 hidden sm:block",
+    )
+
+
+def search_result_item(hit: SearchHit) -> rx.Component:
+    return rx.el.button(
+        rx.icon(
+            rx.match(
+                hit["kind"],
+                ("suggestion", "user"),
+                ("project", "briefcase"),
+                "gavel",
+            ),
+            class_name="h-4 w-4 text-teal-500",
+        ),
+        rx.el.div(
+            rx.el.p(hit["title"], class_name="text-sm font-semibold truncate"),
+            rx.el.p(hit["subtitle"], class_name="text-xs text-gray-400 truncate"),
+            class_name="flex-1 text-left min-w-0",
+        ),
+        on_click=lambda: AppState.open_search_result(hit),
+        class_name="flex items-center gap-3 w-full px-4 py-2 transition-colors "
+        + rx.cond(AppState.is_dark_mode, "hover:bg-gray-700", "hover:bg-gray-100"),
+    )
+
+
 def nav_item(text: str) -> rx.Component:
     return rx.el.a(
         rx.el.p(
@@ -62,6 +133,8 @@ def nav_item(text: str) -> rx.Component:
             ),
         ),
         on_click=lambda: AppState.set_active_tab(text),
+        # Hovering long enough to mean it starts loading the tab's data.
+        on_mouse_enter=AppState.prefetch_tab(text).debounce(150),
         class_name="px-3 py-2 rounded-md text-sm cursor-pointer",
     )
 
@@ -81,9 +154,15 @@ def mobile_nav_item(text: str) -> rx.Component:
     )
 
 
-from app.states.wallet_state import WalletState, Transaction
+from app.states.wallet_state import (
+    WalletState,
+    Transaction,
+    TX_ROW_HEIGHT,
+    TX_VIEWPORT_HEIGHT,
+)
 from app.states.projects_state import ProjectsState, Project
 from app.states.profile_state import ProfileState
+from app.states.debug_state import DebugState
 
 
 def main_content() -> rx.Component:
@@ -206,9 +285,100 @@ def balance_card(title: str, balance: rx.Var[float], currency: str) -> rx.Compon
     )
 
 
+def rollup_chart(
+    title: str, data: rx.Var[list], data_key: str, x_key: str, color: str
+) -> rx.Component:
+    axis_color = rx.cond(AppState.is_dark_mode, "#6B7280", "#9CA3AF")
+    return rx.el.div(
+        rx.el.h3(title, class_name="text-sm font-semibold text-gray-400 mb-2"),
+        rx.recharts.bar_chart(
+            rx.recharts.cartesian_grid(stroke_dasharray="3 3", stroke_opacity=0.2),
+            rx.recharts.x_axis(data_key=x_key, stroke=axis_color),
+            rx.recharts.y_axis(stroke=axis_color),
+            rx.recharts.tooltip(
+                content_style={
+                    "backgroundColor": rx.cond(
+                        AppState.is_dark_mode, "#1F2937", "#FFFFFF"
+                    ),
+                    "borderColor": "#374151",
+                }
+            ),
+            rx.recharts.bar(data_key=data_key, fill=color),
+            data=data,
+            height=200,
+        ),
+        class_name="p-6 rounded-xl shadow-md border transition-colors "
+        + rx.cond(
+            AppState.is_dark_mode,
+            "bg-gray-800 border-gray-700",
+            "bg-white border-gray-200",
+        ),
+    )
+
+
+def transaction_analytics() -> rx.Component:
+    """Volume and fee charts, read from the ledger's rollups."""
+    return rx.el.div(
+        rollup_chart(
+            "Daily Volume (USD)", WalletState.tx_daily, "volume", "day", "#2DD4BF"
+        ),
+        rollup_chart(
+            "Daily Fees (USD)", WalletState.tx_daily, "fees", "day", "#F59E0B"
+        ),
+        rollup_chart(
+            "Volume by Type (USD)", WalletState.tx_by_type, "volume", "type", "#6366F1"
+        ),
+        class_name="grid grid-cols-1 lg:grid-cols-3 gap-4 mb-6",
+    )
+
+
+def export_select(name: str, *options: tuple[str, str]) -> rx.Component:
+    return rx.el.select(
+        *[rx.el.option(label, value=value) for label, value in options],
+        name=name,
+        class_name="p-2 border rounded-md transition-colors text-sm "
+        + rx.cond(
+            AppState.is_dark_mode,
+            "bg-gray-700 border-gray-600",
+            "bg-white border-gray-300",
+        ),
+    )
+
+
+def transaction_export() -> rx.Component:
+    return rx.el.form(
+        export_select(
+            "days",
+            ("All time", "all"),
+            ("Last 7 days", "7"),
+            ("Last 30 days", "30"),
+            ("Last 90 days", "90"),
+        ),
+        export_select(
+            "type",
+            ("All types", "all"),
+            *[(t.label, t.name) for t in TxType],
+        ),
+        export_select("format", ("CSV", "csv"), ("Parquet", "parquet")),
+        rx.el.button(
+            rx.icon("download", class_name="h-4 w-4"),
+            "Export",
+            type="submit",
+            class_name="wallet-button flex items-center gap-2",
+        ),
+        on_submit=WalletState.export_transactions,
+        class_name="flex flex-wrap items-center gap-2",
+    )
+
+
 def transaction_history() -> rx.Component:
     return rx.el.div(
-        rx.el.h2("Transaction History", class_name="text-2xl font-bold mb-4"),
+        rx.el.div(
+            rx.el.h2("Transaction History", class_name="text-2xl font-bold"),
+            transaction_export(),
+            class_name="flex flex-wrap items-center justify-between gap-4 mb-4",
+        ),
+        transaction_analytics(),
         rx.el.div(
             rx.el.div(
                 rx.el.div("Type", class_name="transaction-header"),
@@ -223,10 +393,89 @@ def transaction_history() -> rx.Component:
                     "border-gray-200 bg-gray-50",
                 ),
             ),
-            rx.foreach(WalletState.transactions, transaction_row),
+            windowed_list(
+                "transaction-window",
+                WalletState.transactions,
+                transaction_row,
+                total=WalletState.tx_total,
+                start=WalletState.tx_window_start,
+                on_scroll=WalletState.scroll_transactions,
+                row_height=TX_ROW_HEIGHT,
+                viewport_height=TX_VIEWPORT_HEIGHT,
+            ),
             class_name="rounded-xl border overflow-hidden "
             + rx.cond(AppState.is_dark_mode, "border-gray-700", "border-gray-200"),
         ),
+        rx.el.p(
+            f"{WalletState.tx_total.to_string()} transactions",
+            class_name="text-sm text-gray-500 dark:text-gray-400 mt-2",
+        ),
+    )
+
+
+def windowed_list(
+    element_id: str,
+    items: rx.Var[list],
+    render_fn,
+    *,
+    total: rx.Var[int],
+    start: rx.Var[int],
+    on_scroll: rx.event.EventHandler,
+    row_height: int,
+    viewport_height: int,
+    columns: rx.Var[int] | int = 1,
+    max_columns: int = 1,
+) -> rx.Component:
+    """A scroll container that only renders the rows the server sent.
+
+    `items` is the current window of a longer list, beginning at index
+    `start` of `total`. A spacer keeps the scrollbar sized for the full list
+    and the window is translated into place; scrolling reports `scrollTop`
+    to `on_scroll`, which swaps in the next window.
+
+    With `max_columns` > 1 the list is one column below the `md` breakpoint
+    and `max_columns` from it up. The client reports which as `on_scroll`'s
+    second argument (also on mount), and `columns` is the count the server
+    windowed by.
+    """
+    element = f"document.getElementById('{element_id}')"
+    scroll_top = rx.Var(f"{element}.scrollTop").to(int)
+    row_count = (total + columns - 1) // columns
+    offset = start // columns * row_height
+    layout = "grid gap-x-4"
+    report = on_scroll(scroll_top)
+    mounted = None
+    if max_columns > 1:
+        layout += f" grid-cols-1 md:grid-cols-{max_columns}"
+        shown = rx.Var(
+            f"(window.matchMedia('(min-width: {windowing.WIDE_MIN_WIDTH}px)')"
+            f".matches ? {max_columns} : 1)"
+        ).to(int)
+        report = on_scroll(scroll_top, shown)
+        mounted = on_scroll(
+            rx.Var(f"({element}?.scrollTop ?? 0)").to(int), shown
+        )
+    return rx.el.div(
+        rx.el.div(
+            rx.el.div(
+                rx.foreach(
+                    items,
+                    lambda item: rx.el.div(
+                        render_fn(item),
+                        style={"height": f"{row_height}px"},
+                        class_name="overflow-hidden",
+                    ),
+                ),
+                style={"transform": f"translateY({offset.to_string()}px)"},
+                class_name=layout,
+            ),
+            style={"height": f"{(row_count * row_height).to_string()}px"},
+        ),
+        id=element_id,
+        on_scroll=report.throttle(50),
+        on_mount=mounted,
+        style={"maxHeight": f"{viewport_height}px"},
+        class_name="overflow-y-auto",
     )
 
 
@@ -471,15 +720,56 @@ def community_toggle() -> rx.Component:
     )
 
 
+def room_selector() -> rx.Component:
+    return rx.el.div(
+        rx.foreach(
+            ChatState.rooms,
+            lambda room: rx.el.button(
+                rx.cond(room == "direct", "Alex (DM)", "#" + room),
+                on_click=lambda: ChatState.set_room(room),
+                class_name=rx.cond(
+                    ChatState.room == room,
+                    "px-3 py-1 rounded-full text-sm bg-teal-600 text-white font-semibold",
+                    "px-3 py-1 rounded-full text-sm bg-gray-200 dark:bg-gray-700 hover:bg-gray-300 dark:hover:bg-gray-600",
+                ),
+            ),
+        ),
+        class_name="flex flex-wrap gap-2 mb-3",
+    )
+
+
 def chat_interface() -> rx.Component:
     return rx.el.div(
+        room_selector(),
         rx.el.div(
             rx.el.div(
+                rx.cond(
+                    ChatState.has_older_messages,
+                    rx.el.button(
+                        "Load earlier messages",
+                        on_click=ChatState.load_older_messages,
+                        class_name="block mx-auto text-xs text-teal-500 hover:underline",
+                    ),
+                    None,
+                ),
                 rx.foreach(ChatState.messages, message_bubble),
-                rx.cond(ChatState.is_typing, typing_indicator(), None),
+                rx.foreach(ChatState.new_messages, message_bubble),
+                rx.cond(
+                    ChatState.is_typing & (ChatState.room == "direct"),
+                    typing_indicator(),
+                    None,
+                ),
                 class_name="flex-1 p-4 space-y-4",
             ),
             id="chat-box",
+            on_mount=ChatState.load_chat,
+            # The box is flex-col-reverse, so scrollTop runs from 0 (newest) to
+            # negative values as the user scrolls back through history.
+            on_scroll=ChatState.on_chat_scroll(
+                rx.Var(
+                    "((el) => el.scrollHeight - el.clientHeight - Math.abs(el.scrollTop) < 80)(document.getElementById('chat-box'))"
+                ).to(bool)
+            ).throttle(250),
             class_name="flex flex-col-reverse h-[65vh] overflow-y-auto border rounded-t-xl transition-colors "
             + rx.cond(
                 AppState.is_dark_mode,
@@ -513,11 +803,19 @@ def chat_interface() -> rx.Component:
 
 
 def message_bubble(message: Message) -> rx.Component:
-    is_user = message["sender"] == "You"
+    is_user = message["sender"] == ChatState.user_handle
     return rx.el.div(
         rx.el.div(
             rx.image(src=message["avatar"], class_name="h-8 w-8 rounded-full"),
             rx.el.div(
+                rx.cond(
+                    is_user | (ChatState.room == "direct"),
+                    None,
+                    rx.el.p(
+                        message["sender"],
+                        class_name="text-xs font-semibold text-gray-500 dark:text-gray-400 mb-1",
+                    ),
+                ),
                 rx.el.div(
                     rx.el.p(message["text"], class_name="text-sm"),
                     class_name="p-3 rounded-xl max-w-md "
@@ -570,7 +868,14 @@ def dao_community_view() -> rx.Component:
     )
 
 
+def patched(entity: rx.Var, patches: rx.Var, entity_type: type) -> rx.Var:
+    """`entity` as last patched by its state, else the copy in the list."""
+    key = entity["id"].to_string()
+    return rx.cond(patches.contains(key), patches[key], entity).to(entity_type)
+
+
 def proposal_card(proposal: Proposal) -> rx.Component:
+    proposal = patched(proposal, AppState.proposal_patches, Proposal)
     progress = proposal["votes"] / proposal["threshold"] * 100
     return rx.el.div(
         rx.el.h3(proposal["title"], class_name="font-semibold text-lg mb-2"),
@@ -591,6 +896,13 @@ def proposal_card(proposal: Proposal) -> rx.Component:
                 f"{proposal['votes'].to_string()} / {proposal['threshold'].to_string()} ASRA",
                 class_name="text-xs text-gray-500 dark:text-gray-400 text-right mt-1",
             ),
+            rx.cond(
+                proposal["status"] == "voting",
+                rx.el.p(
+                    f"Voting closes {proposal['closes_at']}",
+                    class_name="text-xs text-gray-500 dark:text-gray-400 text-right",
+                ),
+            ),
             class_name="mb-4",
         ),
         rx.el.div(
@@ -620,6 +932,14 @@ def proposal_card(proposal: Proposal) -> rx.Component:
                         class_name="w-full py-2 px-4 bg-green-600 text-white rounded-lg font-semibold opacity-70 cursor-not-allowed",
                     ),
                 ),
+                (
+                    "rejected",
+                    rx.el.button(
+                        "Rejected",
+                        disabled=True,
+                        class_name="w-full py-2 px-4 bg-gray-500 text-white rounded-lg font-semibold opacity-70 cursor-not-allowed",
+                    ),
+                ),
             ),
             class_name="mt-auto",
         ),
@@ -636,13 +956,17 @@ def token_metrics_panel() -> rx.Component:
     return rx.el.div(
         rx.el.div(
             rx.el.h2("ASRA Token Metrics", class_name="text-xl font-semibold"),
-            rx.el.button(
-                "Refresh",
-                rx.icon("refresh-cw", class_name="ml-2 h-4 w-4"),
-                on_click=AppState.refresh_metrics,
-                class_name="flex items-center px-4 py-2 text-sm bg-teal-600 text-white rounded-lg hover:bg-teal-700 transition-colors",
+            rx.el.div(
+                chart_range_toggle(),
+                rx.el.button(
+                    "Refresh",
+                    rx.icon("refresh-cw", class_name="ml-2 h-4 w-4"),
+                    on_click=AppState.refresh_metrics,
+                    class_name="flex items-center px-4 py-2 text-sm bg-teal-600 text-white rounded-lg hover:bg-teal-700 transition-colors",
+                ),
+                class_name="flex items-center gap-3",
             ),
-            class_name="flex justify-between items-center mb-4",
+            class_name="flex flex-wrap justify-between items-center gap-3 mb-4",
         ),
         rx.el.div(
             metric_card("Total Supply", AppState.token_metrics["total_supply"]),
@@ -700,6 +1024,24 @@ def token_metrics_panel() -> rx.Component:
     )
 
 
+def chart_range_toggle() -> rx.Component:
+    return rx.el.div(
+        rx.foreach(
+            AppState.chart_ranges,
+            lambda range_key: rx.el.button(
+                range_key,
+                on_click=lambda: AppState.set_chart_range(range_key),
+                class_name=rx.cond(
+                    AppState.chart_range == range_key,
+                    "px-3 py-1 text-xs rounded-md bg-teal-600 text-white font-semibold",
+                    "px-3 py-1 text-xs rounded-md bg-gray-200 dark:bg-gray-700 hover:bg-gray-300 dark:hover:bg-gray-600",
+                ),
+            ),
+        ),
+        class_name="flex gap-1",
+    )
+
+
 def metric_card(title: str, value: rx.Var[int]) -> rx.Component:
     return rx.el.div(
         rx.el.p(title, class_name="text-sm text-gray-400"),
@@ -771,10 +1113,32 @@ def create_project_form() -> rx.Component:
 
 def suggestion_feed() -> rx.Component:
     return rx.el.div(
-        rx.el.h3("Suggestion Feed", class_name="text-lg font-semibold mb-4"),
         rx.el.div(
-            rx.foreach(AppState.suggestions, suggestion_card),
-            class_name="grid grid-cols-1 md:grid-cols-2 gap-4",
+            rx.el.h3("Suggestion Feed", class_name="text-lg font-semibold"),
+            rx.el.div(
+                rx.el.span("Ranked for", class_name="text-xs text-gray-400"),
+                rx.foreach(
+                    AppState.interest_tags,
+                    lambda tag: rx.el.span(
+                        tag,
+                        class_name="text-xs px-2 py-1 rounded-full bg-teal-100 text-teal-800 dark:bg-teal-900 dark:text-teal-200",
+                    ),
+                ),
+                class_name="flex flex-wrap items-center gap-2",
+            ),
+            class_name="flex flex-col md:flex-row md:justify-between md:items-center gap-2 mb-4",
+        ),
+        windowed_list(
+            "suggestion-window",
+            AppState.suggestions,
+            suggestion_card,
+            total=AppState.suggestion_total,
+            start=AppState.suggestion_window_start,
+            on_scroll=AppState.scroll_suggestions,
+            row_height=SUGGESTION_ROW_HEIGHT,
+            viewport_height=SUGGESTION_VIEWPORT_HEIGHT,
+            columns=AppState.suggestion_columns,
+            max_columns=SUGGESTION_COLUMNS,
         ),
         class_name="p-6 rounded-xl shadow-md border h-full transition-colors "
         + rx.cond(
@@ -878,6 +1242,7 @@ def project_card(project: Project) -> rx.Component:
         "Completed": "bg-green-600",
         "Disputed": "bg-red-600",
     }
+    project = patched(project, ProjectsState.project_patches, Project)
     return rx.el.div(
         rx.el.div(
             rx.el.h3(project["title"], class_name="font-semibold text-lg truncate"),
@@ -1050,7 +1415,10 @@ def worker_profile_view() -> rx.Component:
             _profile_section(
                 "Job History",
                 "job_history",
-                rx.el.p("Job history details coming soon..."),
+                rx.el.div(
+                    rx.foreach(ProfileState.jobs, job_row),
+                    class_name="divide-y dark:divide-gray-700",
+                ),
             ),
             _profile_section(
                 "Transaction History", "tx_history", transaction_history()
@@ -1098,7 +1466,16 @@ def profile_header(profile_type: str) -> rx.Component:
                     class_name="flex items-center gap-2 text-gray-500 dark:text-gray-400 mt-1",
                 ),
             ),
-            class_name="flex items-center gap-6",
+            rx.cond(
+                profile_type == "Worker",
+                rx.el.button(
+                    rx.icon("download", class_name="h-4 w-4"),
+                    "Download JobID",
+                    on_click=ProfileState.download_job_id,
+                    class_name="wallet-button flex items-center gap-2 md:ml-auto",
+                ),
+            ),
+            class_name="flex flex-wrap items-center gap-6",
         ),
         rx.cond(
             profile_type == "Worker",
@@ -1164,7 +1541,14 @@ def _profile_section(
         ),
         rx.cond(
             is_expanded,
-            rx.el.div(content, class_name="p-4 border-t dark:border-gray-700"),
+            rx.el.div(
+                rx.cond(
+                    ProfileState.loaded_sections.contains(section_key),
+                    content,
+                    section_placeholder(),
+                ),
+                class_name="p-4 border-t dark:border-gray-700",
+            ),
             None,
         ),
         class_name="rounded-xl shadow-md border "
@@ -1176,6 +1560,41 @@ def _profile_section(
     )
 
 
+def section_placeholder() -> rx.Component:
+    return rx.el.div(
+        *[
+            rx.el.div(
+                class_name="h-10 rounded-md "
+                + rx.cond(AppState.is_dark_mode, "bg-gray-700", "bg-gray-200")
+            )
+            for _ in range(3)
+        ],
+        class_name="space-y-3 animate-pulse",
+    )
+
+
+def job_row(job: dict) -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.el.p(job["title"], class_name="font-semibold"),
+            rx.el.p(
+                f"{job['client']} · {job['completed_at']}",
+                class_name="text-xs text-gray-500",
+            ),
+        ),
+        rx.el.div(
+            rx.el.span(f"${job['budget']}", class_name="text-sm"),
+            rx.el.span(
+                rx.icon("star", class_name="h-4 w-4 text-yellow-400"),
+                job["rating"],
+                class_name="flex items-center gap-1 text-sm",
+            ),
+            class_name="flex items-center gap-4",
+        ),
+        class_name="flex justify-between items-center py-3",
+    )
+
+
 def portfolio_item_card(item: dict) -> rx.Component:
     return rx.el.div(
         rx.image(
@@ -1246,4 +1665,65 @@ def profile_modal() -> rx.Component:
             ),
             rx.el.div(),
         ),
-    )
\ No newline at end of file
+    )
+
+
+def event_cost_row(row: dict) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(row["handler"], class_name="pr-3 font-mono"),
+        rx.el.td(row["calls"], class_name="pr-3 text-right"),
+        rx.el.td(row["wall_ms_mean"], class_name="pr-3 text-right"),
+        rx.el.td(row["wall_ms_p95"], class_name="pr-3 text-right"),
+        rx.el.td(row["lock_wait_ms_mean"], class_name="pr-3 text-right"),
+        rx.el.td(row["delta_bytes_mean"], class_name="pr-3 text-right"),
+        rx.el.td(row["dirty_vars_mean"], class_name="text-right"),
+    )
+
+
+def debug_overlay() -> rx.Component:
+    """Per-handler event costs; only rendered with ASSURA_DEBUG_OVERLAY set."""
+    if not metrics.DEBUG_OVERLAY:
+        return rx.fragment()
+    return rx.el.div(
+        rx.cond(
+            DebugState.is_overlay_open,
+            rx.el.div(
+                rx.el.div(
+                    rx.el.h3("Event Costs", class_name="font-bold"),
+                    rx.el.button(
+                        rx.icon("refresh-cw", class_name="h-4 w-4"),
+                        on_click=DebugState.refresh_event_costs,
+                    ),
+                    class_name="flex justify-between items-center mb-2",
+                ),
+                rx.el.table(
+                    rx.el.thead(
+                        rx.el.tr(
+                            *[
+                                rx.el.th(title, class_name="pr-3 text-left")
+                                for title in (
+                                    "Handler",
+                                    "Calls",
+                                    "Wall ms",
+                                    "p95 ms",
+                                    "Lock ms",
+                                    "Delta B",
+                                    "Dirty",
+                                )
+                            ]
+                        )
+                    ),
+                    rx.el.tbody(rx.foreach(DebugState.event_costs, event_cost_row)),
+                    class_name="text-xs",
+                ),
+                class_name="mb-2 p-4 max-h-96 overflow-auto rounded-xl shadow-2xl "
+                "bg-gray-900/95 text-gray-100",
+            ),
+        ),
+        rx.el.button(
+            rx.icon("gauge", class_name="h-5 w-5"),
+            on_click=DebugState.toggle_overlay,
+            class_name="p-3 rounded-full shadow-lg bg-gray-900 text-teal-400",
+        ),
+        class_name="fixed bottom-4 left-4 z-50 flex flex-col items-start",
+    )
@@ -0,0 +1,118 @@
+import contextlib
+import contextvars
+import random
+import time
+
+import reflex as rx
+from reflex.event import Event
+from reflex.state import BaseState, StateUpdate
+from reflex.utils import format
+
+from app import state_manager
+from app.services import governance, jobid, metrics, replies, votes
+
+# Seconds the current event waited for its session's state lock.
+_lock_wait: contextvars.ContextVar[float] = contextvars.ContextVar(
+    "lock_wait", default=0.0
+)
+# When the current event got its state, and what its updates have cost so far.
+_started: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "started", default=None
+)
+# [delta bytes (None when not sampled), dirty vars] of the current event.
+_sent: contextvars.ContextVar[list[int | None] | None] = contextvars.ContextVar(
+    "sent", default=None
+)
+
+
+class EventCostMiddleware(rx.Middleware):
+    """Records wall time, lock wait, delta bytes and dirty vars per handler.
+
+    An event is timed from the moment it holds its session's state (the
+    lock wait before that is measured by `install`'s state-manager hook)
+    until its final update; the deltas of all its updates are summed.
+    Delta bytes are measured on a DELTA_SAMPLE_RATE sample of events.
+    Background handlers are not recorded: their task inherits this
+    context, so it would be timed for its whole lifetime.
+    """
+
+    def __init__(self, registry: metrics.Registry):
+        self.registry = registry
+        self._names: dict[str, str] = {}
+        self._background: dict[str, bool] = {}
+
+    def _is_background(self, state: BaseState, event: Event) -> bool:
+        background = self._background.get(event.name)
+        if background is None:
+            _, handler = state._get_event_handler(event)
+            background = self._background[event.name] = handler.is_background
+        return background
+
+    def _handler_name(self, app: rx.App, event: Event) -> str:
+        name = self._names.get(event.name)
+        if name is None:
+            path, _, handler = event.name.rpartition(".")
+            try:
+                state = app._state.get_class_substate(path).__name__
+            except ValueError:
+                state = path
+            name = self._names[event.name] = f"{state}.{handler}"
+        return name
+
+    async def preprocess(self, app, state: BaseState, event: Event):
+        if self._is_background(state, event):
+            _started.set(None)
+            _sent.set(None)
+            return None
+        _started.set(time.perf_counter())
+        sampled = random.random() < metrics.DELTA_SAMPLE_RATE
+        _sent.set([0 if sampled else None, 0])
+        return None
+
+    async def postprocess(
+        self, app, state: BaseState, event: Event, update: StateUpdate
+    ) -> StateUpdate:
+        started, sent = _started.get(), _sent.get()
+        if started is None or sent is None:
+            # A background task's update, or a handler that already
+            # recorded its final update.
+            return update
+        if sent[0] is not None:
+            sent[0] += len(format.json_dumps(update.delta))
+        sent[1] += sum(len(vars) for vars in update.delta.values())
+        if update.final:
+            self.registry.record(
+                self._handler_name(app, event),
+                wall=time.perf_counter() - started,
+                lock_wait=_lock_wait.get(),
+                delta_bytes=sent[0],
+                dirty_vars=sent[1],
+            )
+            _started.set(None)
+        return update
+
+
+def _time_lock_waits(manager):
+    modify_state = manager.modify_state
+
+    @contextlib.asynccontextmanager
+    async def timed_modify_state(token: str, **kwargs):
+        requested = time.perf_counter()
+        async with modify_state(token, **kwargs) as state:
+            _lock_wait.set(time.perf_counter() - requested)
+            yield state
+
+    manager.modify_state = timed_modify_state
+
+
+def install(app: rx.App):
+    """Instrument `app`'s events and export the shared services' counters."""
+    manager = app.state_manager
+    _time_lock_waits(manager)
+    if isinstance(manager, state_manager.SpillingStateManager):
+        metrics.registry.source("sessions", manager.stats)
+    app.add_middleware(EventCostMiddleware(metrics.registry))
+    metrics.registry.source("replies", replies.scheduler.stats)
+    metrics.registry.source("votes", lambda: votes.tally.counters)
+    metrics.registry.source("governance", lambda: governance.engine.counters)
+    metrics.registry.source("jobid", lambda: jobid.counters)
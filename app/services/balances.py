@@ -0,0 +1,63 @@
+import threading
+
+# Fixed number of buckets; a write after a snapshot copies only its bucket.
+BALANCE_BUCKETS = 1024
+
+
+class BalanceSnapshot:
+    """Frozen voting weights as of one moment. Lookups are O(1)."""
+
+    def __init__(self, buckets: tuple[dict[str, float], ...], version: int):
+        self._buckets = buckets
+        self.version = version
+
+    def __contains__(self, account: str) -> bool:
+        return account in self._buckets[hash(account) % len(self._buckets)]
+
+    def weight(self, account: str) -> float:
+        """The account's weight, 0 if it had no balance at snapshot time."""
+        return self._buckets[hash(account) % len(self._buckets)].get(account, 0.0)
+
+
+class BalanceBook:
+    """Live voting weight (held + staked ASRA) per account.
+
+    Balances are spread over fixed buckets of dicts. `snapshot` shares the
+    buckets instead of copying them; the first write to a bucket after a
+    snapshot copies that bucket alone (copy-on-write), so a snapshot costs
+    one pointer per bucket plus the buckets its later writes touch, never
+    a copy of every balance. Consecutive snapshots with no writes between
+    them are the same object.
+    """
+
+    def __init__(self, buckets: int = BALANCE_BUCKETS):
+        self._lock = threading.Lock()
+        self._buckets: list[dict[str, float]] = [{} for _ in range(buckets)]
+        # Buckets copied since the last snapshot, safe to write in place.
+        self._owned: set[int] = set(range(buckets))
+        self._version = 0
+        self._snapshot: BalanceSnapshot | None = None
+
+    def weight(self, account: str) -> float:
+        return self._buckets[hash(account) % len(self._buckets)].get(account, 0.0)
+
+    def set(self, account: str, weight: float):
+        i = hash(account) % len(self._buckets)
+        with self._lock:
+            if self._buckets[i].get(account) == weight:
+                return
+            if i not in self._owned:
+                self._buckets[i] = dict(self._buckets[i])
+                self._owned.add(i)
+            self._buckets[i][account] = weight
+            self._version += 1
+
+    def snapshot(self) -> BalanceSnapshot:
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != self._version:
+                self._snapshot = BalanceSnapshot(tuple(self._buckets), self._version)
+                self._owned.clear()
+            return self._snapshot
+
+
+book = BalanceBook()
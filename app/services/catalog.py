@@ -0,0 +1,184 @@
+import collections
+import dataclasses
+import datetime
+import os
+import threading
+import time
+from collections.abc import Iterable, Mapping
+
+from app.services.entity_store import EntityStore, Record, freeze
+from app.services.factory import factory, scaled
+
+CATALOG_SIZE = int(os.environ.get("ASSURA_SUGGESTION_CATALOG_SIZE", scaled(200)))
+# Superseded snapshots kept so sessions still rendering them stay consistent.
+CATALOG_HISTORY = 8
+
+
+@dataclasses.dataclass(frozen=True)
+class CatalogSnapshot:
+    version: int
+    suggestions: tuple[Record, ...]
+    proposals: EntityStore
+    projects: EntityStore
+
+
+# What `Catalog.at(0)` returns.
+EMPTY = CatalogSnapshot(
+    version=0, suggestions=(), proposals=EntityStore(), projects=EntityStore()
+)
+
+
+def _store(records: Iterable[Mapping]) -> EntityStore:
+    return records if isinstance(records, EntityStore) else EntityStore(records)
+
+
+class Catalog:
+    """Process-wide reference data, shared read-only by every session.
+
+    Suggestions, proposals and projects live here once instead of being
+    copied into each session's state. Every change publishes a new
+    immutable snapshot under a new version; sessions store only the version
+    they rendered plus their own overlay (e.g. votes they cast), and build
+    their views from `at(version)`. Unchanged collections are shared
+    between versions.
+    """
+
+    def __init__(self, suggestions, proposals, projects):
+        self._lock = threading.Lock()
+        self._snapshot = CatalogSnapshot(
+            version=1,
+            suggestions=tuple(freeze(s) for s in suggestions),
+            proposals=_store(proposals),
+            projects=_store(projects),
+        )
+        self._history = collections.OrderedDict({1: self._snapshot})
+
+    def snapshot(self) -> CatalogSnapshot:
+        return self._snapshot
+
+    def at(self, version: int) -> CatalogSnapshot:
+        """The snapshot published as `version`, or the current one if evicted.
+
+        Version 0 (never published) is an empty catalog: sessions start
+        there, and render nothing shared until they load a view.
+        """
+        if version == 0:
+            return EMPTY
+        return self._history.get(version, self._snapshot)
+
+    def publish(
+        self,
+        *,
+        suggestions: Iterable[Mapping] | None = None,
+        proposals: Iterable[Mapping] | None = None,
+        projects: Iterable[Mapping] | None = None,
+    ) -> CatalogSnapshot:
+        """Replace the given collections and publish the next version.
+
+        Pass an `EntityStore` from `replace` to change individual entities.
+        """
+        with self._lock:
+            current = self._snapshot
+            changes = {}
+            if suggestions is not None:
+                changes["suggestions"] = tuple(freeze(s) for s in suggestions)
+            if proposals is not None:
+                changes["proposals"] = _store(proposals)
+            if projects is not None:
+                changes["projects"] = _store(projects)
+            self._snapshot = dataclasses.replace(
+                current, version=current.version + 1, **changes
+            )
+            self._history[self._snapshot.version] = self._snapshot
+            while len(self._history) > CATALOG_HISTORY:
+                self._history.popitem(last=False)
+            return self._snapshot
+
+    def changed_since(self, version: int, collection: str) -> frozenset[int] | None:
+        """Ids in an entity collection changed after `version`.
+
+        None when the collection was replaced wholesale or `version` has
+        been evicted, in which case the caller should reload everything.
+        """
+        previous = self._history.get(version)
+        if previous is None:
+            return None
+        changed = set()
+        for v in range(version + 1, self._snapshot.version + 1):
+            snapshot = self._history[v]
+            store = getattr(snapshot, collection)
+            if store is not getattr(previous, collection):
+                if not store.changed:
+                    return None
+                changed |= store.changed
+            previous = snapshot
+        return frozenset(changed)
+
+
+def closes_at(deadline: float) -> str:
+    """Display label for a proposal's voting deadline."""
+    return datetime.datetime.fromtimestamp(deadline).strftime("%b %d %H:%M")
+
+
+def _initial_proposals() -> list[dict]:
+    now = time.time()
+    proposals = [
+        {
+            "id": 101,
+            "title": "Add New Staking Tier: Platinum",
+            "description": "Proposal to add a new top-tier staking level with higher rewards.",
+            "votes": 47000,
+            "threshold": 50000,
+            "status": "voting",
+            "deadline": now + 2 * 86400,
+        },
+        {
+            "id": 102,
+            "title": "Increase Project Dispute Fee",
+            "description": "Increase the dispute fee from 50 ASRA to 100 ASRA to prevent spam.",
+            "votes": 62000,
+            "threshold": 50000,
+            "status": "passed",
+            "deadline": now - 86400,
+        },
+        {
+            "id": 103,
+            "title": "Community Grant for Dev Tooling",
+            "description": "Fund a project to build better developer tools for the Assura ecosystem.",
+            "votes": 35000,
+            "threshold": 60000,
+            "status": "voting",
+            "deadline": now + 5 * 86400,
+        },
+        {
+            "id": 104,
+            "title": "Marketing Campaign for Q3",
+            "description": "Allocate funds for a major marketing push to attract new users.",
+            "votes": 88000,
+            "threshold": 75000,
+            "status": "executed",
+            "deadline": now - 10 * 86400,
+        },
+    ]
+    proposals.extend(
+        factory.proposals(scaled(4) - 4, first_id=105, now=now).records()
+    )
+    return [{**p, "closes_at": closes_at(p["deadline"])} for p in proposals]
+
+
+def strip_views(state: dict, *views) -> dict:
+    """Drop cached views of shared data (ComputedVars) from a pickled state dict.
+
+    They are rebuilt from the shared snapshot on first access, so a
+    session's serialized state carries only its version and overlay.
+    """
+    for view in views:
+        state.pop(view._cache_attr, None)
+    return state
+
+
+catalog = Catalog(
+    suggestions=factory.suggestions(CATALOG_SIZE).records(),
+    proposals=_initial_proposals(),
+    projects=factory.projects(scaled(6)).records(),
+)
@@ -0,0 +1,92 @@
+import functools
+import itertools
+import threading
+from collections.abc import Iterable
+from typing import TypedDict
+
+from sqlalchemy import Index, insert
+from sqlmodel import Field, Session, SQLModel, select
+
+from app.services.db import create_tables
+
+INSERT_CHUNK = 10_000
+# Serializes `seed`, so two sessions opening an empty room seed it once.
+_seed_lock = threading.Lock()
+
+
+class Message(TypedDict):
+    id: int
+    sender: str
+    text: str
+    timestamp: str
+    avatar: str
+
+
+class ChatLogEntry(SQLModel, table=True):
+    """One message posted to a chat channel."""
+
+    __tablename__ = "chat_log"
+    __table_args__ = (Index("ix_chat_log_channel", "channel"),)
+
+    id: int | None = Field(default=None, primary_key=True)
+    channel: str
+    sender: str
+    text: str
+    timestamp: str
+    avatar: str
+
+
+@functools.lru_cache(maxsize=None)
+def _engine():
+    return create_tables(ChatLogEntry)
+
+
+def _to_message(entry: ChatLogEntry) -> Message:
+    return {
+        "id": entry.id,
+        "sender": entry.sender,
+        "text": entry.text,
+        "timestamp": entry.timestamp,
+        "avatar": entry.avatar,
+    }
+
+
+def append(channel: str, sender: str, text: str, timestamp: str, avatar: str) -> Message:
+    entry = ChatLogEntry(
+        channel=channel, sender=sender, text=text, timestamp=timestamp, avatar=avatar
+    )
+    with Session(_engine()) as session:
+        session.add(entry)
+        session.commit()
+        session.refresh(entry)
+        return _to_message(entry)
+
+
+def seed(channel: str, messages: Iterable[dict]) -> bool:
+    """Bulk-insert `messages` into a channel that has none yet.
+
+    Returns whether the channel was seeded; `messages` (dicts of sender,
+    text, timestamp and avatar) is only consumed if it was.
+    """
+    with _seed_lock, Session(_engine()) as session:
+        exists = select(ChatLogEntry.id).where(ChatLogEntry.channel == channel)
+        if session.exec(exists.limit(1)).first() is not None:
+            return False
+        rows = iter(messages)
+        while chunk := list(itertools.islice(rows, INSERT_CHUNK)):
+            session.exec(
+                insert(ChatLogEntry), params=[{"channel": channel, **m} for m in chunk]
+            )
+        session.commit()
+    return True
+
+
+def history(channel: str, before: int | None = None, limit: int = 50) -> list[Message]:
+    """Up to `limit` messages of a channel older than id `before`, oldest first."""
+    query = select(ChatLogEntry).where(ChatLogEntry.channel == channel)
+    if before is not None:
+        query = query.where(ChatLogEntry.id < before)
+    query = query.order_by(ChatLogEntry.id.desc()).limit(limit)
+    with Session(_engine()) as session:
+        entries = session.exec(query).all()
+    return [_to_message(e) for e in reversed(entries)]
@@ -0,0 +1,29 @@
+import functools
+import os
+
+import sqlalchemy
+from sqlmodel import SQLModel, create_engine
+
+DB_URL = os.environ.get("ASSURA_DB_URL", "sqlite:///assura.db")
+
+
+@functools.lru_cache(maxsize=None)
+def get_engine() -> sqlalchemy.Engine:
+    """Process-wide engine for the on-disk app database."""
+    engine = create_engine(DB_URL, connect_args={"check_same_thread": False})
+
+    @sqlalchemy.event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    return engine
+
+
+def create_tables(*models: type[SQLModel]) -> sqlalchemy.Engine:
+    """Create the tables for the given models if they don't exist yet."""
+    engine = get_engine()
+    SQLModel.metadata.create_all(engine, tables=[m.__table__ for m in models])
+    return engine
@@ -0,0 +1,134 @@
+import itertools
+from collections.abc import Iterable, Iterator, Mapping
+from types import MappingProxyType
+
+# Entities a session patches individually before folding them into its list.
+PATCH_LIMIT = 32
+# Entities per chunk of a store's ordered records, and buckets of its id
+# index; a `replace` copies only the chunks and buckets it touches.
+STORE_CHUNK = 64
+STORE_BUCKETS = 256
+
+Record = Mapping
+
+
+def freeze(record: Mapping) -> Record:
+    """A read-only copy of `record`, with list fields turned into tuples."""
+    return MappingProxyType(
+        {k: tuple(v) if isinstance(v, list) else v for k, v in record.items()}
+    )
+
+
+class EntityStore:
+    """Immutable, ordered collection of entities keyed by their "id".
+
+    Lookups by id are O(1). Records are held in fixed-size chunks in order,
+    and their positions in fixed buckets keyed by id. `replace` returns a
+    new store that shares every chunk and bucket it does not touch with
+    this one (copying only those holding the updated entities) and records
+    the ids it changed, so consumers can ship just those entities instead
+    of the whole list.
+    """
+
+    def __init__(self, records: Iterable[Mapping] = (), *, changed=frozenset()):
+        ordered: list[Record] = []
+        self._positions: tuple[dict[int, int], ...] = tuple(
+            {} for _ in range(STORE_BUCKETS)
+        )
+        for record in records:
+            bucket = self._positions[hash(record["id"]) % STORE_BUCKETS]
+            position = bucket.setdefault(record["id"], len(ordered))
+            if position == len(ordered):
+                ordered.append(freeze(record))
+            else:
+                ordered[position] = freeze(record)
+        self._chunks: tuple[tuple[Record, ...], ...] = tuple(
+            tuple(ordered[i : i + STORE_CHUNK])
+            for i in range(0, len(ordered), STORE_CHUNK)
+        )
+        self._len = len(ordered)
+        self.changed: frozenset[int] = frozenset(changed)
+
+    def _position(self, entity_id: object) -> int | None:
+        return self._positions[hash(entity_id) % len(self._positions)].get(entity_id)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Record]:
+        return itertools.chain.from_iterable(self._chunks)
+
+    def __contains__(self, entity_id: object) -> bool:
+        return self._position(entity_id) is not None
+
+    def __getitem__(self, entity_id: int) -> Record:
+        position = self._position(entity_id)
+        if position is None:
+            raise KeyError(entity_id)
+        return self._chunks[position // STORE_CHUNK][position % STORE_CHUNK]
+
+    def get(self, entity_id: int | None) -> Record | None:
+        position = self._position(entity_id)
+        if position is None:
+            return None
+        return self._chunks[position // STORE_CHUNK][position % STORE_CHUNK]
+
+    def changed_from(self, other: "EntityStore") -> set[int]:
+        """Ids whose record differs from `other`'s, or that it lacks.
+
+        Chunks shared with `other` are skipped by identity, so comparing two
+        versions of one store reads only the chunks copied in between.
+        """
+        changed = set()
+        for c, chunk in enumerate(self._chunks):
+            theirs = other._chunks[c] if c < len(other._chunks) else ()
+            if chunk is theirs:
+                continue
+            for i, record in enumerate(chunk):
+                if i >= len(theirs) or record is not theirs[i]:
+                    changed.add(record["id"])
+        return changed
+
+    def replace(self, updates: Mapping[int, Mapping]) -> "EntityStore":
+        """A copy with `updates` (id -> changed fields) merged in.
+
+        Ids not yet in the store are appended as new entities.
+        """
+        chunks = list(self._chunks)
+        positions = list(self._positions)
+        copied_chunks: dict[int, list[Record]] = {}
+        copied_buckets: set[int] = set()
+        size = self._len
+        for entity_id, changes in updates.items():
+            b = hash(entity_id) % len(positions)
+            position = positions[b].get(entity_id)
+            if position is None:
+                old = {"id": entity_id}
+                position, size = size, size + 1
+                if b not in copied_buckets:
+                    positions[b] = dict(positions[b])
+                    copied_buckets.add(b)
+                positions[b][entity_id] = position
+            else:
+                old = self[entity_id]
+            c, i = divmod(position, STORE_CHUNK)
+            chunk = copied_chunks.get(c)
+            if chunk is None:
+                chunk = copied_chunks[c] = list(chunks[c]) if c < len(chunks) else []
+            record = freeze({**old, **changes})
+            if i < len(chunk):
+                chunk[i] = record
+            else:
+                chunk.append(record)
+        # New chunks are numbered in order after the existing ones.
+        for c, chunk in copied_chunks.items():
+            if c < len(chunks):
+                chunks[c] = tuple(chunk)
+            else:
+                chunks.append(tuple(chunk))
+        store = EntityStore.__new__(EntityStore)
+        store._chunks = tuple(chunks)
+        store._positions = tuple(positions)
+        store._len = size
+        store.changed = frozenset(updates)
+        return store
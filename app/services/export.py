@@ -0,0 +1,221 @@
+import csv
+import dataclasses
+import datetime
+import importlib.util
+import io
+import json
+import time
+from collections.abc import Iterator
+
+import numpy as np
+
+from app.services import ledger, signing
+from app.services.signing import b64, unb64
+from app.services.transactions import (
+    AMOUNT_SCALE,
+    Token,
+    TransactionFrame,
+    TxStatus,
+    TxType,
+)
+
+# Rows read from the ledger and written out per chunk (one Parquet row group).
+EXPORT_CHUNK = 50_000
+# Seconds a signed export link stays valid.
+LINK_TTL = 300
+FORMATS = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+HEADER = (
+    "id",
+    "time",
+    "type",
+    "status",
+    "token",
+    "amount",
+    "counter_token",
+    "counter_amount",
+    "fee",
+    "hash",
+)
+_TYPE_LABELS = tuple(t.label for t in TxType)
+_STATUS_LABELS = tuple(s.label for s in TxStatus)
+_TOKEN_LABELS = tuple(t.name for t in Token)
+
+
+class InvalidLink(ValueError):
+    """An export link that is malformed, tampered with or expired."""
+
+
+@dataclasses.dataclass(frozen=True)
+class ExportRequest:
+    """What to export: a user's history, optionally filtered."""
+
+    user: str
+    format: str = "csv"
+    since: int | None = None
+    until: int | None = None
+    types: tuple[int, ...] = ()
+
+    @property
+    def filename(self) -> str:
+        return f"transactions.{self.format}"
+
+
+def sign(request: ExportRequest, ttl: float = LINK_TTL) -> str:
+    """An opaque token for `request`, valid for `ttl` seconds.
+
+    The token carries the request itself, so the download endpoint needs
+    no server-side record of it; the HMAC keeps users from editing it.
+    """
+    payload = json.dumps(
+        {**dataclasses.asdict(request), "expires": int(time.time() + ttl)},
+        separators=(",", ":"),
+    ).encode()
+    return f"{b64(payload)}.{b64(signing.signature(payload))}"
+
+
+def verify(token: str, now: float | None = None) -> ExportRequest:
+    """The request a token was signed for; raises InvalidLink otherwise."""
+    try:
+        payload, signature = (unb64(part) for part in token.split("."))
+    except ValueError as e:
+        raise InvalidLink("Malformed export link") from e
+    if not signing.is_valid(payload, signature):
+        raise InvalidLink("Invalid export link")
+    fields = json.loads(payload)
+    if fields.pop("expires") < (time.time() if now is None else now):
+        raise InvalidLink("Export link expired")
+    if fields["format"] not in FORMATS:
+        raise InvalidLink(f"Unknown export format {fields['format']!r}")
+    return ExportRequest(**{**fields, "types": tuple(fields["types"])})
+
+
+def _chunks(request: ExportRequest) -> Iterator[list[tuple]]:
+    return ledger.chunks(
+        request.user,
+        since=request.since,
+        until=request.until,
+        types=request.types,
+        size=EXPORT_CHUNK,
+    )
+
+
+def _units(amount: int) -> str:
+    return f"{amount / AMOUNT_SCALE:.6f}"
+
+
+def csv_chunks(request: ExportRequest) -> Iterator[bytes]:
+    """The export as CSV, one encoded block per ledger chunk."""
+    types, statuses = _TYPE_LABELS, _STATUS_LABELS
+    tokens = ("",) + _TOKEN_LABELS[1:]
+    utc = datetime.timezone.utc
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(HEADER)
+    for rows in _chunks(request):
+        for id, type, status, ts, token, amount, c_token, c_amount, fee, hash in rows:
+            writer.writerow(
+                (
+                    id,
+                    datetime.datetime.fromtimestamp(ts, utc).isoformat(),
+                    types[type],
+                    statuses[status],
+                    tokens[token],
+                    _units(amount),
+                    tokens[c_token],
+                    _units(c_amount) if c_token else "",
+                    _units(fee),
+                    hash,
+                )
+            )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _Sink(io.RawIOBase):
+    """A write-only stream whose contents are taken after each row group."""
+
+    def __init__(self):
+        self._data = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._data += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def take(self) -> bytes:
+        data = bytes(self._data)
+        self._data.clear()
+        return data
+
+
+def parquet_chunks(request: ExportRequest) -> Iterator[bytes]:
+    """The export as Parquet, one row group per ledger chunk.
+
+    Type, status and token columns are dictionary-encoded straight from
+    their codes and amounts are converted to units on whole columns.
+    Needs the optional `pyarrow` package.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    def categories(codes: np.ndarray, labels: tuple[str, ...], mask=None):
+        return pa.DictionaryArray.from_arrays(
+            pa.array(codes, mask=mask), pa.array(labels)
+        )
+
+    def units(amounts: np.ndarray, mask=None) -> pa.Array:
+        return pa.array(amounts / AMOUNT_SCALE, mask=mask)
+
+    def to_table(data: TransactionFrame) -> pa.Table:
+        # Token.NONE on the counter side means a one-sided transaction.
+        one_sided = data["counter_token"] == Token.NONE
+        return pa.table(
+            {
+                "id": data["id"],
+                "time": pa.array(data["ts"], pa.timestamp("s", tz="UTC")),
+                "type": categories(data["type"], _TYPE_LABELS),
+                "status": categories(data["status"], _STATUS_LABELS),
+                "token": categories(data["token"], _TOKEN_LABELS),
+                "amount": units(data["amount"]),
+                "counter_token": categories(
+                    data["counter_token"], _TOKEN_LABELS, one_sided
+                ),
+                "counter_amount": units(data["counter_amount"], one_sided),
+                "fee": units(data["fee"]),
+                "hash": pa.array(data.hashes, pa.string()),
+            }
+        )
+
+    sink = _Sink()
+    writer = pq.ParquetWriter(sink, to_table(TransactionFrame.from_rows([])).schema)
+    for rows in _chunks(request):
+        writer.write_table(to_table(TransactionFrame.from_rows(rows)))
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+
+def available(format: str) -> bool:
+    """Whether `format` can be written here (Parquet needs pyarrow)."""
+    if format == "parquet":
+        return importlib.util.find_spec("pyarrow") is not None
+    return format in FORMATS
+
+
+def stream(request: ExportRequest) -> Iterator[bytes]:
+    if request.format == "parquet":
+        return parquet_chunks(request)
+    return csv_chunks(request)
@@ -0,0 +1,292 @@
+import dataclasses
+import datetime
+import os
+import zlib
+from collections.abc import Callable, Iterator
+
+import numpy as np
+
+from app.services.transactions import (
+    AMOUNT_SCALE,
+    FEE_RATES,
+    SWAP_RATE,
+    Token,
+    TxStatus,
+    TxType,
+)
+
+# Multiplies every default mock-data size; ASSURA_SCALE=100000 turns the
+# 10-row wallet history into 1M rows.
+SCALE = float(os.environ.get("ASSURA_SCALE", "1"))
+# Fixed seed for reproducible data (benchmarks); unset means fresh data.
+SEED = int(os.environ["ASSURA_SEED"]) if "ASSURA_SEED" in os.environ else None
+# Rows converted to Python objects at a time by `Table.records`.
+RECORD_CHUNK = 65536
+
+PROJECT_STATUSES = np.array(
+    ["Pending Confirmation", "In Progress", "Completed", "Disputed"]
+)
+NAMES = np.array(
+    ["Alex", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jessie", "Jamie", "Kai", "Rowan"]
+)
+SKILLS = np.array(
+    [
+        "Smart Contract Dev",
+        "UI/UX Designer",
+        "Frontend Dev",
+        "Backend Dev",
+        "DevOps Engineer",
+    ]
+)
+PRODUCTS = np.array(
+    ["DeFi Platform", "NFT Marketplace", "DAO Tooling", "Web3 Game", "Wallet App"]
+)
+TAG_PAIRS = [
+    ("Solidity", "DeFi"),
+    ("Figma", "Web3"),
+    ("React", "Ethers.js"),
+    ("Node.js", "API"),
+    ("CI/CD", "Security"),
+]
+PROJECT_TITLES = np.array(
+    [
+        "DeFi Lending Protocol",
+        "NFT Art Marketplace",
+        "DAO Voting System",
+        "Web3 Gaming Platform",
+        "Multi-sig Wallet UI",
+        "Token Bridge Audit",
+    ]
+)
+PROPOSAL_TOPICS = np.array(
+    [
+        "Adjust Staking Rewards",
+        "Treasury Allocation",
+        "Protocol Fee Change",
+        "Community Grant",
+        "Partnership Approval",
+    ]
+)
+MESSAGE_TEXTS = np.array(
+    [
+        "Has anyone audited this contract yet?",
+        "Looking for a frontend dev for a two-week sprint.",
+        "The new staking tier looks promising.",
+        "Just shipped the milestone, please review.",
+        "What's the gas cost on the bridge now?",
+    ]
+)
+
+
+def scaled(rows: int) -> int:
+    """A default size multiplied by `SCALE` (at least one row)."""
+    return max(1, int(rows * SCALE))
+
+
+@dataclasses.dataclass
+class Table:
+    """Columnar rows generated in bulk.
+
+    Columns are NumPy arrays; categorical columns hold codes into
+    `labels`. `records` turns a slice into dicts a chunk at a time, so
+    views and seeders only pay Python-object cost for the rows they use.
+    """
+
+    columns: dict[str, np.ndarray]
+    labels: dict[str, np.ndarray]
+    to_record: Callable[[dict], dict]
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values())))
+
+    def records(self, start: int = 0, stop: int | None = None) -> Iterator[dict]:
+        stop = len(self) if stop is None else min(stop, len(self))
+        for lo in range(start, stop, RECORD_CHUNK):
+            hi = min(lo + RECORD_CHUNK, stop)
+            chunk = {
+                name: (
+                    self.labels[name][col[lo:hi]] if name in self.labels else col[lo:hi]
+                ).tolist()
+                for name, col in self.columns.items()
+            }
+            names = list(chunk)
+            for values in zip(*chunk.values()):
+                yield self.to_record(dict(zip(names, values)))
+
+
+class DataFactory:
+    """Vectorized mock data for every view, reproducible from a seed.
+
+    Each kind of data (and each `key`, e.g. a user) draws from its own
+    random stream derived from the seed, so the rows one view gets do not
+    depend on what else was generated first.
+    """
+
+    def __init__(self, seed: int | None = SEED):
+        self.seed = seed
+
+    def rng(self, kind: str, key: str = "") -> np.random.Generator:
+        if self.seed is None:
+            return np.random.default_rng()
+        return np.random.default_rng([self.seed, zlib.crc32(f"{kind}:{key}".encode())])
+
+    def transactions(self, n: int, key: str = "", now: float | None = None) -> Table:
+        """Wallet history in the ledger's numeric form, over the last 30 days."""
+        rng = self.rng("transactions", key)
+        now = datetime.datetime.now().timestamp() if now is None else now
+        tx_type = rng.integers(0, len(TxType), n, dtype=np.uint8)
+        value = rng.uniform(10, 1000, n)
+        swap = tx_type == TxType.SWAP
+        staking = (tx_type == TxType.STAKE) | (tx_type == TxType.UNSTAKE)
+        amount = np.where(staking, value * 10, value)
+        fee_rate = np.array([FEE_RATES[t] for t in TxType])[tx_type]
+        return Table(
+            columns={
+                "id": np.arange(1, n + 1),
+                "type": tx_type,
+                "status": rng.integers(0, len(TxStatus), n, dtype=np.uint8),
+                "ts": (now - rng.uniform(86400, 31 * 86400, n)).astype(np.int64),
+                "token": np.select(
+                    [swap, staking], [Token.USDT, Token.ASRA], Token.USD
+                ).astype(np.uint8),
+                "amount": np.round(amount * AMOUNT_SCALE).astype(np.int64),
+                "counter_token": np.where(swap, Token.ASRA, Token.NONE).astype(np.uint8),
+                "counter_amount": np.where(
+                    swap, np.round(value * SWAP_RATE * AMOUNT_SCALE), 0
+                ).astype(np.int64),
+                "fee": np.round(amount * fee_rate * AMOUNT_SCALE).astype(np.int64),
+                "hash": rng.integers(0, 1 << 48, n, dtype=np.int64),
+            },
+            labels={},
+            to_record=lambda row: {**row, "hash": f"0x{row['hash']:012x}"},
+        )
+
+    def suggestions(self, n: int) -> Table:
+        """Feed entries; even ids are workers, odd ids are projects."""
+        rng = self.rng("suggestions")
+        return Table(
+            columns={
+                "id": np.arange(n),
+                "name": rng.integers(0, len(NAMES), n, dtype=np.int8),
+                "skill": rng.integers(0, len(SKILLS), n, dtype=np.int8),
+                "product": rng.integers(0, len(PRODUCTS), n, dtype=np.int8),
+                "tags": rng.integers(0, len(TAG_PAIRS), n, dtype=np.int8),
+            },
+            labels={"name": NAMES, "skill": SKILLS, "product": PRODUCTS},
+            to_record=_suggestion_record,
+        )
+
+    def projects(self, n: int, first_id: int = 201) -> Table:
+        rng = self.rng("projects")
+        return Table(
+            columns={
+                "id": np.arange(first_id, first_id + n),
+                "title": np.arange(n) % len(PROJECT_TITLES),
+                "budget": rng.integers(5000, 20001, n),
+                "reward": rng.integers(100, 1001, n),
+                "status": rng.integers(0, len(PROJECT_STATUSES), n, dtype=np.int8),
+                "client": rng.integers(0, 1 << 32, n, dtype=np.int64),
+                "worker": rng.integers(0, 1 << 32, n, dtype=np.int64),
+            },
+            labels={"title": PROJECT_TITLES, "status": PROJECT_STATUSES},
+            to_record=lambda row: {
+                **row,
+                "title": row["title"]
+                if row["id"] - first_id < len(PROJECT_TITLES)
+                else f"{row['title']} #{row['id']}",
+                "client": f"0x...{row['client']:08x}",
+                "worker": f"0x...{row['worker']:08x}",
+            },
+        )
+
+    def proposals(self, n: int, first_id: int = 101, now: float | None = None) -> Table:
+        """Open proposals with deadlines spread over the next week."""
+        rng = self.rng("proposals")
+        now = datetime.datetime.now().timestamp() if now is None else now
+        threshold = rng.integers(4, 9, n) * 10000
+        return Table(
+            columns={
+                "id": np.arange(first_id, first_id + n),
+                "topic": rng.integers(0, len(PROPOSAL_TOPICS), n, dtype=np.int8),
+                "votes": (threshold * rng.uniform(0.1, 0.9, n)).astype(np.int64),
+                "threshold": threshold,
+                "deadline": now + rng.uniform(3600, 7 * 86400, n),
+            },
+            labels={"topic": PROPOSAL_TOPICS},
+            to_record=lambda row: {
+                "id": row["id"],
+                "title": f"{row['topic']} #{row['id']}",
+                "description": f"Community proposal #{row['id']}: {row['topic'].lower()}.",
+                "votes": row["votes"],
+                "threshold": row["threshold"],
+                "status": "voting",
+                "deadline": row["deadline"],
+            },
+        )
+
+    def jobs(self, n: int, key: str = "", now: float | None = None) -> Table:
+        """Completed jobs with their client ratings, over the last year."""
+        rng = self.rng("jobs", key)
+        now = datetime.datetime.now().timestamp() if now is None else now
+        return Table(
+            columns={
+                "title": rng.integers(0, len(PROJECT_TITLES), n, dtype=np.int8),
+                "client": rng.integers(0, 1 << 32, n, dtype=np.int64),
+                "budget": rng.integers(5000, 20001, n),
+                "rating": np.round(rng.uniform(4.0, 5.0, n), 1),
+                "completed_at": np.sort(now - rng.uniform(0, 365 * 86400, n)).astype(
+                    np.int64
+                ),
+            },
+            labels={"title": PROJECT_TITLES},
+            to_record=lambda row: {
+                **row,
+                "client": f"0x...{row['client']:08x}",
+                "completed_at": datetime.date.fromtimestamp(
+                    row["completed_at"]
+                ).isoformat(),
+            },
+        )
+
+    def messages(self, n: int, key: str = "", now: float | None = None) -> Table:
+        """Chat history, one message a minute ending now."""
+        rng = self.rng("messages", key)
+        now = datetime.datetime.now().timestamp() if now is None else now
+        return Table(
+            columns={
+                "ts": now - np.arange(n, 0, -1) * 60,
+                "sender": rng.integers(0, len(NAMES), n, dtype=np.int8),
+                "text": rng.integers(0, len(MESSAGE_TEXTS), n, dtype=np.int8),
+            },
+            labels={"sender": NAMES, "text": MESSAGE_TEXTS},
+            to_record=lambda row: {
+                "sender": row["sender"],
+                "text": row["text"],
+                "timestamp": datetime.datetime.fromtimestamp(row["ts"]).strftime("%H:%M"),
+                "avatar": f"https://api.dicebear.com/9.x/initials/svg?seed={row['sender']}",
+            },
+        )
+
+
+def _suggestion_record(row: dict) -> dict:
+    name = row["name"]
+    if row["id"] % 2 == 0:
+        return {
+            "id": row["id"],
+            "type": "worker",
+            "name": name,
+            "title": row["skill"],
+            "tags": list(TAG_PAIRS[row["tags"]]),
+            "avatar": f"https://api.dicebear.com/9.x/initials/svg?seed={name}",
+        }
+    return {
+        "id": row["id"],
+        "type": "project",
+        "name": f"Project by {name}",
+        "title": row["product"],
+        "tags": list(TAG_PAIRS[row["tags"]]),
+        "avatar": f"https://api.dicebear.com/9.x/notionists/svg?seed={name}",
+    }
+
+
+factory = DataFactory()
@@ -0,0 +1,148 @@
+import asyncio
+import collections
+import heapq
+import itertools
+import os
+import time
+from collections.abc import Mapping
+
+from app.services import balances, pubsub
+from app.services.catalog import catalog, closes_at
+from app.services.entity_store import EntityStore
+
+# Seconds a new proposal stays open for voting.
+VOTING_WINDOW = float(os.environ.get("ASSURA_VOTING_WINDOW", str(3 * 86400)))
+# Stake-weighted votes needed to settle a project dispute.
+DISPUTE_THRESHOLD = 50000
+PROPOSALS_CHANNEL = "dao:proposals"
+
+
+def crossings(proposals: EntityStore, updates: dict[int, dict]) -> dict[int, str]:
+    """Mark proposals in `updates` whose new vote count reaches the threshold.
+
+    Adds the "passed" status to those updates in place and returns the
+    transitions, so the new counts and statuses publish as one version.
+    """
+    transitions = {}
+    for proposal_id, changes in updates.items():
+        proposal = proposals[proposal_id]
+        if proposal["status"] == "voting" and changes["votes"] >= proposal["threshold"]:
+            changes["status"] = transitions[proposal_id] = "passed"
+    return transitions
+
+
+class GovernanceEngine:
+    """Closes voting windows on time with a single timer task.
+
+    Deadlines of open proposals sit in a min-heap; the timer sleeps until
+    the earliest one (or until an earlier deadline is scheduled), then
+    closes every proposal that is due in one catalog version: "passed" if
+    it reached its threshold, "rejected" otherwise. Proposals that passed
+    early are skipped when their entry comes up. Every transition is
+    announced on `PROPOSALS_CHANNEL`.
+
+    Each proposal keeps a balance snapshot, and votes on it are weighted
+    by that snapshot: the one taken when `open` created it, or for the
+    proposals seeded with the catalog, the one taken when `start` scheduled
+    them.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, int]] = []
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._ids: itertools.count | None = None
+        self._snapshots: dict[int, balances.BalanceSnapshot] = {}
+        self.counters = collections.Counter()
+
+    def start(self):
+        """Schedule every open proposal and start the timer (idempotent)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._heap = [
+            (p["deadline"], p["id"])
+            for p in catalog.snapshot().proposals
+            if p["status"] == "voting"
+        ]
+        heapq.heapify(self._heap)
+        snapshot = balances.book.snapshot()
+        for _, proposal_id in self._heap:
+            self._snapshots.setdefault(proposal_id, snapshot)
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def schedule(self, proposal_id: int, deadline: float):
+        heapq.heappush(self._heap, (deadline, proposal_id))
+        if self._wake is not None and self._heap[0] == (deadline, proposal_id):
+            self._wake.set()
+
+    def next_proposal_id(self) -> int:
+        if self._ids is None:
+            ids = (p["id"] for p in catalog.snapshot().proposals)
+            self._ids = itertools.count(max(ids, default=100) + 1)
+        return next(self._ids)
+
+    def voting_weight(self, proposal_id: int, account: str) -> float:
+        snapshot = self._snapshots.get(proposal_id)
+        if snapshot is None:
+            return balances.book.weight(account)
+        return snapshot.weight(account)
+
+    def open(self, proposal: Mapping, window: float = VOTING_WINDOW) -> Mapping:
+        """Publish a new proposal, open for voting for `window` seconds."""
+        self._snapshots[proposal["id"]] = balances.book.snapshot()
+        deadline = time.time() + window
+        proposals = catalog.snapshot().proposals
+        snapshot = catalog.publish(
+            proposals=proposals.replace(
+                {
+                    proposal["id"]: {
+                        **proposal,
+                        "votes": 0,
+                        "status": "voting",
+                        "deadline": deadline,
+                        "closes_at": closes_at(deadline),
+                    }
+                }
+            )
+        )
+        self.schedule(proposal["id"], deadline)
+        self.announce(snapshot.version, {proposal["id"]: "voting"})
+        return snapshot.proposals[proposal["id"]]
+
+    def announce(self, version: int, transitions: dict[int, str]):
+        if transitions:
+            self.counters.update(transitions.values())
+            pubsub.hub.publish(
+                PROPOSALS_CHANNEL, {"version": version, "transitions": transitions}
+            )
+
+    def close_due(self, now: float | None = None):
+        now = time.time() if now is None else now
+        proposals = catalog.snapshot().proposals
+        updates = {}
+        while self._heap and self._heap[0][0] <= now:
+            _, proposal_id = heapq.heappop(self._heap)
+            self._snapshots.pop(proposal_id, None)
+            proposal = proposals.get(proposal_id)
+            if proposal is not None and proposal["status"] == "voting":
+                passed = proposal["votes"] >= proposal["threshold"]
+                updates[proposal_id] = {"status": "passed" if passed else "rejected"}
+        if updates:
+            snapshot = catalog.publish(proposals=proposals.replace(updates))
+            self.announce(
+                snapshot.version, {pid: u["status"] for pid, u in updates.items()}
+            )
+
+    async def _run(self):
+        while True:
+            self.close_due()
+            self._wake.clear()
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+
+engine = GovernanceEngine()
@@ -0,0 +1,95 @@
+import asyncio
+import collections
+import hashlib
+import io
+import json
+import os
+import re
+import zipfile
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from app.services import signing
+from app.services.signing import b64
+
+# Built bundles, one file per content digest under the signing key's id.
+JOBID_DIR = Path(os.environ.get("ASSURA_JOBID_DIR", "jobid_cache"))
+# Bundles built at once; more requests queue instead of starving the loop.
+BUILD_WORKERS = 2
+DIGEST_PATTERN = re.compile(r"[0-9a-f]{64}")
+# Fixed zip timestamps, so the same summary always yields the same bytes.
+_ZIP_DATE = (2024, 1, 1, 0, 0, 0)
+
+_pool = ThreadPoolExecutor(BUILD_WORKERS, thread_name_prefix="jobid")
+_pending: dict[str, asyncio.Future] = {}
+counters = collections.Counter()
+
+
+def canonical(summary: Mapping) -> bytes:
+    return json.dumps(summary, sort_keys=True, separators=(",", ":")).encode()
+
+
+def digest_of(summary: Mapping) -> str:
+    """The content address of a summary: the SHA-256 of its canonical JSON."""
+    return hashlib.sha256(canonical(summary)).hexdigest()
+
+
+def path_of(digest: str) -> Path:
+    """Where the bundle of `digest` signed with the current key is stored.
+
+    Bundles signed with another key (e.g. a random one from an earlier
+    process) are never served, since their signatures no longer verify.
+    """
+    return JOBID_DIR / signing.KEY_ID / f"{digest}.zip"
+
+
+def _build(digest: str, summary: Mapping) -> Path:
+    """Write the bundle zip: the signed summary and a QR code of its hash."""
+    import segno
+
+    payload = canonical(summary)
+    document = {
+        "summary": summary,
+        "sha256": digest,
+        "signature": b64(signing.signature(payload)),
+        "key_id": signing.KEY_ID,
+    }
+    qr = io.BytesIO()
+    segno.make(f"jobid:sha256:{digest}", error="m").save(qr, kind="png", scale=6)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as bundle:
+        for name, data in (
+            ("jobid.json", json.dumps(document, indent=2).encode()),
+            ("jobid-qr.png", qr.getvalue()),
+        ):
+            bundle.writestr(zipfile.ZipInfo(name, _ZIP_DATE), data)
+    target = path_of(digest)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_suffix(f".{os.getpid()}.tmp")
+    partial.write_bytes(buffer.getvalue())
+    os.replace(partial, target)
+    return target
+
+
+async def bundle(summary: Mapping) -> str:
+    """Make sure the bundle for `summary` exists; returns its digest.
+
+    A summary that was bundled before is served from disk as is. Builds
+    run on a small thread pool, and concurrent requests for the same
+    summary share one build.
+    """
+    digest = digest_of(summary)
+    if path_of(digest).exists():
+        counters["hits"] += 1
+        return digest
+    build = _pending.get(digest)
+    if build is None:
+        counters["builds"] += 1
+        build = asyncio.get_running_loop().run_in_executor(
+            _pool, _build, digest, summary
+        )
+        _pending[digest] = build
+        build.add_done_callback(lambda _: _pending.pop(digest, None))
+    await asyncio.shield(build)
+    return digest
@@ -0,0 +1,255 @@
+import functools
+import itertools
+import time
+from collections.abc import Iterable, Iterator
+
+from sqlalchemy import Index, func, insert, inspect, text, tuple_
+from sqlmodel import Field, Session, SQLModel, select
+
+from app.services import rollups
+from app.services.db import create_tables, get_engine
+from app.services.rollups import DayTotals, TypeTotals
+from app.services.transactions import (
+    Transaction,
+    TransactionFrame,
+    TxStatus,
+    format_transaction,
+)
+
+PAGE_SIZE = 25
+INSERT_CHUNK = 10_000
+_COLUMNS = (
+    "type",
+    "status",
+    "ts",
+    "token",
+    "amount",
+    "counter_token",
+    "counter_amount",
+    "fee",
+    "hash",
+)
+
+
+class LedgerEntry(SQLModel, table=True):
+    """One row of a user's transaction history, stored numerically.
+
+    Type, status and tokens are small enums (see `transactions`), amounts
+    fixed-point integers and `ts` epoch seconds, so rows sort, filter and
+    sum in SQL, or as a `TransactionFrame`, without parsing display strings.
+    """
+
+    __tablename__ = "transactions"
+    # SQLite appends the rowid (our `id`) to every index entry, so
+    # (user, ts) also covers the (ts, id) keyset used for paging.
+    __table_args__ = (
+        Index("ix_transactions_user_ts", "user", "ts"),
+        Index("ix_transactions_type_status", "type", "status"),
+        Index("ix_transactions_hash", "hash"),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    user: str
+    type: int
+    status: int
+    ts: int
+    token: int
+    amount: int
+    counter_token: int
+    counter_amount: int
+    fee: int = 0
+    hash: str
+
+
+# Position of the last row on a page: (ts, id).
+Cursor = tuple[int, int]
+
+
+# Columns of the string-typed `ledger` table that `transactions` replaced.
+_LEGACY_COLUMNS = {"id", "user", "type", "status", "date", "amount", "hash"}
+
+
+@functools.lru_cache(maxsize=None)
+def _engine():
+    return create_tables(LedgerEntry, rollups.TransactionRollup)
+
+
+def migrate() -> None:
+    """Drop the legacy `ledger` table, if this database still has one.
+
+    Its rows were mock history, which is seeded again for any session
+    without rows. A `ledger` table with any other shape isn't ours to drop.
+    """
+    engine = get_engine()
+    inspector = inspect(engine)
+    if not inspector.has_table("ledger"):
+        return
+    if {c["name"] for c in inspector.get_columns("ledger")} == _LEGACY_COLUMNS:
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE ledger"))
+
+
+def _to_transaction(entry: LedgerEntry) -> Transaction:
+    return format_transaction(entry.model_dump())
+
+
+def append(user: str, rows: Iterable[dict]) -> None:
+    """Insert transactions (dicts of the numeric columns; `id` is ignored).
+
+    Rows are bulk-inserted INSERT_CHUNK at a time, so seeding millions of
+    rows from an iterator never holds them all in memory.
+    """
+    rows = iter(rows)
+    with Session(_engine()) as session:
+        while chunk := list(itertools.islice(rows, INSERT_CHUNK)):
+            session.exec(
+                insert(LedgerEntry),
+                params=[
+                    {"user": user, **{c: row[c] for c in _COLUMNS}} for row in chunk
+                ],
+            )
+            rollups.add(session, user, TransactionFrame.from_records(chunk))
+        session.commit()
+
+
+def set_status(user: str, tx_hash: str, status: TxStatus) -> bool:
+    """Change the status of a transaction; returns False if it was not found."""
+    with Session(_engine()) as session:
+        entry = session.exec(
+            select(LedgerEntry).where(
+                LedgerEntry.hash == tx_hash, LedgerEntry.user == user
+            )
+        ).first()
+        if entry is None:
+            return False
+        if entry.status != status:
+            rollups.move(session, user, entry.model_dump(), status)
+            entry.status = status
+            session.add(entry)
+            session.commit()
+        return True
+
+
+def count(user: str) -> int:
+    with Session(_engine()) as session:
+        return session.exec(
+            select(func.count()).select_from(LedgerEntry).where(LedgerEntry.user == user)
+        ).one()
+
+
+def page(
+    user: str, after: Cursor | None = None, limit: int = PAGE_SIZE
+) -> tuple[list[Transaction], Cursor | None]:
+    """Fetch one page of a user's history, newest first.
+
+    Keyset pagination: `after` is the cursor returned with the previous page,
+    so every page is a bounded index range scan regardless of its depth.
+    Returns the rows and the cursor of the next page (None on the last page).
+    """
+    query = select(LedgerEntry).where(LedgerEntry.user == user)
+    if after is not None:
+        query = query.where(tuple_(LedgerEntry.ts, LedgerEntry.id) < after)
+    query = query.order_by(LedgerEntry.ts.desc(), LedgerEntry.id.desc()).limit(
+        limit + 1
+    )
+    with Session(_engine()) as session:
+        entries = session.exec(query).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    next_cursor = (entries[-1].ts, entries[-1].id) if has_more else None
+    return [_to_transaction(e) for e in entries], next_cursor
+
+
+def window(
+    user: str,
+    skip: int,
+    limit: int,
+    *,
+    after: Cursor | None = None,
+    oldest_first: bool = False,
+) -> tuple[list[Transaction], Cursor | None]:
+    """Fetch `limit` rows of a user's history, newest first, `skip` rows in.
+
+    Keyset seek: `after` is the cursor of a row already shown and `skip`
+    counts from the row after it, so the scan starts at that row on the
+    (user, ts) index and steps over only the rows in between. With
+    `oldest_first`, `after` and `skip` count up from the oldest row instead,
+    which keeps windows near the end of a long history cheap to reach.
+    Returns the rows and the cursor of the oldest of them.
+    """
+    key = tuple_(LedgerEntry.ts, LedgerEntry.id)
+    if oldest_first:
+        order = (LedgerEntry.ts, LedgerEntry.id)
+        bound = None if after is None else key > after
+    else:
+        order = (LedgerEntry.ts.desc(), LedgerEntry.id.desc())
+        bound = None if after is None else key < after
+    ids = select(LedgerEntry.id).where(LedgerEntry.user == user)
+    if bound is not None:
+        ids = ids.where(bound)
+    # Only the selected ids are joined back to the table, so the skipped
+    # rows are stepped over on the index alone.
+    ids = ids.order_by(*order).offset(skip).limit(limit).subquery()
+    query = (
+        select(LedgerEntry)
+        .join(ids, LedgerEntry.id == ids.c.id)
+        .order_by(LedgerEntry.ts.desc(), LedgerEntry.id.desc())
+    )
+    with Session(_engine()) as session:
+        entries = session.exec(query).all()
+    last = (entries[-1].ts, entries[-1].id) if entries else None
+    return [_to_transaction(e) for e in entries], last
+
+
+def chunks(
+    user: str,
+    *,
+    since: int | None = None,
+    until: int | None = None,
+    types: Iterable[int] = (),
+    size: int = INSERT_CHUNK,
+) -> Iterator[list[tuple]]:
+    """Yield a user's history oldest first, `size` rows per list.
+
+    Rows are tuples of `id` followed by `_COLUMNS`. Filters run in SQL and
+    each chunk is its own keyset query on (ts, id), so no connection or
+    result set outlives a chunk however long the export is.
+    """
+    columns = (LedgerEntry.id, *(getattr(LedgerEntry, c) for c in _COLUMNS))
+    query = select(*columns).where(LedgerEntry.user == user)
+    if since is not None:
+        query = query.where(LedgerEntry.ts >= since)
+    if until is not None:
+        query = query.where(LedgerEntry.ts < until)
+    if types := list(types):
+        query = query.where(LedgerEntry.type.in_(types))
+    query = query.order_by(LedgerEntry.ts, LedgerEntry.id).limit(size)
+    ts = _COLUMNS.index("ts") + 1
+    after: Cursor | None = None
+    while True:
+        page_query = query
+        if after is not None:
+            page_query = query.where(tuple_(LedgerEntry.ts, LedgerEntry.id) > after)
+        with _engine().connect() as conn:
+            rows = conn.execute(page_query).cursor.fetchall()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < size:
+            return
+        after = (rows[-1][ts], rows[-1][0])
+
+
+def daily_totals(
+    user: str, days: int = 30, now: float | None = None
+) -> list[DayTotals]:
+    """Volume, fees and count per day over the last `days`, from the rollups."""
+    now = time.time() if now is None else now
+    with Session(_engine()) as session:
+        return rollups.daily(session, user, days, now)
+
+
+def type_totals(user: str) -> list[TypeTotals]:
+    """All-time volume, fees and count per transaction type, from the rollups."""
+    with Session(_engine()) as session:
+        return rollups.by_type(session, user)
@@ -0,0 +1,151 @@
+import bisect
+import collections
+import dataclasses
+import os
+import threading
+from collections.abc import Callable, Mapping
+
+# Show the event-cost overlay in the UI.
+DEBUG_OVERLAY = os.environ.get("ASSURA_DEBUG_OVERLAY", "") not in ("", "0")
+# Share of events whose delta bytes are measured (all with the overlay on);
+# measuring serializes the delta a second time.
+DELTA_SAMPLE_RATE = (
+    1.0
+    if DEBUG_OVERLAY
+    else float(os.environ.get("ASSURA_DELTA_SAMPLE_RATE", "0.05"))
+)
+
+SECONDS_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)  # fmt: skip
+BYTES_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+COUNT_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class Histogram:
+    """Counts of observations per bucket, plus their sum (Prometheus-style)."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        # One slot per bucket plus +Inf; not cumulative.
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the `q` quantile (0 if empty)."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+@dataclasses.dataclass
+class EventCost:
+    """Histograms of what one event handler costs per call."""
+
+    wall_seconds: Histogram = dataclasses.field(
+        default_factory=lambda: Histogram(SECONDS_BUCKETS)
+    )
+    lock_wait_seconds: Histogram = dataclasses.field(
+        default_factory=lambda: Histogram(SECONDS_BUCKETS)
+    )
+    delta_bytes: Histogram = dataclasses.field(
+        default_factory=lambda: Histogram(BYTES_BUCKETS)
+    )
+    dirty_vars: Histogram = dataclasses.field(
+        default_factory=lambda: Histogram(COUNT_BUCKETS)
+    )
+
+
+class Registry:
+    """Per-handler event costs and the counters of the shared services."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.events: dict[str, EventCost] = collections.defaultdict(EventCost)
+        self._sources: dict[str, Callable[[], Mapping[str, float]]] = {}
+
+    def record(
+        self,
+        handler: str,
+        *,
+        wall: float,
+        lock_wait: float,
+        delta_bytes: int | None,
+        dirty_vars: int,
+    ):
+        """Observe one call; `delta_bytes` is None when it was not sampled."""
+        with self._lock:
+            cost = self.events[handler]
+            cost.wall_seconds.observe(wall)
+            cost.lock_wait_seconds.observe(lock_wait)
+            if delta_bytes is not None:
+                cost.delta_bytes.observe(delta_bytes)
+            cost.dirty_vars.observe(dirty_vars)
+
+    def source(self, name: str, read: Callable[[], Mapping[str, float]]):
+        """Export the numbers `read` returns as `assura_<name>_<key>` gauges."""
+        self._sources[name] = read
+
+    def summary(self) -> list[dict]:
+        """One row per handler, most expensive (total wall time) first."""
+        with self._lock:
+            rows = [
+                {
+                    "handler": handler,
+                    "calls": cost.wall_seconds.count,
+                    "wall_ms_mean": round(cost.wall_seconds.mean * 1000, 2),
+                    "wall_ms_p95": round(cost.wall_seconds.quantile(0.95) * 1000, 2),
+                    "lock_wait_ms_mean": round(cost.lock_wait_seconds.mean * 1000, 2),
+                    "delta_bytes_mean": round(cost.delta_bytes.mean),
+                    "dirty_vars_mean": round(cost.dirty_vars.mean, 1),
+                    "wall_total": cost.wall_seconds.sum,
+                }
+                for handler, cost in self.events.items()
+            ]
+        rows.sort(key=lambda row: row.pop("wall_total"), reverse=True)
+        return rows
+
+    def prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for field in dataclasses.fields(EventCost):
+                name = f"assura_event_{field.name}"
+                lines.append(f"# TYPE {name} histogram")
+                for handler, cost in sorted(self.events.items()):
+                    histogram = getattr(cost, field.name)
+                    label = f'handler="{handler}"'
+                    cumulative = 0
+                    for bound, n in zip(
+                        (*histogram.buckets, "+Inf"), histogram.counts
+                    ):
+                        cumulative += n
+                        lines.append(
+                            f'{name}_bucket{{{label},le="{bound}"}} {cumulative}'
+                        )
+                    lines.append(f"{name}_sum{{{label}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{label}}} {histogram.count}")
+        for source, read in sorted(self._sources.items()):
+            for key, value in sorted(read().items()):
+                name = f"assura_{source}_{key}"
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
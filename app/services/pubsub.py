@@ -0,0 +1,116 @@
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+# Envelopes a subscriber may fall behind by before it is dropped.
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+class Subscription:
+    """A subscriber's bounded inbox, fed by every channel it has joined."""
+
+    def __init__(self, hub: "Hub", key: str, maxsize: int):
+        self.hub = hub
+        self.key = key
+        self.channels: set[str] = set()
+        self.queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue(maxsize)
+        self.dropped = False
+
+    def join(self, channel: str):
+        self.channels.add(channel)
+        self.hub._channels.setdefault(channel, set()).add(self)
+
+    def leave(self, channel: str):
+        self.channels.discard(channel)
+        members = self.hub._channels.get(channel)
+        if members is not None:
+            members.discard(self)
+            if not members:
+                del self.hub._channels[channel]
+
+    async def get(self, timeout: float | None = None) -> list[tuple[str, Any]]:
+        """Wait for the next envelope, then drain everything already queued.
+
+        Returns an empty list on timeout, so callers can check whether they
+        should keep listening. Bursts are delivered as one batch so a
+        consumer can apply them with a single state write.
+        """
+        try:
+            first = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        batch = [first]
+        while not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    def close(self):
+        for channel in list(self.channels):
+            self.leave(channel)
+        if self.hub.subscriptions.get(self.key) is self:
+            del self.hub.subscriptions[self.key]
+
+
+class Hub:
+    """In-process pub/sub: one publish fans out to every subscriber's queue.
+
+    Publishing never awaits. A subscriber whose queue is full is dropped
+    on the spot (slow-consumer policy) instead of stalling the publisher;
+    it sees `dropped` and is expected to resubscribe and resync.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.subscriptions: dict[str, Subscription] = {}
+        self._channels: dict[str, set[Subscription]] = {}
+        self.dropped_count = 0
+
+    def subscribe(self, key: str, *channels: str) -> Subscription:
+        """Create the subscription for `key`, replacing any previous one."""
+        previous = self.subscriptions.get(key)
+        if previous is not None:
+            previous.close()
+        subscription = Subscription(self, key, self.queue_size)
+        self.subscriptions[key] = subscription
+        for channel in channels:
+            subscription.join(channel)
+        return subscription
+
+    def publish(self, channel: str, payload: Any, skip: str | None = None) -> int:
+        """Deliver `payload` to every subscriber of `channel` but `skip`."""
+        delivered = 0
+        for subscription in list(self._channels.get(channel, ())):
+            if subscription.key == skip:
+                continue
+            try:
+                subscription.queue.put_nowait((channel, payload))
+                delivered += 1
+            except asyncio.QueueFull:
+                subscription.dropped = True
+                subscription.close()
+                self.dropped_count += 1
+        return delivered
+
+    def subscriber_count(self, channel: str) -> int:
+        return len(self._channels.get(channel, ()))
+
+
+hub = Hub()
+
+
+# Set by the app (see `set_connection_check`); services can't import it.
+_connection_check: Callable[[str], bool] | None = None
+
+
+def set_connection_check(check: Callable[[str], bool]):
+    """Tell `client_connected` how to look up a client token's socket."""
+    global _connection_check
+    _connection_check = check
+
+
+def client_connected(token: str) -> bool:
+    """Whether a browser tab with this client token is still connected.
+
+    Always True until the app registers a connection check.
+    """
+    return _connection_check is None or _connection_check(token)
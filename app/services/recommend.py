@@ -0,0 +1,88 @@
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+from app.services.catalog import catalog
+
+FEED_SIZE = 500
+
+
+class SuggestionIndex:
+    """Tag index over the suggestion catalog.
+
+    Keeps an inverted index (tag -> row ids) and a dense tag-incidence
+    matrix so a whole catalog can be scored against a user's tags with one
+    matrix-vector product instead of a Python loop over dicts.
+    """
+
+    def __init__(self, suggestions: Sequence[dict]):
+        self.source = suggestions
+        self.suggestions = list(suggestions)
+        self.tags = sorted({tag for s in self.suggestions for tag in s["tags"]})
+        self.tag_ids = {tag: i for i, tag in enumerate(self.tags)}
+        rows = np.fromiter(
+            (i for i, s in enumerate(self.suggestions) for _ in s["tags"]),
+            dtype=np.int32,
+        )
+        cols = np.fromiter(
+            (self.tag_ids[tag] for s in self.suggestions for tag in s["tags"]),
+            dtype=np.int32,
+        )
+        self.matrix = np.zeros((len(self.suggestions), len(self.tags)), np.float32)
+        self.matrix[rows, cols] = 1.0
+        self.postings = {
+            tag: np.flatnonzero(self.matrix[:, i]).astype(np.int32)
+            for tag, i in self.tag_ids.items()
+        }
+        doc_freq = self.matrix.sum(axis=0)
+        # Rare tags say more about a match than ubiquitous ones.
+        self.idf = (np.log((len(self.suggestions) + 1) / (doc_freq + 1)) + 1).astype(
+            np.float32
+        )
+        self.row_norm = np.sqrt(np.maximum(self.matrix.sum(axis=1), 1.0))
+
+    def __len__(self) -> int:
+        return len(self.suggestions)
+
+    def rank(self, tags: Iterable[str], k: int = FEED_SIZE) -> list[int]:
+        """Row ids of the `k` best suggestions for `tags`, best first.
+
+        When the user's tags match at least `k` rows, only the union of their
+        posting lists is scored; otherwise the whole matrix is, so unmatched
+        rows still fill the tail of the feed. Ties keep catalog order.
+        """
+        k = min(k, len(self.suggestions))
+        weights = np.zeros(len(self.tags), np.float32)
+        matched = [self.tag_ids[tag] for tag in tags if tag in self.tag_ids]
+        weights[matched] = self.idf[matched]
+        candidates = None
+        if matched:
+            candidates = np.unique(
+                np.concatenate([self.postings[self.tags[i]] for i in matched])
+            )
+        if candidates is not None and len(candidates) >= k:
+            scores = self.matrix[candidates] @ weights / self.row_norm[candidates]
+        else:
+            candidates = np.arange(len(self.suggestions))
+            scores = self.matrix @ weights / self.row_norm
+        if k < len(candidates):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(candidates))
+        order = top[np.lexsort((candidates[top], -scores[top]))]
+        return candidates[order].tolist()
+
+
+_index: SuggestionIndex | None = None
+
+
+def get_index() -> SuggestionIndex:
+    """Index over the current catalog's suggestions, shared by every session.
+
+    Rebuilt only when a catalog version replaces the suggestion collection.
+    """
+    global _index
+    suggestions = catalog.snapshot().suggestions
+    if _index is None or _index.source is not suggestions:
+        _index = SuggestionIndex(suggestions)
+    return _index
@@ -0,0 +1,163 @@
+import asyncio
+import collections
+import dataclasses
+import datetime
+import importlib
+import os
+import random
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from app.services import chat_log, pubsub
+
+PERSONA_NAME = "Alex"
+PERSONA_AVATAR = f"https://api.dicebear.com/9.x/initials/svg?seed={PERSONA_NAME}"
+REPLY_WORKERS = int(os.environ.get("ASSURA_REPLY_WORKERS", "4"))
+REPLY_QUEUE_SIZE = 10_000
+
+# Takes the user's unanswered messages (oldest first), returns the reply.
+ReplyGenerator = Callable[[list[str]], Awaitable[str]]
+
+
+async def canned_reply(prompts: list[str]) -> str:
+    """Default generator: a fixed answer after a human-ish pause."""
+    await asyncio.sleep(random.uniform(1, 2.5))
+    return "That's an interesting point! I'll look into it."
+
+
+def load_generator(path: str) -> ReplyGenerator:
+    """Import a generator from a "module:function" path."""
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+@dataclasses.dataclass
+class _Pending:
+    prompts: list[str]
+    enqueued_at: float
+
+
+class ReplyScheduler:
+    """Bounded worker pool producing persona replies for chat sessions.
+
+    Each session has at most one queued reply: messages that arrive while
+    one is queued are folded into it, and a message that arrives while a
+    reply is being generated cancels that reply and requeues the merged
+    prompts, so a burst of messages gets one answer.
+    """
+
+    def __init__(
+        self,
+        generator: ReplyGenerator = canned_reply,
+        workers: int = REPLY_WORKERS,
+        max_queue: int = REPLY_QUEUE_SIZE,
+    ):
+        self.generator = generator
+        self.workers = workers
+        self.max_queue = max_queue
+        self._queue: asyncio.Queue[str] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._pending: dict[str, _Pending] = {}
+        self._inflight: dict[str, tuple[asyncio.Task, _Pending]] = {}
+        self._latencies: collections.deque[float] = collections.deque(maxlen=1000)
+        self.counters = collections.Counter()
+
+    def _ensure_workers(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.max_queue)
+        self._tasks = [t for t in self._tasks if not t.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._work()))
+
+    def submit(self, session: str, text: str) -> bool:
+        """Ask for a reply to `text`.
+
+        Returns False, changing nothing, if the queue is full.
+        """
+        self._ensure_workers()
+        pending = self._pending.get(session)
+        if pending is not None:
+            pending.prompts.append(text)
+            self.counters["coalesced"] += 1
+            return True
+        # Checked before touching an in-flight reply, so a rejected message
+        # leaves that reply running instead of cancelling it for nothing.
+        if self._queue.full():
+            self.counters["rejected"] += 1
+            return False
+        prompts = [text]
+        inflight = self._inflight.pop(session, None)
+        if inflight is not None:
+            task, superseded = inflight
+            task.cancel()
+            prompts = superseded.prompts + prompts
+            self.counters["cancelled"] += 1
+        self._queue.put_nowait(session)
+        self._pending[session] = _Pending(prompts, time.perf_counter())
+        self.counters["submitted"] += 1
+        return True
+
+    def cancel(self, session: str):
+        """Forget any queued or running reply for a session."""
+        self._pending.pop(session, None)
+        inflight = self._inflight.pop(session, None)
+        if inflight is not None:
+            inflight[0].cancel()
+            self.counters["cancelled"] += 1
+
+    async def _work(self):
+        while True:
+            session = await self._queue.get()
+            pending = self._pending.pop(session, None)
+            if pending is None:
+                continue
+            channel = f"dm:{session}"
+            task = asyncio.create_task(self.generator(pending.prompts))
+            self._inflight[session] = (task, pending)
+            pubsub.hub.publish(channel, {"kind": "typing", "typing": True})
+            try:
+                text = await task
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    raise
+                # Superseded by a newer message; submit() requeued it.
+                continue
+            except Exception:
+                self.counters["failed"] += 1
+                pubsub.hub.publish(channel, {"kind": "typing", "typing": False})
+                continue
+            finally:
+                if self._inflight.get(session, (None,))[0] is task:
+                    del self._inflight[session]
+            message = chat_log.append(
+                channel,
+                sender=PERSONA_NAME,
+                text=text,
+                timestamp=datetime.datetime.now().strftime("%H:%M"),
+                avatar=PERSONA_AVATAR,
+            )
+            self._latencies.append(time.perf_counter() - pending.enqueued_at)
+            self.counters["delivered"] += 1
+            pubsub.hub.publish(channel, {"kind": "message", "message": message})
+            pubsub.hub.publish(channel, {"kind": "typing", "typing": False})
+
+    def stats(self) -> dict[str, float]:
+        """Queue depth, in-flight count, counters and reply latency (seconds)."""
+        latencies = sorted(self._latencies)
+        stats = {
+            "queue_depth": len(self._pending),
+            "inflight": len(self._inflight),
+            **self.counters,
+        }
+        if latencies:
+            stats["latency_p50"] = statistics.median(latencies)
+            stats["latency_p95"] = latencies[int(0.95 * (len(latencies) - 1))]
+        return stats
+
+
+scheduler = ReplyScheduler(
+    generator=load_generator(os.environ["ASSURA_REPLY_GENERATOR"])
+    if "ASSURA_REPLY_GENERATOR" in os.environ
+    else canned_reply
+)
@@ -0,0 +1,187 @@
+import datetime
+from collections.abc import Mapping
+from typing import TypedDict
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Field, Session, SQLModel, select
+
+from app.services.transactions import (
+    AMOUNT_SCALE,
+    TransactionFrame,
+    TxStatus,
+    TxType,
+)
+
+DAY = 86400
+
+
+class TransactionRollup(SQLModel, table=True):
+    """Running totals of one user's transactions per (day, type, status).
+
+    `volume` and `fees` are fixed-point USD. A cell changes on every
+    append and status change, so charts read a few dozen cells instead of
+    scanning the history.
+    """
+
+    __tablename__ = "transaction_rollups"
+
+    user: str = Field(primary_key=True)
+    # Days since the epoch (UTC).
+    day: int = Field(primary_key=True)
+    type: int = Field(primary_key=True)
+    status: int = Field(primary_key=True)
+    count: int = 0
+    volume: int = 0
+    fees: int = 0
+
+
+class DayTotals(TypedDict):
+    day: str
+    volume: float
+    fees: float
+    count: int
+
+
+class TypeTotals(TypedDict):
+    type: str
+    volume: float
+    fees: float
+    count: int
+
+
+Cell = tuple[int, int, int]
+
+
+def _cells(frame: TransactionFrame) -> dict[Cell, list[int]]:
+    """Count, USD volume and USD fees of a frame's rows, summed per cell."""
+    keys = np.stack([frame["ts"] // DAY, frame["type"], frame["status"]], axis=1)
+    cells, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    totals = np.zeros((len(cells), 3), dtype=np.int64)
+    np.add.at(totals, (inverse, 0), 1)
+    np.add.at(totals, (inverse, 1), frame.usd("amount"))
+    np.add.at(totals, (inverse, 2), frame.usd("fee"))
+    return {
+        tuple(cell): values for cell, values in zip(cells.tolist(), totals.tolist())
+    }
+
+
+def _upsert(session: Session, user: str, deltas: Mapping[Cell, list[int]]):
+    if not deltas:
+        return
+    stmt = insert(TransactionRollup)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user", "day", "type", "status"],
+        set_={
+            "count": TransactionRollup.count + stmt.excluded.count,
+            "volume": TransactionRollup.volume + stmt.excluded.volume,
+            "fees": TransactionRollup.fees + stmt.excluded.fees,
+        },
+    )
+    session.exec(
+        stmt,
+        params=[
+            {
+                "user": user,
+                "day": day,
+                "type": tx_type,
+                "status": status,
+                "count": count,
+                "volume": volume,
+                "fees": fees,
+            }
+            for (day, tx_type, status), (count, volume, fees) in deltas.items()
+        ],
+    )
+
+
+def add(session: Session, user: str, frame: TransactionFrame):
+    """Fold newly appended rows into their cells (one upsert per cell)."""
+    _upsert(session, user, _cells(frame))
+
+
+def move(session: Session, user: str, row: Mapping, status: int):
+    """Move a row whose status changes to `status` into its new cell."""
+    ((day, tx_type, old), values), = _cells(
+        TransactionFrame.from_records([row])
+    ).items()
+    _upsert(
+        session,
+        user,
+        {
+            (day, tx_type, old): [-v for v in values],
+            (day, tx_type, status): list(values),
+        },
+    )
+
+
+def _settled(query):
+    # Failed transactions moved nothing, so they are left out of the totals.
+    return query.where(TransactionRollup.status != TxStatus.FAILED)
+
+
+def daily(session: Session, user: str, days: int, now: float) -> list[DayTotals]:
+    """Totals for each of the last `days` days, oldest first, zero-filled."""
+    today = int(now) // DAY
+    rows = session.exec(
+        _settled(
+            select(
+                TransactionRollup.day,
+                func.sum(TransactionRollup.count),
+                func.sum(TransactionRollup.volume),
+                func.sum(TransactionRollup.fees),
+            )
+            .where(
+                TransactionRollup.user == user,
+                TransactionRollup.day > today - days,
+                TransactionRollup.day <= today,
+            )
+            .group_by(TransactionRollup.day)
+        )
+    ).all()
+    by_day = {day: (count, volume, fees) for day, count, volume, fees in rows}
+    totals = []
+    for day in range(today - days + 1, today + 1):
+        count, volume, fees = by_day.get(day, (0, 0, 0))
+        totals.append(
+            {
+                "day": datetime.datetime.fromtimestamp(
+                    day * DAY, datetime.timezone.utc
+                ).strftime("%b %d"),
+                "volume": round(volume / AMOUNT_SCALE, 2),
+                "fees": round(fees / AMOUNT_SCALE, 2),
+                "count": count,
+            }
+        )
+    return totals
+
+
+def by_type(session: Session, user: str) -> list[TypeTotals]:
+    """All-time totals per transaction type."""
+    rows = session.exec(
+        _settled(
+            select(
+                TransactionRollup.type,
+                func.sum(TransactionRollup.count),
+                func.sum(TransactionRollup.volume),
+                func.sum(TransactionRollup.fees),
+            )
+            .where(TransactionRollup.user == user)
+            .group_by(TransactionRollup.type)
+        )
+    ).all()
+    found = {tx_type: (count, volume, fees) for tx_type, count, volume, fees in rows}
+    totals = []
+    for tx_type in TxType:
+        count, volume, fees = found.get(tx_type, (0, 0, 0))
+        totals.append(
+            {
+                "type": tx_type.label,
+                "volume": round(volume / AMOUNT_SCALE, 2),
+                "fees": round(fees / AMOUNT_SCALE, 2),
+                "count": count,
+            }
+        )
+    return totals
@@ -0,0 +1,216 @@
+import re
+import threading
+from array import array
+from collections.abc import Iterable
+from typing import Literal, TypedDict
+
+import numpy as np
+
+from app.services.catalog import CatalogSnapshot, catalog
+
+SearchKind = Literal["suggestion", "project", "proposal"]
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+class SearchHit(TypedDict):
+    kind: SearchKind
+    id: int
+    title: str
+    subtitle: str
+
+
+def _grams(word: str) -> set[str]:
+    """Prefix-anchored trigrams of a word, plus its leading bigram.
+
+    Only the start of the word is padded, so a query prefix yields a subset
+    of the grams of every word it prefixes.
+    """
+    padded = f" {word}"
+    grams = {padded[:2]}
+    grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _typo_budget(word: str) -> int:
+    """Grams a query word may miss and still match.
+
+    One wrong character breaks up to three trigrams; short words only get
+    slack for a wrong last letter so they don't match everything.
+    """
+    if len(word) >= 5:
+        return 3
+    if len(word) >= 3:
+        return 1
+    return 0
+
+
+def _words(text: str) -> list[str]:
+    return _WORD.findall(text.lower())
+
+
+class TrigramIndex:
+    """In-process trigram index with typo-tolerant prefix matching.
+
+    Each trigram maps to an append-only posting list of document slots.
+    A query counts, per slot, how many of each query word's grams it holds
+    (one bincount over the relevant postings), so lookups never scan the
+    documents. Re-adding a key tombstones its old slot.
+    """
+
+    def __init__(self):
+        self.postings: dict[str, array] = {}
+        self.hits: list[SearchHit] = []
+        self.texts: list[str] = []
+        self.slots: dict[tuple[str, int], int] = {}
+        self.alive = np.zeros(1024, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def add(self, hit: SearchHit, text: str):
+        key = (hit["kind"], hit["id"])
+        old = self.slots.get(key)
+        if old is not None:
+            if self.texts[old] == text and self.hits[old] == hit:
+                return
+            self.alive[old] = False
+        slot = len(self.hits)
+        self.hits.append(hit)
+        self.texts.append(text)
+        self.slots[key] = slot
+        if slot >= len(self.alive):
+            self.alive = np.concatenate([self.alive, np.zeros_like(self.alive)])
+        self.alive[slot] = True
+        grams = set()
+        for word in _words(text):
+            grams |= _grams(word)
+        for gram in grams:
+            self.postings.setdefault(gram, array("i")).append(slot)
+
+    def add_many(self, docs: Iterable[tuple[SearchHit, str]]):
+        for hit, text in docs:
+            self.add(hit, text)
+
+    def search(self, query: str, limit: int = 8) -> list[SearchHit]:
+        words = _words(query)
+        size = len(self.hits)
+        if not words or not size:
+            return []
+        scores = np.zeros(size, dtype=np.float32)
+        matches = self.alive[:size].copy()
+        for word in words:
+            grams = _grams(word)
+            lists = [self.postings[g] for g in grams if g in self.postings]
+            if not lists:
+                return []
+            counts = np.bincount(
+                np.concatenate([np.frombuffer(p, dtype=np.int32) for p in lists]),
+                minlength=size,
+            )
+            needed = max(1, len(grams) - _typo_budget(word))
+            matches &= counts >= needed
+            scores += counts / len(grams)
+        candidates = np.flatnonzero(matches)
+        if len(candidates) > limit:
+            top = np.argpartition(-scores[candidates], limit - 1)[:limit]
+            candidates = candidates[top]
+        order = np.lexsort((candidates, -scores[candidates]))
+        return [self.hits[i] for i in candidates[order]]
+
+
+def suggestion_doc(suggestion: dict) -> tuple[SearchHit, str]:
+    return (
+        {
+            "kind": "suggestion",
+            "id": suggestion["id"],
+            "title": suggestion["name"],
+            "subtitle": suggestion["title"],
+        },
+        " ".join([suggestion["name"], suggestion["title"], *suggestion["tags"]]),
+    )
+
+
+def project_doc(project: dict) -> tuple[SearchHit, str]:
+    return (
+        {
+            "kind": "project",
+            "id": project["id"],
+            "title": project["title"],
+            "subtitle": f"Project #{project['id']}",
+        },
+        project["title"],
+    )
+
+
+def proposal_doc(proposal: dict) -> tuple[SearchHit, str]:
+    return (
+        {
+            "kind": "proposal",
+            "id": proposal["id"],
+            "title": proposal["title"],
+            "subtitle": "DAO proposal",
+        },
+        f"{proposal['title']} {proposal['description']}",
+    )
+
+
+_ENTITY_DOCS = (("projects", project_doc), ("proposals", proposal_doc))
+
+_index: TrigramIndex | None = None
+_indexed: CatalogSnapshot | None = None
+_builder: threading.Thread | None = None
+_builder_lock = threading.Lock()
+
+
+def _build():
+    global _index, _indexed
+    snapshot = catalog.snapshot()
+    index = TrigramIndex()
+    index.add_many(suggestion_doc(s) for s in snapshot.suggestions)
+    for collection, doc in _ENTITY_DOCS:
+        index.add_many(doc(r) for r in getattr(snapshot, collection))
+    # Readers check `_index` first, so `_indexed` must be set before it.
+    _indexed = snapshot
+    _index = index
+
+
+def start():
+    """Build the index in a background thread, once per process."""
+    global _builder
+    with _builder_lock:
+        if _builder is None:
+            _builder = threading.Thread(target=_build, name="search-index", daemon=True)
+            _builder.start()
+
+
+def _catch_up(index: TrigramIndex, indexed: CatalogSnapshot, snapshot: CatalogSnapshot):
+    """Re-add only the documents `snapshot` changed since `indexed`."""
+    if snapshot.suggestions is not indexed.suggestions:
+        index.add_many(suggestion_doc(s) for s in snapshot.suggestions)
+    for collection, doc in _ENTITY_DOCS:
+        store, old = getattr(snapshot, collection), getattr(indexed, collection)
+        if store is old:
+            continue
+        ids = catalog.changed_since(indexed.version, collection)
+        if ids is None:
+            # The indexed version was evicted; compare the stores instead.
+            ids = store.changed_from(old)
+        index.add_many(doc(store[i]) for i in ids if i in store)
+
+
+def get_index() -> TrigramIndex | None:
+    """The process-wide search index over the current catalog.
+
+    Built off the event loop by `start` (None until that finishes); after
+    that each new catalog version costs only the documents it changed.
+    """
+    global _indexed
+    start()
+    index = _index
+    if index is None:
+        return None
+    snapshot = catalog.snapshot()
+    if snapshot is not _indexed:
+        _catch_up(index, _indexed, snapshot)
+        _indexed = snapshot
+    return index
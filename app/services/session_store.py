@@ -0,0 +1,74 @@
+import functools
+import secrets
+import time
+
+from sqlalchemy import Column, LargeBinary, delete
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Field, Session, SQLModel, select
+
+from app.services.db import create_tables
+
+# Identifies this process in the rows it writes. Background tasks die with
+# their process, so a session spilled under another boot has none running.
+BOOT = secrets.token_hex(8)
+
+
+class SpilledSession(SQLModel, table=True):
+    """The pickled state tree of a session evicted from memory."""
+
+    __tablename__ = "spilled_sessions"
+
+    token: str = Field(primary_key=True)
+    data: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    boot: str
+    spilled_at: float = Field(index=True)
+
+
+@functools.lru_cache(maxsize=None)
+def _engine():
+    return create_tables(SpilledSession)
+
+
+def save(sessions: dict[str, bytes]):
+    """Store (or replace) the snapshots of several sessions in one transaction."""
+    if not sessions:
+        return
+    now = time.time()
+    stmt = insert(SpilledSession)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["token"],
+        set_={
+            "data": stmt.excluded.data,
+            "boot": stmt.excluded.boot,
+            "spilled_at": stmt.excluded.spilled_at,
+        },
+    )
+    with Session(_engine()) as session:
+        session.exec(
+            stmt,
+            params=[
+                {"token": token, "data": data, "boot": BOOT, "spilled_at": now}
+                for token, data in sessions.items()
+            ],
+        )
+        session.commit()
+
+
+def load(token: str) -> tuple[bytes, str] | None:
+    """The snapshot of a spilled session and the boot that wrote it."""
+    query = select(SpilledSession.data, SpilledSession.boot).where(
+        SpilledSession.token == token
+    )
+    with Session(_engine()) as session:
+        row = session.exec(query).first()
+    return None if row is None else (row[0], row[1])
+
+
+def purge(older_than: float) -> int:
+    """Forget sessions spilled before `older_than` (a timestamp)."""
+    with Session(_engine()) as session:
+        result = session.exec(
+            delete(SpilledSession).where(SpilledSession.spilled_at < older_than)
+        )
+        session.commit()
+        return result.rowcount
@@ -0,0 +1,28 @@
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+
+# Shared by every worker that checks signatures; a random per-process key
+# only works with a single backend worker.
+SECRET = os.environ.get("ASSURA_SIGNING_SECRET", "").encode() or secrets.token_bytes(32)
+# Names the key without revealing it, so anything signed and stored can
+# tell whether the current key made its signature.
+KEY_ID = hashlib.sha256(b"assura-key-id:" + SECRET).hexdigest()[:16]
+
+
+def b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def unb64(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def signature(payload: bytes) -> bytes:
+    return hmac.new(SECRET, payload, hashlib.sha256).digest()
+
+
+def is_valid(payload: bytes, sig: bytes) -> bool:
+    return hmac.compare_digest(sig, signature(payload))
@@ -0,0 +1,143 @@
+import datetime
+
+import numpy as np
+
+# Bucket widths, in seconds, of the OHLC rollups.
+RESOLUTIONS = {"1m": 60, "1h": 3600, "1d": 86400}
+
+
+class PriceSeries:
+    """Fixed-capacity ring buffer of (timestamp, price) samples.
+
+    Appends are O(1) and never move existing samples; once full, the
+    oldest samples are overwritten. Reads return chronologically ordered
+    copies of the requested range.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._ts = np.zeros(capacity, dtype=np.float64)
+        self._price = np.zeros(capacity, dtype=np.float64)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, ts: float, price: float):
+        self._ts[self._next] = ts
+        self._price[self._next] = price
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def extend(self, ts: np.ndarray, prices: np.ndarray):
+        for start in range(0, len(ts), self.capacity):
+            chunk_ts = ts[start : start + self.capacity]
+            chunk_prices = prices[start : start + self.capacity]
+            idx = (self._next + np.arange(len(chunk_ts))) % self.capacity
+            self._ts[idx] = chunk_ts
+            self._price[idx] = chunk_prices
+            self._next = (self._next + len(chunk_ts)) % self.capacity
+            self._size = min(self._size + len(chunk_ts), self.capacity)
+
+    def last(self) -> tuple[float, float]:
+        i = (self._next - 1) % self.capacity
+        return float(self._ts[i]), float(self._price[i])
+
+    def _ordered(self) -> tuple[np.ndarray, np.ndarray]:
+        start = (self._next - self._size) % self.capacity
+        idx = (start + np.arange(self._size)) % self.capacity
+        return self._ts[idx], self._price[idx]
+
+    def window(self, since: float | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Samples with timestamp >= `since` (all samples if None)."""
+        ts, prices = self._ordered()
+        if since is not None:
+            first = np.searchsorted(ts, since)
+            ts, prices = ts[first:], prices[first:]
+        return ts, prices
+
+    def ohlc(self, resolution: str, since: float | None = None) -> dict[str, np.ndarray]:
+        """Open/high/low/close per `resolution` bucket, vectorized."""
+        ts, prices = self.window(since)
+        width = RESOLUTIONS[resolution]
+        if not len(ts):
+            empty = np.zeros(0)
+            return {"ts": empty, "open": empty, "high": empty, "low": empty, "close": empty}
+        buckets = np.floor(ts / width).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        ends = np.r_[starts[1:], len(ts)] - 1
+        return {
+            "ts": buckets[starts] * float(width),
+            "open": prices[starts],
+            "high": np.maximum.reduceat(prices, starts),
+            "low": np.minimum.reduceat(prices, starts),
+            "close": prices[ends],
+        }
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> tuple[np.ndarray, np.ndarray]:
+    """Largest-Triangle-Three-Buckets downsampling to `threshold` points.
+
+    Keeps the first and last points and, from each bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the next bucket's average, which preserves the visual shape of a line.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return x, y
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return x[keep], y[keep]
+
+
+# Chart range -> (lookback in seconds or None for all, rollup resolution, label format).
+CHART_RANGES = {
+    "1H": (3600, "1m", "%H:%M"),
+    "1D": (86400, "1m", "%H:%M"),
+    "1W": (7 * 86400, "1h", "%b %d %H:00"),
+    "ALL": (None, "1d", "%b %d"),
+}
+MAX_CHART_POINTS = 120
+
+
+def chart_points(
+    series: PriceSeries, range_key: str, now: float, max_points: int = MAX_CHART_POINTS
+) -> list[dict]:
+    """At most `max_points` {"name", "price"} points covering `range_key`.
+
+    Rolls the range up to its resolution's closing prices, then LTTB-
+    downsamples, so the chart payload is bounded by `max_points` however
+    much history the series holds.
+    """
+    lookback, resolution, label = CHART_RANGES[range_key]
+    bars = series.ohlc(resolution, since=None if lookback is None else now - lookback)
+    ts, prices = lttb(bars["ts"], bars["close"], max_points)
+    return [
+        {
+            "name": datetime.datetime.fromtimestamp(t).strftime(label),
+            "price": round(float(p), 4),
+        }
+        for t, p in zip(ts, prices)
+    ]
+
+
+def random_walk(
+    start_price: float, samples: int, step: float, now: float, volatility: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """`samples` mock prices ending at `now`, one every `step` seconds."""
+    ts = now - step * np.arange(samples - 1, -1, -1, dtype=np.float64)
+    returns = np.random.default_rng().normal(0.0, volatility, samples)
+    return ts, start_price * np.exp(np.cumsum(returns))
@@ -0,0 +1,96 @@
+import dataclasses
+import os
+import random
+import threading
+import time
+from types import MappingProxyType
+
+from app.services import timeseries
+
+# Seconds a metrics snapshot stays current before the next refresh recomputes it.
+METRICS_TTL = float(os.environ.get("ASSURA_METRICS_TTL", "5"))
+# Shared price history: 30 days of per-minute samples plus refresh ticks.
+PRICE_HISTORY_CAPACITY = 45 * 24 * 60
+
+
+@dataclasses.dataclass(frozen=True)
+class MetricsSnapshot:
+    version: int
+    taken_at: float
+    token_metrics: MappingProxyType
+
+
+class TokenMetricsService:
+    """Process-wide token metrics, shared read-only by every session.
+
+    Supply, staking and price move once per TTL tick no matter how many
+    sessions ask; sessions only hold the snapshot version they rendered.
+    Chart points are computed once per (version, range) and shared.
+    """
+
+    def __init__(self, ttl: float = METRICS_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        now = time.time()
+        self.series = timeseries.PriceSeries(PRICE_HISTORY_CAPACITY)
+        self.series.extend(
+            *timeseries.random_walk(
+                0.015, 30 * 24 * 60, step=60, now=now, volatility=0.0015
+            )
+        )
+        self._snapshot = MetricsSnapshot(
+            version=1,
+            taken_at=now,
+            token_metrics=MappingProxyType(
+                {
+                    "total_supply": 1000000000,
+                    "circulating_supply": 994550000,
+                    "total_staked": 4520000,
+                    "total_unstaking": 120000,
+                    "total_burned": 1250000,
+                }
+            ),
+        )
+        self._charts: dict[str, tuple[int, tuple[dict, ...]]] = {}
+
+    def snapshot(self) -> MetricsSnapshot:
+        """The current snapshot, ticking it forward if its TTL has expired."""
+        if time.time() - self._snapshot.taken_at >= self.ttl:
+            with self._lock:
+                if time.time() - self._snapshot.taken_at >= self.ttl:
+                    self._tick()
+        return self._snapshot
+
+    def _tick(self):
+        now = time.time()
+        previous = self._snapshot.token_metrics
+        _, last_price = self.series.last()
+        self.series.append(now, last_price * (1 + random.uniform(-0.1, 0.1)))
+        self._snapshot = MetricsSnapshot(
+            version=self._snapshot.version + 1,
+            taken_at=now,
+            token_metrics=MappingProxyType(
+                {
+                    **previous,
+                    "circulating_supply": previous["circulating_supply"]
+                    + random.randint(-10000, 10000),
+                    "total_staked": previous["total_staked"]
+                    + random.randint(1000, 5000),
+                    "total_unstaking": random.randint(5000, 20000),
+                }
+            ),
+        )
+
+    def chart(self, range_key: str) -> tuple[dict, ...]:
+        """Downsampled chart points for the current snapshot and range."""
+        snapshot = self.snapshot()
+        cached = self._charts.get(range_key)
+        if cached is None or cached[0] != snapshot.version:
+            points = tuple(
+                timeseries.chart_points(self.series, range_key, now=snapshot.taken_at)
+            )
+            cached = self._charts[range_key] = (snapshot.version, points)
+        return cached[1]
+
+
+service = TokenMetricsService()
@@ -0,0 +1,217 @@
+import datetime
+import enum
+from collections.abc import Iterable, Mapping
+from typing import Literal, TypedDict
+
+import numpy as np
+
+# Amounts are stored as integer micro-units (fixed point, 6 decimals).
+AMOUNT_SCALE = 1_000_000
+# Display rate of the mock USDT -> ASRA swap.
+SWAP_RATE = 45.5
+
+TransactionType = Literal["Deposit", "Withdraw", "Swap", "Stake", "Unstake"]
+TransactionStatus = Literal["Completed", "Pending", "Failed"]
+
+
+class TxType(enum.IntEnum):
+    DEPOSIT = 0
+    WITHDRAW = 1
+    SWAP = 2
+    STAKE = 3
+    UNSTAKE = 4
+
+    @property
+    def label(self) -> TransactionType:
+        return self.name.title()
+
+
+class TxStatus(enum.IntEnum):
+    COMPLETED = 0
+    PENDING = 1
+    FAILED = 2
+
+    @property
+    def label(self) -> TransactionStatus:
+        return self.name.title()
+
+
+class Token(enum.IntEnum):
+    NONE = 0
+    USD = 1
+    USDT = 2
+    ASRA = 3
+
+
+# Network fee per transaction type, as a fraction of the amount sent.
+FEE_RATES = {
+    TxType.DEPOSIT: 0.0,
+    TxType.WITHDRAW: 0.005,
+    TxType.SWAP: 0.003,
+    TxType.STAKE: 0.0,
+    TxType.UNSTAKE: 0.001,
+}
+
+
+class Transaction(TypedDict):
+    """A transaction formatted for display."""
+
+    id: str
+    type: TransactionType
+    status: TransactionStatus
+    date: str
+    amount: str
+    hash: str
+
+
+# One row of the columnar container; 44 bytes instead of a dict of strings.
+TX_DTYPE = np.dtype(
+    [
+        ("id", np.int64),
+        ("type", np.uint8),
+        ("status", np.uint8),
+        ("ts", np.int64),
+        ("token", np.uint8),
+        ("amount", np.int64),
+        ("counter_token", np.uint8),
+        ("counter_amount", np.int64),
+        ("fee", np.int64),
+    ]
+)
+
+
+def to_fixed(value: float) -> int:
+    return round(value * AMOUNT_SCALE)
+
+
+def amounts_for(tx_type: TxType, value: float) -> dict[str, int]:
+    """Token, fixed-point amount and fee columns of a `tx_type` of `value` units.
+
+    Deposits and withdrawals are in USD, stakes in ASRA, and swaps convert
+    USDT into ASRA at `SWAP_RATE`. The fee is charged in `token`.
+    """
+    fee = to_fixed(value * FEE_RATES[tx_type])
+    if tx_type == TxType.SWAP:
+        return {
+            "token": Token.USDT,
+            "amount": to_fixed(value),
+            "counter_token": Token.ASRA,
+            "counter_amount": to_fixed(value * SWAP_RATE),
+            "fee": fee,
+        }
+    token = Token.ASRA if tx_type in (TxType.STAKE, TxType.UNSTAKE) else Token.USD
+    return {
+        "token": token,
+        "amount": to_fixed(value),
+        "counter_token": Token.NONE,
+        "counter_amount": 0,
+        "fee": fee,
+    }
+
+
+def usd_value(token: int, amount: int) -> int:
+    """Fixed-point USD worth of `amount` of `token` (ASRA at the swap rate)."""
+    if token == Token.ASRA:
+        return round(amount / SWAP_RATE)
+    return amount if token in (Token.USD, Token.USDT) else 0
+
+
+def format_amount(token: int, amount: int, counter_token: int, counter_amount: int) -> str:
+    def money(t: int, a: int) -> str:
+        value = a / AMOUNT_SCALE
+        return f"${value:.2f}" if t == Token.USD else f"{value:.2f} {Token(t).name}"
+
+    if counter_token == Token.NONE:
+        return money(token, amount)
+    return f"{money(token, amount)} -> {money(counter_token, counter_amount)}"
+
+
+def format_transaction(row: Mapping) -> Transaction:
+    """Render one stored row; only rows about to be shown pay for this."""
+    return {
+        "id": str(row["id"]),
+        "type": TxType(row["type"]).label,
+        "status": TxStatus(row["status"]).label,
+        "date": datetime.datetime.fromtimestamp(row["ts"]).strftime("%Y-%m-%d"),
+        "amount": format_amount(
+            row["token"], row["amount"], row["counter_token"], row["counter_amount"]
+        ),
+        "hash": f"{row['hash'][:14]}...",
+    }
+
+
+class TransactionFrame:
+    """Array-backed transactions for aggregation over millions of rows.
+
+    Holds the numeric columns of `TX_DTYPE` in one NumPy structured array,
+    with the hashes alongside when the rows carried them; filters return
+    compact copies, and sums run vectorized on the fixed-point integers.
+    """
+
+    def __init__(self, data: np.ndarray, hashes: np.ndarray | None = None):
+        self.data = data
+        self.hashes = hashes
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]) -> "TransactionFrame":
+        """Build from tuples of `TX_DTYPE`'s columns followed by the hash.
+
+        That is the row shape `ledger.chunks` yields.
+        """
+        rows = list(rows)
+        return cls(
+            np.fromiter((row[:-1] for row in rows), dtype=TX_DTYPE, count=len(rows)),
+            np.array([row[-1] for row in rows], dtype=object),
+        )
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping]) -> "TransactionFrame":
+        """Build from mappings of the numeric columns (`id` defaults to 0)."""
+        columns = TX_DTYPE.names
+        return cls(
+            np.fromiter(
+                (tuple(r.get(c, 0) for c in columns) for r in records), dtype=TX_DTYPE
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.data[column]
+
+    def where(
+        self,
+        *,
+        type: TxType | None = None,
+        status: TxStatus | None = None,
+        since: int | None = None,
+        until: int | None = None,
+    ) -> "TransactionFrame":
+        mask = np.ones(len(self.data), dtype=bool)
+        if type is not None:
+            mask &= self.data["type"] == type
+        if status is not None:
+            mask &= self.data["status"] == status
+        if since is not None:
+            mask &= self.data["ts"] >= since
+        if until is not None:
+            mask &= self.data["ts"] < until
+        hashes = None if self.hashes is None else self.hashes[mask]
+        return TransactionFrame(self.data[mask], hashes)
+
+    def usd(self, column: str = "amount") -> np.ndarray:
+        """Fixed-point USD worth of `column` ("amount" or "fee"), per row.
+
+        The vectorized `usd_value`: both are in the row's `token`.
+        """
+        token, amount = self.data["token"], self.data[column]
+        asra = np.rint(amount / SWAP_RATE).astype(np.int64)
+        dollars = np.isin(token, (Token.USD, Token.USDT))
+        return np.where(token == Token.ASRA, asra, np.where(dollars, amount, 0))
+
+    def total(self, token: Token) -> float:
+        """Sum of `token` moved, on either side of a transaction, in units."""
+        amount = self.data["amount"][self.data["token"] == token].sum()
+        counter = self.data["counter_amount"][self.data["counter_token"] == token].sum()
+        return int(amount + counter) / AMOUNT_SCALE
@@ -0,0 +1,138 @@
+import asyncio
+import collections
+import functools
+import itertools
+import os
+import time
+
+from sqlalchemy import Index, func, insert
+from sqlmodel import Field, Session, SQLModel, select
+
+from app.services import governance, pubsub
+from app.services.catalog import catalog
+from app.services.db import create_tables
+
+# How often queued votes are folded into the tallies and written to disk.
+FLUSH_INTERVAL = float(os.environ.get("ASSURA_VOTE_FLUSH_MS", "200")) / 1000
+TALLY_CHANNEL = "dao:tallies"
+
+
+class VoteRecord(SQLModel, table=True):
+    """One vote cast on a DAO proposal."""
+
+    __tablename__ = "votes"
+    __table_args__ = (Index("ix_votes_proposal", "proposal_id"),)
+
+    id: int | None = Field(default=None, primary_key=True)
+    proposal_id: int
+    voter: str
+    weight: int
+    cast_at: float
+
+
+@functools.lru_cache(maxsize=None)
+def _engine():
+    return create_tables(VoteRecord)
+
+
+def _persist(batch: list[tuple[int, int, str, int, float]]):
+    with Session(_engine()) as session:
+        session.exec(
+            insert(VoteRecord),
+            params=[
+                {"proposal_id": p, "voter": v, "weight": w, "cast_at": t}
+                for _, p, v, w, t in batch
+            ],
+        )
+        session.commit()
+
+
+def _persisted_totals() -> dict[int, int]:
+    with Session(_engine()) as session:
+        rows = session.exec(
+            select(VoteRecord.proposal_id, func.sum(VoteRecord.weight)).group_by(
+                VoteRecord.proposal_id
+            )
+        ).all()
+    return {proposal_id: total for proposal_id, total in rows}
+
+
+class VoteTally:
+    """Cross-session vote counting with write-behind batching.
+
+    `cast` only appends to a queue, so concurrent voters never wait on a
+    lock or a disk write. Every `interval` one flush drains the queue,
+    sums it per proposal, publishes the new counts as a single catalog
+    version, writes the batch to SQLite in one transaction, and tells
+    subscribers of `TALLY_CHANNEL` once, however many votes it folded.
+    """
+
+    def __init__(self, interval: float = FLUSH_INTERVAL):
+        self.interval = interval
+        self._queue: collections.deque[tuple[int, int, str, int, float]] = (
+            collections.deque()
+        )
+        self._seq = itertools.count(1)
+        self._task: asyncio.Task | None = None
+        self._restored = False
+        self.flushed_through = 0
+        self.counters = collections.Counter()
+
+    def start(self):
+        """Fold persisted votes into the catalog and start the flusher (idempotent)."""
+        if not self._restored:
+            self._restored = True
+            totals = _persisted_totals()
+            proposals = catalog.snapshot().proposals
+            updates = {
+                pid: {"votes": proposals[pid]["votes"] + total}
+                for pid, total in totals.items()
+                if pid in proposals
+            }
+            if updates:
+                catalog.publish(proposals=proposals.replace(updates))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def cast(self, proposal_id: int, voter: str, weight: int) -> int:
+        """Queue a vote; returns its sequence number."""
+        seq = next(self._seq)
+        self._queue.append((seq, proposal_id, voter, weight, time.time()))
+        self.start()
+        return seq
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                self.counters["failed_flushes"] += 1
+
+    async def flush(self):
+        if not self._queue:
+            return
+        batch = [self._queue.popleft() for _ in range(len(self._queue))]
+        added = collections.Counter()
+        for _, proposal_id, _, weight, _ in batch:
+            added[proposal_id] += weight
+        proposals = catalog.snapshot().proposals
+        updates = {
+            pid: {"votes": proposals[pid]["votes"] + weight}
+            for pid, weight in added.items()
+            if pid in proposals
+        }
+        transitions = governance.crossings(proposals, updates)
+        snapshot = catalog.publish(proposals=proposals.replace(updates))
+        self.flushed_through = batch[-1][0]
+        self.counters["votes"] += len(batch)
+        self.counters["flushes"] += 1
+        pubsub.hub.publish(
+            TALLY_CHANNEL,
+            {"version": snapshot.version, "through": self.flushed_through},
+        )
+        governance.engine.announce(snapshot.version, transitions)
+        await asyncio.to_thread(_persist, batch)
+
+
+tally = VoteTally()
@@ -0,0 +1,30 @@
+import math
+
+# Rows rendered above and below the viewport so fast scrolls don't flash blank.
+OVERSCAN = 8
+# Viewport width (Tailwind's `md`) from which multi-column lists widen;
+# below it they are one column.
+WIDE_MIN_WIDTH = 768
+
+
+def visible_range(
+    scroll_top: float,
+    *,
+    row_height: int,
+    viewport_height: int,
+    total: int,
+    columns: int = 1,
+    overscan: int = OVERSCAN,
+) -> tuple[int, int]:
+    """Item index range [start, end) to render for a scroll position.
+
+    Rows are `columns` items wide and `row_height` pixels tall, so the
+    result is independent of how many items the backing list holds.
+    """
+    row_count = math.ceil(total / columns)
+    first_row = max(0, int(max(scroll_top, 0) // row_height) - overscan)
+    last_row = min(
+        row_count, int((max(scroll_top, 0) + viewport_height) // row_height) + 1 + overscan
+    )
+    first_row = min(first_row, max(row_count - 1, 0))
+    return first_row * columns, min(total, last_row * columns)
@@ -1,7 +1,19 @@
 import reflex as rx
-from typing import TypedDict
+from typing import ClassVar, TypedDict
 import random
 import time
+from app.services import governance, pubsub, recommend, search, timeseries, votes, windowing
+from app.services import token_metrics as network_metrics
+from app.services.catalog import catalog, strip_views
+from app.services.entity_store import PATCH_LIMIT
+from app.services.search import SearchHit
+
+SUGGESTION_ROW_HEIGHT = 196
+# Feed columns from the `md` breakpoint up; below it the feed is one column.
+SUGGESTION_COLUMNS = 2
+SUGGESTION_VIEWPORT_HEIGHT = 640
+# How often an idle tally watcher checks whether the DAO view is still open.
+TALLY_WATCH_TIMEOUT = 30
 
 
 class TokenMetrics(TypedDict):
@@ -33,6 +45,8 @@ class Proposal(TypedDict):
     votes: int
     threshold: int
     status: str
+    deadline: float
+    closes_at: str
 
 
 class UserProfile(TypedDict):
@@ -58,178 +72,326 @@ class AppState(rx.State):
     is_mobile_menu_open: bool = False
     is_chat_modal_open: bool = False
     is_profile_modal_open: bool = False
-    token_metrics: TokenMetrics = {
-        "total_supply": 1000000000,
-        "circulating_supply": 994550000,
-        "total_staked": 4520000,
-        "total_unstaking": 120000,
-        "total_burned": 1250000,
-    }
-    price_chart_data: list[PriceData] = [
-        {"name": "Day 1", "price": 0.015},
-        {"name": "Day 2", "price": 0.018},
-        {"name": "Day 3", "price": 0.017},
-        {"name": "Day 4", "price": 0.021},
-        {"name": "Day 5", "price": 0.025},
-        {"name": "Day 6", "price": 0.023},
-        {"name": "Day 7", "price": 0.028},
-    ]
-    suggestions: list[Suggestion] = []
+    chart_ranges: list[str] = list(timeseries.CHART_RANGES)
+    chart_range: str = "1D"
+    _metrics_version: int = 0
+    _catalog_version: int = 0
+    suggestion_total: int = 0
+    suggestion_window_start: int = 0
+    # Columns the client is showing, reported as it scrolls.
+    suggestion_columns: int = 1
+    _suggestion_window_end: int = 0
+    interest_tags: list[str] = ["Solidity", "DeFi", "React"]
+    _feed_ids: list[int] = []
     selected_profile: UserProfile | None = None
     community_view: str = "Chat"
-    proposals: list[Proposal] = []
+    # (sequence, proposal id, weight) of our votes not yet in the shared tally.
+    _unflushed_votes: list[tuple[int, int, int]] = []
+    _voted_on: list[int] = []
+    proposal_patches: dict[str, Proposal] = {}
+    # The catalog version `proposals` lists; 0 until the DAO tab loads.
+    _proposals_version: int = 0
+    _patched_version: int = 0
+    _watching_tallies: bool = False
+    # No watcher survives a restart; reset when restored by another process.
+    _task_flags: ClassVar[tuple[str, ...]] = ("_watching_tallies",)
+    # Tabs whose data this session has loaded; each loads on first open.
+    _loaded_tabs: list[str] = []
+    search_query: str = ""
+    search_results: list[SearchHit] = []
 
     @rx.event
     async def on_load(self):
+        votes.tally.start()
+        governance.engine.start()
+        await self._load_tab(self.active_tab)
+
+    async def _load_tab(self, tab_name: str):
+        """Load what `tab_name` shows, the first time it is opened or prefetched."""
+        from app.states.profile_state import ProfileState
+        from app.states.projects_state import ProjectsState
         from app.states.wallet_state import WalletState
 
-        if not self.suggestions:
-            self._initialize_suggestions()
-        if not self.proposals:
-            self._initialize_proposals()
-        wallet_sub_state = await self.get_state(WalletState)
-        if not wallet_sub_state.transactions:
-            wallet_sub_state._initialize_transactions()
+        if tab_name == "Chat & Community":
+            # Votes are weighted by the wallet's held + staked ASRA. Published
+            # on every view: the balance book lives in this process, so a
+            # session restored from a spill has no weight in it yet.
+            wallet = await self.get_state(WalletState)
+            wallet._sync_voting_weight()
+        if tab_name in self._loaded_tabs:
+            return
+        if tab_name == "Dashboard":
+            if not self._feed_ids:
+                self._initialize_suggestions()
+                self._load_suggestion_window()
+            self._metrics_version = network_metrics.service.snapshot().version
+        elif tab_name == "Chat & Community":
+            if not self._proposals_version:
+                self._sync_proposals()
+        elif tab_name == "Wallet & Staking":
+            wallet = await self.get_state(WalletState)
+            wallet._initialize_transactions()
+        elif tab_name == "Projects":
+            projects = await self.get_state(ProjectsState)
+            projects._load()
+        elif tab_name == "Profile":
+            profile = await self.get_state(ProfileState)
+            await profile._load()
+        self._loaded_tabs.append(tab_name)
+
+    def __getstate__(self):
+        return strip_views(
+            super().__getstate__(),
+            self.computed_vars["suggestions"],
+            self.computed_vars["proposals"],
+            self.computed_vars["token_metrics"],
+            self.computed_vars["price_chart_data"],
+        )
+
+    def _sync_proposals(self):
+        """Move to the current proposals; the rebuilt list includes our patches."""
+        self._proposals_version = self._patched_version = catalog.snapshot().version
+        self.proposal_patches = {}
 
     def _initialize_suggestions(self):
-        """Helper to create initial suggestion data."""
-        names = [
-            "Alex",
-            "Jordan",
-            "Taylor",
-            "Morgan",
-            "Casey",
-            "Riley",
-            "Jessie",
-            "Jamie",
-            "Kai",
-            "Rowan",
-        ]
-        skills = [
-            "Smart Contract Dev",
-            "UI/UX Designer",
-            "Frontend Dev",
-            "Backend Dev",
-            "DevOps Engineer",
-        ]
-        projects = [
-            "DeFi Platform",
-            "NFT Marketplace",
-            "DAO Tooling",
-            "Web3 Game",
-            "Wallet App",
-        ]
-        tags = [
-            ["Solidity", "DeFi"],
-            ["Figma", "Web3"],
-            ["React", "Ethers.js"],
-            ["Node.js", "API"],
-            ["CI/CD", "Security"],
+        """Rank the shared suggestion catalog against the user's interests."""
+        self._catalog_version = catalog.snapshot().version
+        self._feed_ids = recommend.get_index().rank(self.interest_tags)
+
+    def _load_suggestion_window(self, scroll_top: float = 0):
+        """Send the client only the suggestions visible at `scroll_top`."""
+        self.suggestion_total = len(self._feed_ids)
+        start, end = windowing.visible_range(
+            scroll_top,
+            row_height=SUGGESTION_ROW_HEIGHT,
+            viewport_height=SUGGESTION_VIEWPORT_HEIGHT,
+            total=self.suggestion_total,
+            columns=self.suggestion_columns,
+        )
+        self.suggestion_window_start = start
+        self._suggestion_window_end = end
+
+    @rx.var(
+        deps=[
+            "_catalog_version",
+            "_feed_ids",
+            "suggestion_window_start",
+            "_suggestion_window_end",
+        ],
+        auto_deps=False,
+    )
+    def suggestions(self) -> list[Suggestion]:
+        """The visible slice of the feed, read from the shared catalog."""
+        rows = catalog.at(self._catalog_version).suggestions
+        return [
+            {**rows[i]}
+            for i in self._feed_ids[
+                self.suggestion_window_start : self._suggestion_window_end
+            ]
         ]
-        for i in range(20):
-            user_name = random.choice(names)
-            if i % 2 == 0:
-                self.suggestions.append(
-                    {
-                        "id": i,
-                        "type": "worker",
-                        "name": user_name,
-                        "title": random.choice(skills),
-                        "tags": random.choice(tags),
-                        "avatar": f"https://api.dicebear.com/9.x/initials/svg?seed={user_name}",
-                    }
-                )
-            else:
-                self.suggestions.append(
-                    {
-                        "id": i,
-                        "type": "project",
-                        "name": f"Project by {user_name}",
-                        "title": random.choice(projects),
-                        "tags": random.choice(tags),
-                        "avatar": f"https://api.dicebear.com/9.x/notionists/svg?seed={user_name}",
-                    }
-                )
-
-    def _initialize_proposals(self):
-        self.proposals = [
-            {
-                "id": 101,
-                "title": "Add New Staking Tier: Platinum",
-                "description": "Proposal to add a new top-tier staking level with higher rewards.",
-                "votes": 47000,
-                "threshold": 50000,
-                "status": "voting",
-            },
-            {
-                "id": 102,
-                "title": "Increase Project Dispute Fee",
-                "description": "Increase the dispute fee from 50 ASRA to 100 ASRA to prevent spam.",
-                "votes": 62000,
-                "threshold": 50000,
-                "status": "passed",
-            },
-            {
-                "id": 103,
-                "title": "Community Grant for Dev Tooling",
-                "description": "Fund a project to build better developer tools for the Assura ecosystem.",
-                "votes": 35000,
-                "threshold": 60000,
-                "status": "voting",
-            },
-            {
-                "id": 104,
-                "title": "Marketing Campaign for Q3",
-                "description": "Allocate funds for a major marketing push to attract new users.",
-                "votes": 88000,
-                "threshold": 75000,
-                "status": "executed",
-            },
+
+    @rx.event
+    def scroll_suggestions(self, scroll_top: float, columns: int = 1):
+        columns = min(max(int(columns), 1), SUGGESTION_COLUMNS)
+        start, _ = windowing.visible_range(
+            scroll_top,
+            row_height=SUGGESTION_ROW_HEIGHT,
+            viewport_height=SUGGESTION_VIEWPORT_HEIGHT,
+            total=self.suggestion_total,
+            columns=columns,
+        )
+        if columns != self.suggestion_columns:
+            self.suggestion_columns = columns
+            self._load_suggestion_window(scroll_top)
+        elif start != self.suggestion_window_start:
+            self._load_suggestion_window(scroll_top)
+
+    @rx.var(deps=["_metrics_version"], auto_deps=False)
+    def token_metrics(self) -> TokenMetrics:
+        return dict(network_metrics.service.snapshot().token_metrics)
+
+    @rx.var(deps=["_metrics_version", "chart_range"], auto_deps=False)
+    def price_chart_data(self) -> list[PriceData]:
+        return list(network_metrics.service.chart(self.chart_range))
+
+    @rx.event
+    def set_chart_range(self, range_key: str):
+        self.chart_range = range_key
+
+    @rx.var(deps=["_proposals_version"], auto_deps=False)
+    def proposals(self) -> list[Proposal]:
+        """Shared proposals, plus our votes the tally has not flushed yet.
+
+        Individual changes go out through `proposal_patches` instead, so a
+        vote or tally update ships those proposals rather than this list.
+        """
+        return [
+            self._with_unflushed(p) for p in catalog.at(self._proposals_version).proposals
         ]
 
+    def _with_unflushed(self, proposal) -> Proposal:
+        pending = sum(w for _, pid, w in self._unflushed_votes if pid == proposal["id"])
+        return {**proposal, "votes": proposal["votes"] + pending}
+
     @rx.event
     def toggle_dark_mode(self):
         self.is_dark_mode = not self.is_dark_mode
 
     @rx.event
-    def set_active_tab(self, tab_name: str):
+    async def set_active_tab(self, tab_name: str):
         self.active_tab = tab_name
         self.is_mobile_menu_open = False
+        await self._load_tab(tab_name)
+        if self._dao_view_open:
+            return AppState.watch_tallies
+
+    @rx.event
+    async def prefetch_tab(self, tab_name: str):
+        """Load a tab's data while its nav item is hovered."""
+        await self._load_tab(tab_name)
 
     @rx.event
     def set_community_view(self, view: str):
         self.community_view = view
+        if self._dao_view_open:
+            return AppState.watch_tallies
+
+    @property
+    def _dao_view_open(self) -> bool:
+        return (
+            self.active_tab == "Chat & Community"
+            and self.community_view == "Community"
+        )
+
+    def _apply_dao_updates(self):
+        """Patch in proposals the tally or governance changed since we looked."""
+        self._unflushed_votes = [
+            v for v in self._unflushed_votes if v[0] > votes.tally.flushed_through
+        ]
+        changed = catalog.changed_since(self._patched_version, "proposals")
+        listed = catalog.at(self._proposals_version).proposals
+        if (
+            changed is None
+            or len(changed | self.proposal_patches.keys()) > PATCH_LIMIT
+            or any(proposal_id not in listed for proposal_id in changed)
+        ):
+            self._sync_proposals()
+            return
+        for proposal_id in changed:
+            self._patch_proposal(proposal_id)
+        self._patched_version = catalog.snapshot().version
+
+    @rx.event(background=True)
+    async def watch_tallies(self):
+        """Keep vote counts and statuses live while the DAO view is open.
+
+        Updates are coalesced: however many tally flushes and status
+        transitions arrived since the last wake-up, they are applied in one
+        state update.
+        """
+        async with self:
+            if self._watching_tallies or not self._dao_view_open:
+                return
+            self._watching_tallies = True
+            token = self.router.session.client_token
+            key = f"{token}:tallies"
+            channels = (votes.TALLY_CHANNEL, governance.PROPOSALS_CHANNEL)
+            subscription = pubsub.hub.subscribe(key, *channels)
+            self._apply_dao_updates()
+        try:
+            while pubsub.client_connected(token):
+                batch = await subscription.get(timeout=TALLY_WATCH_TIMEOUT)
+                async with self:
+                    if not self._dao_view_open:
+                        break
+                    dropped = subscription.dropped
+                    if dropped:
+                        subscription = pubsub.hub.subscribe(key, *channels)
+                    if batch or dropped:
+                        self._apply_dao_updates()
+        finally:
+            subscription.close()
+            async with self:
+                self._watching_tallies = False
 
     @rx.event
     def vote_on_proposal(self, proposal_id: int):
-        for i, p in enumerate(self.proposals):
-            if p["id"] == proposal_id:
-                self.proposals[i]["votes"] += random.randint(100, 1000)
-                break
+        proposal = catalog.snapshot().proposals.get(proposal_id)
+        if proposal is None:
+            return
+        if proposal["status"] != "voting":
+            yield rx.toast("Voting has closed for this proposal.", duration=3000)
+            return
+        if proposal_id in self._voted_on:
+            yield rx.toast("You have already voted on this proposal.", duration=3000)
+            return
+        token = self.router.session.client_token
+        weight = int(governance.engine.voting_weight(proposal_id, token))
+        if weight <= 0:
+            yield rx.toast(
+                "No Voting Power",
+                description="You held no ASRA when this proposal opened.",
+                duration=3000,
+            )
+            return
+        seq = votes.tally.cast(proposal_id, token, weight)
+        self._voted_on.append(proposal_id)
+        self._unflushed_votes.append((seq, proposal_id, weight))
+        self._patch_proposal(proposal_id)
         yield rx.toast(
-            "Vote Cast!", description="Your vote has been recorded.", duration=3000
+            "Vote Cast!",
+            description=f"{weight:,} ASRA of voting power recorded.",
+            duration=3000,
         )
 
+    def _patch_proposal(self, proposal_id: int):
+        key = str(proposal_id)
+        if len(self.proposal_patches) >= PATCH_LIMIT and key not in self.proposal_patches:
+            # Fold the patches into one resend of the list.
+            self._sync_proposals()
+            return
+        proposal = catalog.snapshot().proposals[proposal_id]
+        self.proposal_patches[key] = self._with_unflushed(proposal)
+
+    @rx.event
+    def set_search_query(self, query: str):
+        self.search_query = query
+        index = search.get_index()
+        # No results while the index is still being built at startup.
+        self.search_results = index.search(query) if index is not None and query.strip() else []
+
+    @rx.event
+    def clear_search(self):
+        self.search_query = ""
+        self.search_results = []
+
+    @rx.event
+    async def open_search_result(self, hit: SearchHit):
+        self.search_query = ""
+        self.search_results = []
+        if hit["kind"] == "suggestion":
+            self.active_tab = "Dashboard"
+            await self._load_tab(self.active_tab)
+            return AppState.open_profile_modal(
+                {**catalog.snapshot().suggestions[hit["id"]]}
+            )
+        if hit["kind"] == "project":
+            self.active_tab = "Projects"
+            await self._load_tab(self.active_tab)
+        else:
+            self.active_tab = "Chat & Community"
+            self.community_view = "Community"
+            await self._load_tab(self.active_tab)
+            return AppState.watch_tallies
+
     @rx.event
     def toggle_mobile_menu(self):
         self.is_mobile_menu_open = not self.is_mobile_menu_open
 
     @rx.event
     def refresh_metrics(self):
-        """Simulates refreshing token metrics and chart data."""
-        self.token_metrics["circulating_supply"] += random.randint(-10000, 10000)
-        self.token_metrics["total_staked"] += random.randint(1000, 5000)
-        self.token_metrics["total_unstaking"] = random.randint(5000, 20000)
-        new_price_data = self.price_chart_data
-        last_price = new_price_data[-1]["price"]
-        new_price = last_price * (1 + random.uniform(-0.1, 0.1))
-        new_day_num = len(new_price_data) + 1
-        new_price_data.append(
-            {"name": f"Day {new_day_num}", "price": round(new_price, 3)}
-        )
-        if len(new_price_data) > 10:
-            new_price_data.pop(0)
-        self.price_chart_data = new_price_data
+        """Picks up the latest shared metrics snapshot."""
+        self._metrics_version = network_metrics.service.snapshot().version
 
     @rx.event
     def open_chat_modal(self):
@@ -257,6 +419,11 @@ class AppState(rx.State):
 
     @rx.event
     def handle_form_submit(self, form_data: dict):
+        skill = form_data.get("skill_name", "").strip()
+        if skill and skill not in self.interest_tags:
+            self.interest_tags.append(skill)
+            self._initialize_suggestions()
+            self._load_suggestion_window()
         yield rx.toast(
             "Form Submitted!",
             description="Your submission has been received.",
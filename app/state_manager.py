@@ -0,0 +1,239 @@
+import asyncio
+import collections
+import contextlib
+import dataclasses
+import os
+import pickle
+import time
+import weakref
+from collections.abc import AsyncIterator, Iterator
+
+import reflex as rx
+from reflex.istate.manager import _default_token_expiration
+from reflex.istate.manager.disk import StateManagerDisk
+from reflex.istate.manager.memory import StateManagerMemory
+from reflex.state import BaseState, _split_substate_key
+from reflex.utils import console
+
+from app.services import session_store
+
+# Seconds a session may go unused before it is spilled to disk.
+SESSION_IDLE_TTL = float(os.environ.get("ASSURA_SESSION_IDLE_TTL", "300"))
+# Sessions held in memory at most; beyond it the least recently used spill.
+SESSION_MAX_HOT = int(os.environ.get("ASSURA_SESSION_MAX_HOT", "2000"))
+SWEEP_INTERVAL = min(SESSION_IDLE_TTL, 30)
+# Sessions pickled per write; the event loop runs between batches.
+SPILL_BATCH = 100
+
+
+def _walk(state: BaseState) -> Iterator[BaseState]:
+    yield state
+    for substate in state.substates.values():
+        yield from _walk(substate)
+
+
+def _snapshot(root: BaseState) -> bytes:
+    """Every substate of a session, serialized the way the disk manager does."""
+    return pickle.dumps(
+        {
+            state.get_full_name(): data
+            for state in _walk(root)
+            # Empty when a state could not be pickled; it restarts fresh.
+            if (data := state._serialize())
+        }
+    )
+
+
+def _graft(
+    fresh: BaseState, snapshots: dict[str, bytes], parent: BaseState | None = None
+) -> BaseState:
+    """`fresh`'s tree with each state replaced by its snapshot, where usable."""
+    state = fresh
+    if data := snapshots.get(fresh.get_full_name()):
+        try:
+            state = BaseState._deserialize(data)
+        except Exception:
+            # The state's schema changed since it was spilled.
+            state = fresh
+    state.parent_state = parent
+    state.substates = {
+        name: _graft(substate, snapshots, state)
+        for name, substate in fresh.substates.items()
+    }
+    return state
+
+
+@dataclasses.dataclass
+class SpillingStateManager(StateManagerMemory):
+    """Keeps recently used sessions in memory and spills the rest to SQLite.
+
+    Sessions are held in LRU order. One unused for `idle_ttl` seconds, or
+    the least recently used while more than `max_hot` are held, is
+    pickled to the app database and dropped from memory; its next event
+    loads it back. A session whose lock is held or awaited never spills.
+    Nothing is written on the hot path: a session is written when it
+    spills and on shutdown. Spilled sessions unused for the token
+    expiration are forgotten, as with the disk manager.
+    """
+
+    states: collections.OrderedDict[str, BaseState] = dataclasses.field(
+        default_factory=collections.OrderedDict
+    )
+    # A session's lock lives only while an event holds or awaits it.
+    _states_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = dataclasses.field(
+        default_factory=weakref.WeakValueDictionary, init=False
+    )
+    idle_ttl: float = SESSION_IDLE_TTL
+    max_hot: int = SESSION_MAX_HOT
+    token_expiration: int = dataclasses.field(
+        default_factory=_default_token_expiration
+    )
+    counters: dict[str, int] = dataclasses.field(
+        default_factory=lambda: {"spilled": 0, "restored": 0, "spilled_bytes": 0},
+        init=False,
+    )
+    _last_used: dict[str, float] = dataclasses.field(default_factory=dict, init=False)
+    # Snapshots still being written; restores read them first.
+    _writing: dict[str, bytes] = dataclasses.field(default_factory=dict, init=False)
+    _sweeper: asyncio.Task | None = dataclasses.field(default=None, init=False)
+    _over_capacity: asyncio.Event = dataclasses.field(
+        default_factory=asyncio.Event, init=False
+    )
+
+    def stats(self) -> dict[str, int]:
+        return {"hot": len(self.states), **self.counters}
+
+    def _touch(self, token: str, state: BaseState):
+        self.states[token] = state
+        self.states.move_to_end(token)
+        self._last_used[token] = time.time()
+        if len(self.states) > self.max_hot:
+            self._over_capacity.set()
+
+    async def get_state(self, token: str) -> BaseState:
+        token = _split_substate_key(token)[0]
+        self._start_sweeper()
+        state = self.states.get(token)
+        if state is None:
+            restored = await self._restore(token)
+            # Another caller may have restored it while this one was reading.
+            state = self.states.get(token, restored)
+        self._touch(token, state)
+        return state
+
+    async def set_state(self, token: str, state: BaseState):
+        self._touch(_split_substate_key(token)[0], state)
+
+    @contextlib.asynccontextmanager
+    async def modify_state(self, token: str) -> AsyncIterator[BaseState]:
+        token = _split_substate_key(token)[0]
+        lock = self._states_locks.get(token)
+        if lock is None:
+            lock = self._states_locks[token] = asyncio.Lock()
+        async with lock:
+            yield await self.get_state(token)
+
+    async def _restore(self, token: str) -> BaseState:
+        data, boot = self._writing.get(token), session_store.BOOT
+        if data is None:
+            row = await asyncio.to_thread(session_store.load, token)
+            if row is None:
+                return self.state(_reflex_internal_init=True)
+            data, boot = row
+        root = _graft(self.state(_reflex_internal_init=True), pickle.loads(data))
+        if boot != session_store.BOOT:
+            # The background tasks these flags stand for ended with that process.
+            for state in _walk(root):
+                for flag in getattr(state, "_task_flags", ()):
+                    setattr(state, flag, False)
+        self.counters["restored"] += 1
+        return root
+
+    def _spillable(self, now: float) -> list[str]:
+        """Up to a batch of sessions to spill, least recently used first."""
+        excess = len(self.states) - self.max_hot
+        found = []
+        for token in self.states:
+            if len(found) == SPILL_BATCH:
+                break
+            if excess <= 0 and now - self._last_used[token] < self.idle_ttl:
+                break
+            if token not in self._states_locks:
+                found.append(token)
+                excess -= 1
+        return found
+
+    async def _spill(self, tokens: list[str]) -> bool:
+        evicted = {token: self.states.pop(token) for token in tokens}
+        last_used = {token: self._last_used.pop(token) for token in tokens}
+        snapshots = {token: _snapshot(state) for token, state in evicted.items()}
+        self._writing.update(snapshots)
+        try:
+            await asyncio.to_thread(session_store.save, snapshots)
+        except Exception as e:
+            console.error(f"Could not spill {len(tokens)} sessions: {e!r}")
+            # Keep them in memory, back in their place at the LRU end.
+            for token, state in reversed(evicted.items()):
+                if token not in self.states:
+                    self.states[token] = state
+                    self.states.move_to_end(token, last=False)
+                    self._last_used[token] = last_used[token]
+            return False
+        finally:
+            for token, data in snapshots.items():
+                if self._writing.get(token) is data:
+                    del self._writing[token]
+        self.counters["spilled"] += len(tokens)
+        self.counters["spilled_bytes"] += sum(map(len, snapshots.values()))
+        return True
+
+    async def sweep(self):
+        """Spill every session that is idle or over capacity."""
+        while (tokens := self._spillable(time.time())) and await self._spill(tokens):
+            pass
+
+    async def _sweep_forever(self):
+        purged_at = 0.0
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._over_capacity.wait(), SWEEP_INTERVAL)
+            self._over_capacity.clear()
+            try:
+                await self.sweep()
+                if time.time() - purged_at > SWEEP_INTERVAL:
+                    purged_at = time.time()
+                    await asyncio.to_thread(
+                        session_store.purge, purged_at - self.token_expiration
+                    )
+            except Exception as e:
+                console.error(f"Error sweeping idle sessions: {e!r}")
+
+    def _start_sweeper(self):
+        loop = asyncio.get_running_loop()
+        if self._sweeper is not None and self._sweeper.get_loop() is not loop:
+            # A new event loop (e.g. the app restarted in this process).
+            self._sweeper, self._over_capacity = None, asyncio.Event()
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = loop.create_task(
+                self._sweep_forever(), name="SpillingStateManager|sweeper"
+            )
+
+    async def close(self):
+        """Stop sweeping and spill every session, so a restart can restore them."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._sweeper
+            self._sweeper = None
+        while self.states and await self._spill(list(self.states)[:SPILL_BATCH]):
+            pass
+
+
+def install(app: rx.App):
+    """Use the spilling manager in place of the default disk manager.
+
+    A Redis (or explicitly configured memory) manager is left alone. Call
+    this before anything wraps the manager, e.g. `middleware.install`.
+    """
+    if isinstance(app.state_manager, StateManagerDisk):
+        app._state_manager = SpillingStateManager(state=app._state)
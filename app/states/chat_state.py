@@ -1,54 +1,197 @@
 import reflex as rx
-from typing import TypedDict
 import datetime
-import asyncio
-import random
+import os
+from typing import ClassVar
+from app.services import chat_log, pubsub, replies
+from app.services.chat_log import Message
+from app.services.entity_store import PATCH_LIMIT
+from app.services.factory import factory, scaled
 
-
-class Message(TypedDict):
-    sender: str
-    text: str
-    timestamp: str
-    avatar: str
+# Messages kept in session state; older ones stay in the chat log on disk.
+CHAT_WINDOW = int(os.environ.get("ASSURA_CHAT_WINDOW", "50"))
+CHAT_PAGE_SIZE = 20
+CHAT_MAX_LOADED = 200
+# Mock history a public room starts with (times ASSURA_SCALE).
+ROOM_HISTORY = 50
+# How often an idle room listener checks whether its tab is still open.
+LISTEN_TIMEOUT = 30
 
 
 class ChatState(rx.State):
     messages: list[Message] = []
+    # Messages since `messages` was last sent, shipped on their own so a new
+    # message doesn't resend the whole window.
+    new_messages: list[Message] = []
+    has_older_messages: bool = False
     is_typing: bool = False
+    rooms: list[str] = ["direct", "general", "builders", "governance"]
+    room: str = "direct"
+    _window_loaded: bool = False
+    _window_detached: bool = False
+    _listening: bool = False
+    # Set while this process runs the task; cleared for a session restored
+    # from another process (see SpillingStateManager).
+    _task_flags: ClassVar[tuple[str, ...]] = ("_listening",)
+
+    @rx.var
+    def user_handle(self) -> str:
+        return f"User-{self.router.session.client_token[:4]}"
+
+    @property
+    def _direct_channel(self) -> str:
+        return f"dm:{self.router.session.client_token}"
+
+    @property
+    def _channel(self) -> str:
+        if self.room == "direct":
+            return self._direct_channel
+        return f"room:{self.room}"
+
+    def _load_recent(self):
+        """Reset the window to the latest messages of the channel."""
+        recent = chat_log.history(self._channel, limit=CHAT_WINDOW + 1)
+        if not recent and self.room != "direct":
+            rows = factory.messages(scaled(ROOM_HISTORY), key=self.room)
+            if chat_log.seed(self._channel, rows.records()):
+                recent = chat_log.history(self._channel, limit=CHAT_WINDOW + 1)
+        self.has_older_messages = len(recent) > CHAT_WINDOW
+        self.messages = recent[-CHAT_WINDOW:]
+        self.new_messages = []
+        self._window_loaded = True
+        self._window_detached = False
+
+    def _fold_new_messages(self):
+        """Move `new_messages` into `messages`, one resend of the window."""
+        if self.new_messages:
+            self.messages = self.messages + self.new_messages
+            self.new_messages = []
+
+    def _append(self, message: Message):
+        """Append a message to the bounded window."""
+        if not self._window_loaded or self._window_detached:
+            self._load_recent()
+            if self.messages and self.messages[-1]["id"] >= message["id"]:
+                return
+        if len(self.new_messages) >= PATCH_LIMIT:
+            self._fold_new_messages()
+            if len(self.messages) > CHAT_WINDOW:
+                self.messages = self.messages[-CHAT_WINDOW:]
+                self.has_older_messages = True
+        self.new_messages.append(message)
+
+    def _push(
+        self, sender: str, text: str, avatar: str, channel: str | None = None
+    ) -> Message:
+        """Persist a message to a channel (default: the current one) and show it."""
+        channel = channel or self._channel
+        message = chat_log.append(
+            channel,
+            sender=sender,
+            text=text,
+            timestamp=datetime.datetime.now().strftime("%H:%M"),
+            avatar=avatar,
+        )
+        if channel == self._channel:
+            self._append(message)
+        return message
 
     @rx.event
-    def send_message(self, form_data: dict):
-        message_text = form_data.get("message", "").strip()
-        if not message_text:
+    def load_chat(self):
+        if not self._window_loaded:
+            self._load_recent()
+        if not self._listening:
+            return ChatState.listen
+
+    @rx.event
+    def set_room(self, room: str):
+        if room == self.room:
             return
-        user_avatar = "https://api.dicebear.com/9.x/initials/svg?seed=User"
-        self.messages.append(
-            {
-                "sender": "You",
-                "text": message_text,
-                "timestamp": datetime.datetime.now().strftime("%H:%M"),
-                "avatar": user_avatar,
-            }
-        )
-        yield
-        return ChatState.persona_reply
+        subscription = pubsub.hub.subscriptions.get(self.router.session.client_token)
+        if subscription is not None and self._channel != self._direct_channel:
+            subscription.leave(self._channel)
+        self.room = room
+        if subscription is not None:
+            subscription.join(self._channel)
+        self._load_recent()
 
     @rx.event(background=True)
-    async def persona_reply(self):
-        async with self:
-            self.is_typing = True
-        await asyncio.sleep(random.uniform(1, 2.5))
+    async def listen(self):
+        """Apply messages and typing updates published to this session.
+
+        Subscribes to the current room (other sessions' messages) and to
+        the session's DM channel (persona replies from the reply scheduler).
+        """
         async with self:
-            user_name = "Alex"
-            persona_avatar = (
-                f"https://api.dicebear.com/9.x/initials/svg?seed={user_name}"
-            )
-            self.messages.append(
-                {
-                    "sender": user_name,
-                    "text": "That's an interesting point! I'll look into it.",
-                    "timestamp": datetime.datetime.now().strftime("%H:%M"),
-                    "avatar": persona_avatar,
-                }
+            if self._listening:
+                return
+            self._listening = True
+            token = self.router.session.client_token
+            channels = {self._direct_channel, self._channel}
+            subscription = pubsub.hub.subscribe(token, *channels)
+        try:
+            while pubsub.client_connected(token):
+                batch = await subscription.get(timeout=LISTEN_TIMEOUT)
+                if not batch and not subscription.dropped:
+                    continue
+                async with self:
+                    if subscription.dropped:
+                        # We fell too far behind; resync from the log.
+                        channels = {self._direct_channel, self._channel}
+                        subscription = pubsub.hub.subscribe(token, *channels)
+                        self._load_recent()
+                        continue
+                    for channel, event in batch:
+                        if event["kind"] == "typing":
+                            self.is_typing = event["typing"]
+                        elif channel == self._channel:
+                            self._append(event["message"])
+        finally:
+            subscription.close()
+            replies.scheduler.cancel(token)
+            async with self:
+                self._listening = False
+                self.is_typing = False
+
+    @rx.event
+    def load_older_messages(self):
+        if not self.has_older_messages or not self.messages:
+            return
+        self._fold_new_messages()
+        older = chat_log.history(
+            self._channel, before=self.messages[0]["id"], limit=CHAT_PAGE_SIZE + 1
+        )
+        self.has_older_messages = len(older) > CHAT_PAGE_SIZE
+        messages = older[-CHAT_PAGE_SIZE:] + self.messages
+        if len(messages) > CHAT_MAX_LOADED:
+            # Drop the newest end; the next message reloads the latest window.
+            messages = messages[:CHAT_MAX_LOADED]
+            self._window_detached = True
+        self.messages = messages
+
+    @rx.event
+    def on_chat_scroll(self, near_top: bool):
+        if near_top:
+            return ChatState.load_older_messages
+
+    @rx.event
+    def send_message(self, form_data: dict):
+        message_text = form_data.get("message", "").strip()
+        if not message_text:
+            return
+        user_avatar = f"https://api.dicebear.com/9.x/initials/svg?seed={self.user_handle}"
+        message = self._push(self.user_handle, message_text, user_avatar)
+        if self.room == "direct":
+            if not replies.scheduler.submit(
+                self.router.session.client_token, message_text
+            ):
+                return rx.toast(
+                    "Reply Unavailable",
+                    description=f"{replies.PERSONA_NAME} is too busy to answer right now.",
+                    duration=4000,
+                )
+        else:
+            pubsub.hub.publish(
+                self._channel,
+                {"kind": "message", "message": message},
+                skip=self.router.session.client_token,
             )
-            self.is_typing = False
\ No newline at end of file
@@ -0,0 +1,30 @@
+import reflex as rx
+from typing import TypedDict
+from app.services import metrics
+
+
+class EventCostRow(TypedDict):
+    handler: str
+    calls: int
+    wall_ms_mean: float
+    wall_ms_p95: float
+    lock_wait_ms_mean: float
+    delta_bytes_mean: int
+    dirty_vars_mean: float
+
+
+class DebugState(rx.State):
+    """The event-cost overlay (shown when ASSURA_DEBUG_OVERLAY is set)."""
+
+    is_overlay_open: bool = False
+    event_costs: list[EventCostRow] = []
+
+    @rx.event
+    def toggle_overlay(self):
+        self.is_overlay_open = not self.is_overlay_open
+        if self.is_overlay_open:
+            self.event_costs = metrics.registry.summary()
+
+    @rx.event
+    def refresh_event_costs(self):
+        self.event_costs = metrics.registry.summary()
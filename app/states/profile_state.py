@@ -1,7 +1,9 @@
 import reflex as rx
+import hashlib
 from typing import TypedDict, Literal
-import random
-from app.states.wallet_state import Transaction
+from app.services import jobid
+from app.services.factory import factory
+from app.states.wallet_state import WalletState
 
 ProfileView = Literal["Worker", "Client"]
 
@@ -12,6 +14,28 @@ class PortfolioItem(TypedDict):
     image_url: str
 
 
+class Job(TypedDict):
+    title: str
+    client: str
+    budget: int
+    rating: float
+    completed_at: str
+
+
+PORTFOLIO_ITEMS: list[PortfolioItem] = [
+    {
+        "title": "DeFi Dashboard",
+        "description": "A comprehensive analytics dashboard for a lending protocol.",
+        "image_url": "/placeholder.svg",
+    },
+    {
+        "title": "NFT Minting Site",
+        "description": "Frontend for a generative art NFT collection.",
+        "image_url": "/placeholder.svg",
+    },
+]
+
+
 class ProfileState(rx.State):
     profile_view: ProfileView = "Worker"
     expanded_sections: dict[str, bool] = {
@@ -27,65 +51,32 @@ class ProfileState(rx.State):
     client_projects_posted: int = 8
     client_total_spending: int = 120500
     client_dao_votes: int = 42
-    transaction_history: list[Transaction] = []
+    # Completed jobs with their ratings; also the inputs of the JobID bundle.
+    jobs: list[Job] = []
+    # Sections whose data has been loaded; each loads once, on first expand.
+    loaded_sections: list[str] = []
 
-    @rx.event
-    def on_load(self):
-        if not self.portfolio_items:
-            self._initialize_profile_data()
-
-    def _initialize_profile_data(self):
-        self.portfolio_items = [
-            {
-                "title": "DeFi Dashboard",
-                "description": "A comprehensive analytics dashboard for a lending protocol.",
-                "image_url": "/placeholder.svg",
-            },
-            {
-                "title": "NFT Minting Site",
-                "description": "Frontend for a generative art NFT collection.",
-                "image_url": "/placeholder.svg",
-            },
-        ]
-        if not self.transaction_history:
-            import datetime
-
-            types: list[Literal["Deposit", "Withdraw", "Swap", "Stake", "Unstake"]] = [
-                "Deposit",
-                "Withdraw",
-                "Swap",
-                "Stake",
-                "Unstake",
-            ]
-            statuses: list[Literal["Completed", "Pending", "Failed"]] = [
-                "Completed",
-                "Pending",
-                "Failed",
-            ]
-            for i in range(10):
-                tx_type = random.choice(types)
-                amount_val = random.uniform(10, 1000)
-                if tx_type == "Swap":
-                    amount_str = (
-                        f"{amount_val:.2f} USDT -> {amount_val * 45.5:.2f} ASRA"
-                    )
-                elif tx_type in ["Stake", "Unstake"]:
-                    amount_str = f"{amount_val * 10:.2f} ASRA"
-                else:
-                    amount_str = f"${amount_val:.2f}"
-                self.transaction_history.append(
-                    {
-                        "id": str(i + 1),
-                        "type": tx_type,
-                        "status": random.choice(statuses),
-                        "date": (
-                            datetime.date.today()
-                            - datetime.timedelta(days=random.randint(1, 30))
-                        ).strftime("%Y-%m-%d"),
-                        "amount": amount_str,
-                        "hash": f"0x{random.randbytes(32).hex()[:12]}...",
-                    }
-                )
+    async def _load(self):
+        """Load the sections that start expanded; the rest wait for a toggle."""
+        for section, expanded in self.expanded_sections.items():
+            if expanded:
+                await self._load_section(section)
+
+    async def _load_section(self, section: str):
+        if section in self.loaded_sections:
+            return
+        if section == "portfolio":
+            self.portfolio_items = list(PORTFOLIO_ITEMS)
+        elif section == "job_history":
+            jobs = factory.jobs(
+                self.completed_jobs, key=self.router.session.client_token
+            )
+            self.jobs = list(jobs.records())
+        elif section == "tx_history":
+            # The section shows the wallet's windowed history.
+            wallet = await self.get_state(WalletState)
+            wallet._initialize_transactions()
+        self.loaded_sections.append(section)
 
     @rx.event
     def set_profile_view(self, view: ProfileView):
@@ -93,12 +84,46 @@ class ProfileState(rx.State):
 
     @rx.event
     def toggle_section(self, section: str):
-        self.expanded_sections[section] = not self.expanded_sections.get(section, False)
+        expanded = not self.expanded_sections.get(section, False)
+        self.expanded_sections[section] = expanded
+        if expanded and section not in self.loaded_sections:
+            # Render the expanded section (with its placeholder) first.
+            return ProfileState.load_section(section)
 
     @rx.event
-    def download_job_id(self):
+    async def load_section(self, section: str):
+        await self._load_section(section)
+
+    def _job_id_summary(self) -> dict:
+        token = self.router.session.client_token
+        return {
+            "account": "0x" + hashlib.sha256(token.encode()).hexdigest()[:40],
+            "rating": self.worker_rating,
+            "rank": self.worker_rank,
+            "completed_jobs": self.completed_jobs,
+            "jobs": self.jobs,
+        }
+
+    @rx.event(background=True)
+    async def download_job_id(self):
+        """Build (or reuse) the signed JobID bundle and download it."""
+        async with self:
+            await self._load_section("job_history")
+            summary = self._job_id_summary()
+        try:
+            digest = await jobid.bundle(summary)
+        except Exception:
+            yield rx.toast(
+                "JobID Unavailable",
+                description="The JobID bundle could not be generated.",
+                duration=3000,
+            )
+            return
+        yield rx.redirect(
+            f"{rx.config.get_config().api_url}/api/jobid/{digest}", is_external=True
+        )
         yield rx.toast(
             "Download Started",
-            description="Simulating JobID file download...",
+            description="Your JobID bundle is downloading.",
             duration=3000,
         )
\ No newline at end of file
@@ -1,6 +1,8 @@
 import reflex as rx
 from typing import TypedDict, Literal
-import random
+from app.services import governance
+from app.services.catalog import catalog, strip_views
+from app.services.entity_store import PATCH_LIMIT
 
 ProjectStatus = Literal["Pending Confirmation", "In Progress", "Completed", "Disputed"]
 
@@ -16,49 +18,47 @@ class Project(TypedDict):
 
 
 class ProjectsState(rx.State):
-    projects: list[Project] = []
+    _catalog_version: int = 0
+    _status_overrides: dict[int, ProjectStatus] = {}
+    project_patches: dict[str, Project] = {}
+    _projects_rev: int = 0
     is_dispute_modal_open: bool = False
     dispute_project_id: int | None = None
 
-    @rx.event
-    def on_load(self):
-        if not self.projects:
-            self._initialize_projects()
-
-    def _initialize_projects(self):
-        statuses: list[ProjectStatus] = [
-            "Pending Confirmation",
-            "In Progress",
-            "Completed",
-            "Disputed",
-        ]
-        titles = [
-            "DeFi Lending Protocol",
-            "NFT Art Marketplace",
-            "DAO Voting System",
-            "Web3 Gaming Platform",
-            "Multi-sig Wallet UI",
-            "Token Bridge Audit",
+    def _load(self):
+        if not self._catalog_version:
+            self._catalog_version = catalog.snapshot().version
+
+    def __getstate__(self):
+        return strip_views(super().__getstate__(), self.computed_vars["projects"])
+
+    @rx.var(deps=["_catalog_version", "_projects_rev"], auto_deps=False)
+    def projects(self) -> list[Project]:
+        """Shared projects with this session's status changes applied.
+
+        Individual changes go out through `project_patches` instead, so a
+        click ships one project rather than this whole list.
+        """
+        return [
+            {**p, "status": self._status_overrides.get(p["id"], p["status"])}
+            for p in catalog.at(self._catalog_version).projects
         ]
-        for i in range(6):
-            self.projects.append(
-                {
-                    "id": 201 + i,
-                    "title": titles[i],
-                    "budget": random.randint(5000, 20000),
-                    "reward": random.randint(100, 1000),
-                    "status": random.choice(statuses),
-                    "client": f"0x...{random.randbytes(4).hex()}",
-                    "worker": f"0x...{random.randbytes(4).hex()}",
-                }
-            )
+
+    def _set_status(self, project_id: int | None, status: ProjectStatus):
+        project = catalog.at(self._catalog_version).projects.get(project_id)
+        if project is None:
+            return
+        self._status_overrides[project_id] = status
+        if len(self.project_patches) >= PATCH_LIMIT:
+            # Fold the patches into one resend of the list.
+            self.project_patches = {}
+            self._projects_rev += 1
+        else:
+            self.project_patches[str(project_id)] = {**project, "status": status}
 
     @rx.event
     def confirm_work(self, project_id: int):
-        for i, p in enumerate(self.projects):
-            if p["id"] == project_id:
-                self.projects[i]["status"] = "Completed"
-                break
+        self._set_status(project_id, "Completed")
         yield rx.toast(
             "Work Confirmed",
             description=f"Project #{project_id} marked as complete.",
@@ -94,14 +94,24 @@ class ProjectsState(rx.State):
     @rx.event
     def submit_dispute(self, form_data: dict):
         project_id = self.dispute_project_id
-        for i, p in enumerate(self.projects):
-            if p["id"] == project_id:
-                self.projects[i]["status"] = "Disputed"
-                break
+        project = catalog.snapshot().projects.get(project_id)
         self.is_dispute_modal_open = False
         self.dispute_project_id = None
+        if project is None:
+            return
+        self._set_status(project_id, "Disputed")
+        reason = form_data.get("reason", "").strip() or "No reason given."
+        proposal = governance.engine.open(
+            {
+                "id": governance.engine.next_proposal_id(),
+                "title": f"Resolve Dispute: {project['title']}",
+                "description": f"Project #{project_id}: {reason}",
+                "threshold": governance.DISPUTE_THRESHOLD,
+            }
+        )
         yield rx.toast(
             "Dispute Opened",
-            description=f"A DAO proposal has been created for project #{project_id}.",
+            description=f"DAO proposal #{proposal['id']} for project #{project_id} "
+            f"is open for voting until {proposal['closes_at']}.",
             duration=4000,
         )
\ No newline at end of file
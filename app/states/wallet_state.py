@@ -1,16 +1,28 @@
 import reflex as rx
-from typing import TypedDict, Literal
-import datetime
+import asyncio
+import math
 import random
+import time
+from app.services import balances, export, ledger, windowing
+from app.services.factory import factory, scaled
+from app.services.rollups import DayTotals, TypeTotals
+from app.services.transactions import (
+    AMOUNT_SCALE,
+    SWAP_RATE,
+    Transaction,
+    TxStatus,
+    TxType,
+    amounts_for,
+)
 
-
-class Transaction(TypedDict):
-    id: str
-    type: Literal["Deposit", "Withdraw", "Swap", "Stake", "Unstake"]
-    status: Literal["Completed", "Pending", "Failed"]
-    date: str
-    amount: str
-    hash: str
+TX_ROW_HEIGHT = 57
+TX_VIEWPORT_HEIGHT = 480
+# Days shown on the volume and fee charts.
+TX_CHART_DAYS = 30
+# Window boundaries remembered per session as keyset cursors to seek from.
+TX_ANCHOR_LIMIT = 256
+# Seconds before a mock transaction confirms.
+TX_CONFIRM_DELAY = 3
 
 
 class WalletState(rx.State):
@@ -30,44 +42,91 @@ class WalletState(rx.State):
     is_unstake_modal_open: bool = False
     transaction_hash: str = ""
     transactions: list[Transaction] = []
+    tx_total: int = 0
+    tx_window_start: int = 0
+    tx_daily: list[DayTotals] = []
+    tx_by_type: list[TypeTotals] = []
+    # Row position -> cursor of the row just before it, newest first.
+    _tx_anchors: dict[int, tuple[int, int]] = {}
+
+    @property
+    def _ledger_user(self) -> str:
+        return self.router.session.client_token
+
+    def _sync_voting_weight(self):
+        """Publish this account's held + staked ASRA to the balance book."""
+        balances.book.set(self._ledger_user, self.asra_balance + self.staked_asra)
+
+    def _apply_to_balances(self, tx_type: TxType, value: float, fee: float) -> bool:
+        """Move `value` (plus `fee`) between balances; False if they can't cover it."""
+        if tx_type == TxType.DEPOSIT:
+            self.usdt_balance += value
+        elif tx_type in (TxType.WITHDRAW, TxType.SWAP):
+            if value + fee > self.usdt_balance:
+                return False
+            self.usdt_balance -= value + fee
+            if tx_type == TxType.SWAP:
+                self.asra_balance += value * SWAP_RATE
+        elif tx_type == TxType.STAKE:
+            if value + fee > self.asra_balance:
+                return False
+            self.asra_balance -= value + fee
+            self.staked_asra += value
+        elif tx_type == TxType.UNSTAKE:
+            if value > self.staked_asra:
+                return False
+            self.staked_asra -= value
+            self.asra_balance += value - fee
+        self._sync_voting_weight()
+        return True
+
+    def _load_tx_window(self, scroll_top: float = 0):
+        """Load only the rows visible at `scroll_top` into `transactions`."""
+        start, end = windowing.visible_range(
+            scroll_top,
+            row_height=TX_ROW_HEIGHT,
+            viewport_height=TX_VIEWPORT_HEIGHT,
+            total=self.tx_total,
+        )
+        self.tx_window_start = start
+        # Seek from the nearest boundary already loaded above the window,
+        # or from the oldest row when that is closer.
+        anchor = max((p for p in self._tx_anchors if p <= start), default=0)
+        if self.tx_total - end < start - anchor:
+            rows, last = ledger.window(
+                self._ledger_user, self.tx_total - end, end - start, oldest_first=True
+            )
+        else:
+            rows, last = ledger.window(
+                self._ledger_user,
+                start - anchor,
+                end - start,
+                after=self._tx_anchors.get(anchor),
+            )
+        if last is not None:
+            self._tx_anchors[start + len(rows)] = last
+            if len(self._tx_anchors) > TX_ANCHOR_LIMIT:
+                del self._tx_anchors[next(iter(self._tx_anchors))]
+        self.transactions = rows
+
+    def _load_tx_rollups(self):
+        self.tx_daily = ledger.daily_totals(self._ledger_user, TX_CHART_DAYS)
+        self.tx_by_type = ledger.type_totals(self._ledger_user)
 
     def _initialize_transactions(self):
         if self.transactions:
             return
-        types: list[Literal["Deposit", "Withdraw", "Swap", "Stake", "Unstake"]] = [
-            "Deposit",
-            "Withdraw",
-            "Swap",
-            "Stake",
-            "Unstake",
-        ]
-        statuses: list[Literal["Completed", "Pending", "Failed"]] = [
-            "Completed",
-            "Pending",
-            "Failed",
-        ]
-        for i in range(10):
-            tx_type = random.choice(types)
-            amount_val = random.uniform(10, 1000)
-            if tx_type == "Swap":
-                amount_str = f"{amount_val:.2f} USDT -> {amount_val * 45.5:.2f} ASRA"
-            elif tx_type in ["Stake", "Unstake"]:
-                amount_str = f"{amount_val * 10:.2f} ASRA"
-            else:
-                amount_str = f"${amount_val:.2f}"
-            self.transactions.append(
-                {
-                    "id": str(i + 1),
-                    "type": tx_type,
-                    "status": random.choice(statuses),
-                    "date": (
-                        datetime.date.today()
-                        - datetime.timedelta(days=random.randint(1, 30))
-                    ).strftime("%Y-%m-%d"),
-                    "amount": amount_str,
-                    "hash": f"0x{random.randbytes(32).hex()[:12]}...",
-                }
-            )
+        self._tx_anchors = {}
+        self.tx_total = ledger.count(self._ledger_user)
+        if self.tx_total == 0:
+            self._seed_transactions()
+            self.tx_total = ledger.count(self._ledger_user)
+        self._load_tx_window()
+        self._load_tx_rollups()
+
+    def _seed_transactions(self):
+        rows = factory.transactions(scaled(10), key=self._ledger_user)
+        ledger.append(self._ledger_user, rows.records())
 
     @rx.event
     def set_wallet_view(self, view: str):
@@ -75,6 +134,41 @@ class WalletState(rx.State):
         if not self.transactions:
             self._initialize_transactions()
 
+    @rx.event
+    def scroll_transactions(self, scroll_top: float):
+        start, _ = windowing.visible_range(
+            scroll_top,
+            row_height=TX_ROW_HEIGHT,
+            viewport_height=TX_VIEWPORT_HEIGHT,
+            total=self.tx_total,
+        )
+        if start != self.tx_window_start:
+            self._load_tx_window(scroll_top)
+
+    @rx.event
+    def export_transactions(self, form_data: dict):
+        """Open a signed download link for the filtered history."""
+        tx_format = form_data.get("format", "csv")
+        if not export.available(tx_format):
+            return rx.toast(
+                "Export Unavailable",
+                description=f"{tx_format.title()} export is not installed.",
+                duration=3000,
+            )
+        days = form_data.get("days", "all")
+        tx_type = form_data.get("type", "all")
+        request = export.ExportRequest(
+            user=self._ledger_user,
+            format=tx_format,
+            since=None if days == "all" else int(time.time()) - int(days) * 86400,
+            types=() if tx_type == "all" else (TxType[tx_type],),
+        )
+        return rx.redirect(
+            f"{rx.config.get_config().api_url}/api/transactions/export"
+            f"?token={export.sign(request)}",
+            is_external=True,
+        )
+
     @rx.event
     def open_deposit_modal(self):
         self.is_deposit_modal_open = True
@@ -120,11 +214,78 @@ class WalletState(rx.State):
     def close_unstake_modal(self):
         self.is_unstake_modal_open = False
 
+    def _open_transaction_type(self) -> TxType | None:
+        if self.is_deposit_modal_open:
+            return TxType.DEPOSIT
+        if self.is_withdraw_modal_open:
+            return TxType.WITHDRAW
+        if self.is_swap_modal_open:
+            return TxType.SWAP
+        if self.is_stake_modal_open:
+            return TxType.STAKE
+        if self.is_unstake_modal_open:
+            return TxType.UNSTAKE
+        return None
+
     @rx.event
     def mock_transaction(self, form_data: dict):
         self.transaction_hash = f"0x{random.randbytes(32).hex()}"
+        tx_type = self._open_transaction_type()
+        if tx_type is not None:
+            try:
+                amount_val = float(
+                    form_data.get("amount") or form_data.get("usdt_amount") or 0
+                )
+            except ValueError:
+                amount_val = 0.0
+            if not math.isfinite(amount_val) or amount_val < 0:
+                self.transaction_hash = ""
+                yield rx.toast(
+                    "Invalid Amount",
+                    description="Enter a positive number.",
+                    duration=4000,
+                )
+                return
+            amounts = amounts_for(tx_type, amount_val)
+            if not self._apply_to_balances(
+                tx_type, amount_val, amounts["fee"] / AMOUNT_SCALE
+            ):
+                self.transaction_hash = ""
+                yield rx.toast(
+                    "Insufficient Balance",
+                    description="Your balance does not cover this transaction.",
+                    duration=4000,
+                )
+                return
+            ledger.append(
+                self._ledger_user,
+                [
+                    {
+                        "type": tx_type,
+                        "status": TxStatus.PENDING,
+                        "ts": int(time.time()),
+                        **amounts,
+                        "hash": self.transaction_hash,
+                    }
+                ],
+            )
+            self.tx_total += 1
+            # The new row shifts every position below it.
+            self._tx_anchors = {}
+            self._load_tx_window()
+            self._load_tx_rollups()
+            yield WalletState.confirm_transaction(self.transaction_hash)
         yield rx.toast(
             "Transaction Submitted",
             description="Your transaction is being processed.",
             duration=4000,
-        )
\ No newline at end of file
+        )
+
+    @rx.event(background=True)
+    async def confirm_transaction(self, tx_hash: str):
+        """Settle a submitted mock transaction after a short delay."""
+        await asyncio.sleep(TX_CONFIRM_DELAY)
+        async with self:
+            if ledger.set_status(self._ledger_user, tx_hash, TxStatus.COMPLETED):
+                self._load_tx_window(self.tx_window_start * TX_ROW_HEIGHT)
+                self._load_tx_rollups()
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""Headless sessions: app states driven without a browser or socket.
+
+A `Session` builds the root state the way the state manager would for a
+connected client (router data included, so handlers see a client token)
+and calls event handlers directly, whatever their kind: plain, generator,
+coroutine or async generator.
+"""
+
+import inspect
+
+from reflex import constants
+from reflex.istate.data import RouterData
+from reflex.state import BaseState, State
+from reflex.utils import format
+
+import app.app  # noqa: F401  (registers every state)
+
+
+class Session:
+    def __init__(self, token: str):
+        self.root = State(_reflex_internal_init=True)
+        router_data = {
+            constants.RouteVar.CLIENT_TOKEN: token,
+            constants.RouteVar.SESSION_ID: f"sid-{token}",
+            constants.RouteVar.PATH: "/",
+            constants.RouteVar.QUERY: {},
+            constants.RouteVar.HEADERS: {},
+            constants.RouteVar.CLIENT_IP: "127.0.0.1",
+        }
+        self.root.router_data = router_data
+        self.root.router = RouterData.from_router_data(router_data)
+
+    def state(self, cls: type[BaseState]) -> BaseState:
+        return self.root.get_substate(cls.get_full_name().split(".")[1:])
+
+    async def call(self, cls: type[BaseState], handler: str, *args):
+        """Run one handler to completion; returns what it returned or yielded."""
+        out = getattr(cls, handler).fn(self.state(cls), *args)
+        if inspect.isasyncgen(out):
+            return [item async for item in out]
+        if inspect.iscoroutine(out):
+            return await out
+        if inspect.isgenerator(out):
+            return list(out)
+        return out
+
+    def take_delta_bytes(self) -> int:
+        """Size of the JSON delta the client would receive now; then clean."""
+        delta = self.root.get_delta()
+        self.root._clean()
+        return len(format.json_dumps(delta))
+
+    def serialized_bytes(self, cls: type[BaseState]) -> int:
+        """Size of `cls`'s state as a state manager would store it."""
+        return len(self.state(cls)._serialize())
@@ -0,0 +1,430 @@
+"""Load test: many websocket sessions against one local backend process.
+
+    python -m benchmarks.loadgen                            # 10, 100, 1000 sessions
+    python -m benchmarks.loadgen --sessions 1000,10000 --clients 8 --duration 60
+
+For each session count a fresh backend is started (`reflex run --env prod
+--backend-only`, one worker, temporary database) and that many Socket.IO
+clients connect to it the way browser tabs do: hydrate the page, then run
+a scripted journey in a loop (dashboard, community tab with a vote and a
+chat message, wallet tab with its modals and a submitted transaction).
+Like the frontend's event queue, a client sends one event at a time and
+sends the events the backend queues in reply (on_load, listeners) before
+moving on.
+
+Sessions connect over --ramp seconds and are measured for --duration
+seconds. Reported per session count: events per second, p50/p99 round
+trip (event sent to its final update, per step and overall) and the
+backend's RSS and CPU, sampled every second with psutil. The clients are
+spread over --clients processes so the generator isn't the bottleneck.
+"""
+
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import contextlib
+import json
+import os
+import pathlib
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import psutil
+import socketio
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+EVENT_PATH = "/_event"
+ROUTER_DATA = {"pathname": "/", "query": {}, "asPath": "/"}
+# Give up on an event (and count an error) after this many seconds.
+EVENT_TIMEOUT = 30
+STARTUP_TIMEOUT = 180
+
+
+def event_names() -> dict[str, str]:
+    """Full names of the events the journey sends, keyed by handler name."""
+    from reflex.state import OnLoadInternalState, State
+    from reflex.utils import format
+
+    from app.state import AppState
+    from app.states.chat_state import ChatState
+    from app.states.wallet_state import WalletState
+
+    handlers = [
+        OnLoadInternalState.on_load_internal,
+        AppState.set_active_tab,
+        AppState.refresh_metrics,
+        AppState.vote_on_proposal,
+        ChatState.load_chat,
+        ChatState.send_message,
+        WalletState.open_deposit_modal,
+        WalletState.close_deposit_modal,
+        WalletState.open_swap_modal,
+        WalletState.close_swap_modal,
+        WalletState.mock_transaction,
+    ]
+    names = {"hydrate": f"{State.get_full_name()}.hydrate"}
+    for handler in handlers:
+        name = format.format_event_handler(handler)
+        names[name.rpartition(".")[2]] = name
+    return names
+
+
+def open_proposals() -> list[int]:
+    from app.services.catalog import catalog
+
+    proposals = catalog.snapshot().proposals
+    return [p["id"] for p in proposals if p["status"] == "voting"]
+
+
+def journey(names: dict[str, str], proposals: list[int], i: int) -> list[tuple]:
+    """The (label, event name, payload) steps of a session's i-th loop."""
+
+    def tab(label: str, tab_name: str) -> tuple:
+        return label, names["set_active_tab"], {"tab_name": tab_name}
+
+    def click(handler: str, **payload) -> tuple:
+        return handler, names[handler], payload
+
+    return [
+        tab("open dashboard", "Dashboard"),
+        click("refresh_metrics"),
+        tab("open community", "Chat & Community"),
+        click("load_chat"),
+        click("vote_on_proposal", proposal_id=proposals[i % len(proposals)]),
+        click("send_message", form_data={"message": f"load test message {i}"}),
+        tab("open wallet", "Wallet & Staking"),
+        click("open_deposit_modal"),
+        click("mock_transaction", form_data={"amount": "25"}),
+        click("close_deposit_modal"),
+        click("open_swap_modal"),
+        click("close_swap_modal"),
+    ]
+
+
+class Client:
+    """One simulated browser tab."""
+
+    def __init__(self, url: str, token: str, record):
+        self.url = url
+        self.token = token
+        self.record = record
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.sio.on("event", self._on_update, namespace=EVENT_PATH)
+        self._final: asyncio.Future | None = None
+        self._queued: collections.deque[dict] = collections.deque()
+
+    def _on_update(self, update: dict):
+        # Names starting with "_" are handled by the browser (toasts, redirects).
+        self._queued.extend(
+            event for event in update.get("events", ()) if event["name"][0] != "_"
+        )
+        # A background task's push (a confirmation, a chat message) is final
+        # too; one arriving mid-event cuts that event's sample short.
+        if update.get("final") and self._final is not None and not self._final.done():
+            self._final.set_result(None)
+
+    async def connect(self):
+        await self.sio.connect(
+            f"{self.url}?token={self.token}",
+            transports=["websocket"],
+            namespaces=[EVENT_PATH],
+            socketio_path=EVENT_PATH,
+            wait_timeout=EVENT_TIMEOUT,
+        )
+
+    async def send(self, label: str, name: str, payload: dict):
+        """Send an event, then whatever it queued, one at a time."""
+        event = {"name": name, "payload": payload}
+        while True:
+            self._final = asyncio.get_running_loop().create_future()
+            started = time.time()
+            await self.sio.emit(
+                "event",
+                {
+                    **event,
+                    "token": self.token,
+                    # As in the frontend: queued events may come without it.
+                    "router_data": event.get("router_data") or ROUTER_DATA,
+                },
+                namespace=EVENT_PATH,
+            )
+            try:
+                await asyncio.wait_for(self._final, EVENT_TIMEOUT)
+            except asyncio.TimeoutError:
+                self.record(label, started, None)
+            else:
+                self.record(label, started, time.time() - started)
+            if not self._queued:
+                return
+            event = self._queued.popleft()
+            label = f"+ {event['name'].rpartition('.')[2]}"
+
+    async def close(self):
+        with contextlib.suppress(Exception):
+            await self.sio.disconnect()
+
+
+async def _drive(
+    url: str,
+    names: dict[str, str],
+    proposals: list[int],
+    tokens: list[str],
+    starts: list[float],
+    measure_from: float,
+    until: float,
+    think: float,
+) -> dict:
+    latencies: dict[str, list[float]] = collections.defaultdict(list)
+    errors = collections.Counter()
+    connected = 0
+
+    def record(label: str, started: float, latency: float | None):
+        if started < measure_from or started >= until:
+            return
+        if latency is None:
+            errors[label] += 1
+        else:
+            latencies[label].append(latency)
+
+    async def session(token: str, start: float):
+        nonlocal connected
+        await asyncio.sleep(max(0.0, start - time.time()))
+        client = Client(url, token, record)
+        try:
+            await client.connect()
+        except Exception:
+            errors["connect"] += 1
+            return
+        connected += 1
+        try:
+            await client.send("page load", names["hydrate"], {})
+            await client.send("page load", names["on_load_internal"], {})
+            i = 0
+            while time.time() < until:
+                for label, name, payload in journey(names, proposals, i):
+                    await asyncio.sleep(think * random.uniform(0.5, 1.5))
+                    if time.time() >= until:
+                        break
+                    await client.send(label, name, payload)
+                i += 1
+        except Exception:
+            errors["disconnected"] += 1
+        finally:
+            await client.close()
+
+    await asyncio.gather(*map(session, tokens, starts))
+    return {"latencies": latencies, "errors": errors, "connected": connected}
+
+
+def _client_process(kwargs: dict) -> dict:
+    # Each session holds a socket; allow as many as the system does.
+    _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return asyncio.run(_drive(**kwargs))
+
+
+class Backend:
+    """A local backend process with a fresh database."""
+
+    def __init__(self, port: int):
+        self.port = port
+        self.url = f"http://127.0.0.1:{port}"
+        self._tmp = tempfile.TemporaryDirectory()
+        self._process: subprocess.Popen | None = None
+        self._procs: dict[int, psutil.Process] = {}
+
+    def __enter__(self):
+        env = {
+            **os.environ,
+            "ASSURA_SEED": os.environ.get("ASSURA_SEED", "0"),
+            "ASSURA_DB_URL": f"sqlite:///{self._tmp.name}/assura.db",
+            "ASSURA_JOBID_DIR": f"{self._tmp.name}/jobid",
+            "GRANIAN_WORKERS": "1",
+        }
+        self._process = subprocess.Popen(
+            [
+                *(sys.executable, "-m", "reflex", "run"),
+                *("--env", "prod", "--backend-only"),
+                *("--backend-port", str(self.port), "--loglevel", "warning"),
+            ],
+            cwd=ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+        )
+        deadline = time.time() + STARTUP_TIMEOUT
+        while True:
+            if self._process.poll() is not None:
+                raise RuntimeError("The backend exited during startup.")
+            try:
+                urllib.request.urlopen(f"{self.url}/ping", timeout=1).close()
+                break
+            except OSError:
+                if time.time() > deadline:
+                    self.__exit__()
+                    raise RuntimeError("The backend did not start in time.")
+                time.sleep(0.5)
+        self.sample()
+        return self
+
+    def __exit__(self, *exc):
+        # The server runs in its own session, so signal every process.
+        procs = [psutil.Process(self._process.pid)]
+        with contextlib.suppress(psutil.NoSuchProcess):
+            procs += procs[0].children(recursive=True)
+        for proc in procs:
+            with contextlib.suppress(psutil.NoSuchProcess):
+                proc.terminate()
+        _, alive = psutil.wait_procs(procs, timeout=10)
+        for proc in alive:
+            with contextlib.suppress(psutil.NoSuchProcess):
+                proc.kill()
+        self._process.wait()
+        self._tmp.cleanup()
+
+    def sample(self) -> tuple[int, float]:
+        """RSS (bytes) and CPU (% of one core since the last sample) of the server.
+
+        The server is every process under the `reflex run` command (the
+        granian master and its worker), not the command itself.
+        """
+        procs = psutil.Process(self._process.pid).children(recursive=True)
+        rss, cpu = 0, 0.0
+        for proc in procs:
+            # Reuse Process objects: cpu_percent measures since its last call.
+            proc = self._procs.setdefault(proc.pid, proc)
+            with contextlib.suppress(psutil.NoSuchProcess):
+                rss += proc.memory_info().rss
+                cpu += proc.cpu_percent(None)
+        return rss, cpu
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def _latency_row(samples: list[float], errors: int, duration: float) -> dict:
+    return {
+        "events": len(samples),
+        "events_per_s": round(len(samples) / duration, 1),
+        "p50_ms": round(_percentile(samples, 0.50) * 1000, 1),
+        "p99_ms": round(_percentile(samples, 0.99) * 1000, 1),
+        "errors": errors,
+    }
+
+
+def run_level(
+    sessions: int, args: argparse.Namespace, names: dict, proposals: list
+) -> dict:
+    with Backend(args.port) as backend:
+        start = time.time() + 1
+        measure_from = start + args.ramp
+        until = measure_from + args.duration
+        tokens = [f"load-{sessions}-{n}" for n in range(sessions)]
+        starts = [start + args.ramp * n / sessions for n in range(sessions)]
+        clients = min(args.clients, sessions)
+        jobs = [
+            {
+                "url": backend.url,
+                "names": names,
+                "proposals": proposals,
+                "tokens": tokens[k::clients],
+                "starts": starts[k::clients],
+                "measure_from": measure_from,
+                "until": until,
+                "think": args.think,
+            }
+            for k in range(clients)
+        ]
+        with concurrent.futures.ProcessPoolExecutor(clients) as pool:
+            futures = [pool.submit(_client_process, job) for job in jobs]
+            rss, cpu = [], []
+            while not all(future.done() for future in futures):
+                time.sleep(1)
+                now = time.time()
+                if measure_from <= now < until:
+                    sample = backend.sample()
+                    rss.append(sample[0])
+                    cpu.append(sample[1])
+                elif now < measure_from:
+                    backend.sample()
+            results = [future.result() for future in futures]
+
+    latencies = collections.defaultdict(list)
+    errors = collections.Counter()
+    for result in results:
+        for label, samples in result["latencies"].items():
+            latencies[label].extend(samples)
+        errors.update(result["errors"])
+    everything = [sample for samples in latencies.values() for sample in samples]
+    return {
+        "sessions": sessions,
+        "connected": sum(result["connected"] for result in results),
+        **_latency_row(everything, sum(errors.values()), args.duration),
+        "rss_mb_peak": round(max(rss, default=0) / 2**20, 1),
+        "rss_mb_end": round(rss[-1] / 2**20, 1) if rss else 0.0,
+        "cpu_percent_mean": round(sum(cpu) / len(cpu), 1) if cpu else 0.0,
+        "steps": {
+            label: _latency_row(latencies[label], errors[label], args.duration)
+            for label in sorted(latencies.keys() | errors.keys())
+        },
+    }
+
+
+def report(level: dict):
+    print(
+        f"\n{level['sessions']} sessions ({level['connected']} connected): "
+        f"{level['events_per_s']} events/s, p50 {level['p50_ms']} ms, "
+        f"p99 {level['p99_ms']} ms, {level['errors']} errors, "
+        f"RSS {level['rss_mb_peak']} MB peak, CPU {level['cpu_percent_mean']}%"
+    )
+    width = max(map(len, level["steps"]), default=0)
+    for label, row in level["steps"].items():
+        print(
+            f"  {label:<{width}}  {row['events_per_s']:>9}/s"
+            f"  p50 {row['p50_ms']:>8} ms  p99 {row['p99_ms']:>8} ms"
+            + (f"  {row['errors']} errors" if row["errors"] else "")
+        )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", default="10,100,1000")
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--ramp", type=float, default=10, help="seconds")
+    parser.add_argument(
+        "--think", type=float, default=1.0, help="mean seconds between steps"
+    )
+    parser.add_argument("--clients", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--port", type=int, default=0, help="default: any free")
+    parser.add_argument("--out", type=pathlib.Path, help="also write JSON here")
+    args = parser.parse_args()
+    args.port = args.port or _free_port()
+
+    os.environ.setdefault("ASSURA_SEED", "0")
+    names, proposals = event_names(), open_proposals()
+    levels = []
+    for sessions in map(int, args.sessions.split(",")):
+        print(f"Running {sessions} sessions...", file=sys.stderr)
+        levels.append(run_level(sessions, args, names, proposals))
+        report(levels[-1])
+    if args.out:
+        args.out.write_text(json.dumps(levels, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
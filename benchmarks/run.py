@@ -0,0 +1,157 @@
+"""Run the handler benchmarks at several data scales and check for regressions.
+
+    python -m benchmarks.run                      # scales 1 and 100
+    python -m benchmarks.run --scales 1,100,5000  # up to ~1M catalog rows
+    python -m benchmarks.run --scales 1,100,5000 --update-baseline
+
+Each scale runs `benchmarks.suite` in its own process with a fresh
+database, ASSURA_SCALE set and ASSURA_SEED fixed (0 unless already set),
+so runs see the same data. Results are compared with the baseline file;
+any metric past its tolerance is reported and the exit status is 1.
+The baseline stores timings as multiples of the suite's calibration p50
+measured in the same process, so it can be checked on any machine.
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import platform
+import subprocess
+import sys
+import tempfile
+
+BASELINE = pathlib.Path(__file__).with_name("baseline.json")
+COLUMNS = (
+    "p50_ms",
+    "p95_ms",
+    "p99_ms",
+    "alloc_peak_kb",
+    "delta_bytes",
+    "state_bytes",
+)
+TIMINGS = ("p50_ms", "p95_ms", "p99_ms")
+# suite.CALIBRATION; importing the suite would load the app at its scale.
+CALIBRATION = "calibration"
+# A metric regresses when it exceeds baseline * ratio + slack. Timings
+# (in calibration units) get wide margins, since load varies; sizes are
+# deterministic.
+TOLERANCES = {
+    "p50": (1.5, 0.15),
+    "p95": (2.0, 0.3),
+    "alloc_peak_kb": (1.25, 8),
+    "delta_bytes": (1.1, 64),
+    "state_bytes": (1.1, 64),
+}
+
+
+def run_scale(scale: str, repeat: int, names: list[str]) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "ASSURA_SCALE": scale,
+            "ASSURA_SEED": os.environ.get("ASSURA_SEED", "0"),
+            "ASSURA_DB_URL": f"sqlite:///{tmp}/bench.db",
+            "ASSURA_JOBID_DIR": f"{tmp}/jobid",
+            "ASSURA_BENCH_REPEAT": str(repeat),
+        }
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.suite", *names],
+            env=env,
+            stdout=subprocess.PIPE,
+            text=True,
+            check=True,
+        ).stdout
+    # Reflex may print notices first; the results are the last line.
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def relative(scenarios: dict) -> dict:
+    """A scale's results with timings (`p50_ms` -> `p50`) in calibration units."""
+    unit = scenarios[CALIBRATION]["p50_ms"]
+    return {
+        name: {
+            (m.removesuffix("_ms") if m in TIMINGS else m): (
+                round(value / unit, 4) if m in TIMINGS else value
+            )
+            for m, value in metrics.items()
+        }
+        for name, metrics in scenarios.items()
+        if name != CALIBRATION
+    }
+
+
+def regressions(results: dict, baseline: dict) -> list[str]:
+    found = []
+    for scale, scenarios in results.items():
+        for name, metrics in relative(scenarios).items():
+            expected = baseline.get(scale, {}).get(name)
+            if expected is None:
+                continue
+            for metric, (ratio, slack) in TOLERANCES.items():
+                limit = expected[metric] * ratio + slack
+                if metrics[metric] > limit:
+                    unit = " x calibration" if f"{metric}_ms" in TIMINGS else ""
+                    found.append(
+                        f"scale {scale} {name}: {metric} {metrics[metric]}{unit} "
+                        f"> {limit:.3f} (baseline {expected[metric]})"
+                    )
+    return found
+
+
+def report(results: dict):
+    width = max(len(name) for scenarios in results.values() for name in scenarios)
+    for scale, scenarios in results.items():
+        print(f"\nscale {scale} (calibration p50 {scenarios[CALIBRATION]['p50_ms']} ms)")
+        print(f"  {'scenario':<{width}}" + "".join(f"{c:>15}" for c in COLUMNS))
+        for name, metrics in scenarios.items():
+            if name == CALIBRATION:
+                continue
+            print(
+                f"  {name:<{width}}" + "".join(f"{metrics[c]:>15}" for c in COLUMNS)
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="1,100")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--baseline", type=pathlib.Path, default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("scenarios", nargs="*", help="only these scenarios")
+    args = parser.parse_args()
+
+    results = {
+        scale: run_scale(scale, args.repeat, args.scenarios)
+        for scale in args.scales.split(",")
+    }
+    report(results)
+
+    if args.update_baseline:
+        baseline = {}
+        if args.baseline.exists():
+            baseline = json.loads(args.baseline.read_text())
+        for scale, scenarios in results.items():
+            baseline.setdefault(scale, {}).update(relative(scenarios))
+        baseline["_meta"] = {
+            "python": platform.python_version(),
+            "timings": "multiples of the calibration p50",
+        }
+        args.baseline.write_text(
+            json.dumps(baseline, indent=2, sort_keys=True) + "\n"
+        )
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline.")
+        return 0
+    found = regressions(results, json.loads(args.baseline.read_text()))
+    if found:
+        print(f"\n{len(found)} regression(s):", *found, sep="\n  ")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+"""Benchmarks of the state event handlers at the current ASSURA_SCALE.
+
+Prints one JSON object mapping scenario name to its measurements. Run
+through `benchmarks.run`, which sets the scale, seed and database for
+each run; running this module directly uses the environment as is.
+"""
+
+import asyncio
+import dataclasses
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+
+from reflex.state import BaseState
+
+from app.services import governance, search
+from app.services.catalog import catalog
+from app.services.factory import SCALE
+from app.state import AppState
+from app.states.chat_state import ChatState
+from app.states.profile_state import ProfileState
+from app.states.projects_state import ProjectsState
+from app.states.wallet_state import TX_ROW_HEIGHT, WalletState
+from benchmarks.harness import Session
+
+REPEAT = int(os.environ.get("ASSURA_BENCH_REPEAT", "30"))
+# Fixed pure-Python work timed alongside the scenarios; `benchmarks.run`
+# compares timings as multiples of it, so a baseline holds across machines.
+CALIBRATION = "calibration"
+CALIBRATION_REPEAT = 100
+# Every session uses this client token, so the ledger is seeded once.
+TOKEN = "bench-user"
+
+
+@dataclasses.dataclass
+class Scenario:
+    name: str
+    state: type[BaseState]
+    handler: str
+    # Arguments of the i-th call.
+    args: Callable[[int], tuple] = lambda i: ()
+    # Untimed preparation of each session, and of each call.
+    setup: Callable[[Session], Awaitable[None]] | None = None
+    before_call: Callable[[Session, int], Awaitable[None]] | None = None
+    # A new session (cold state, same user) for every call.
+    fresh: bool = False
+
+
+async def _community(session: Session):
+    await session.call(AppState, "set_active_tab", "Chat & Community")
+
+
+async def _search_index(session: Session):
+    # The index is built in a thread at startup; time queries, not the build.
+    while search.get_index() is None:
+        await asyncio.sleep(0.01)
+
+
+async def _dashboard(session: Session):
+    await session.call(AppState, "set_active_tab", "Dashboard")
+
+
+async def _wallet(session: Session):
+    await session.call(AppState, "set_active_tab", "Wallet & Staking")
+    await session.call(WalletState, "open_deposit_modal")
+
+
+async def _projects(session: Session):
+    await session.call(AppState, "set_active_tab", "Projects")
+
+
+async def _chat(session: Session):
+    await session.call(ChatState, "set_room", "general")
+
+
+# Open proposals TOKEN has voting weight on, found by `_voter`.
+_votable: list[int] = []
+
+
+async def _voter(session: Session):
+    await _community(session)
+    if _votable:
+        return
+    # Seeded proposals were snapshotted before TOKEN had any weight.
+    for _ in range(4):
+        governance.engine.open(
+            {
+                "id": governance.engine.next_proposal_id(),
+                "title": "Benchmark Proposal",
+                "description": "Opened by the benchmark suite.",
+                "threshold": governance.DISPUTE_THRESHOLD,
+            }
+        )
+    _votable.extend(
+        p["id"]
+        for p in catalog.snapshot().proposals
+        if p["status"] == "voting" and governance.engine.voting_weight(p["id"], TOKEN) > 0
+    )
+
+
+def _open_proposal(i: int) -> tuple:
+    return (_votable[i % len(_votable)],)
+
+
+def _project(i: int) -> tuple:
+    projects = catalog.snapshot().projects
+    return (list(projects)[i % len(projects)]["id"],)
+
+
+async def _open_dispute(session: Session, i: int):
+    await session.call(ProjectsState, "open_dispute_modal", *_project(i))
+
+
+SCENARIOS = [
+    Scenario("app.on_load", AppState, "on_load", fresh=True),
+    Scenario("app.refresh_metrics", AppState, "refresh_metrics"),
+    Scenario("app.toggle_dark_mode", AppState, "toggle_dark_mode"),
+    Scenario(
+        "app.scroll_suggestions",
+        AppState,
+        "scroll_suggestions",
+        args=lambda i: (float(i * 400),),
+        setup=_dashboard,
+    ),
+    Scenario(
+        "app.set_search_query",
+        AppState,
+        "set_search_query",
+        args=lambda i: ("defi",),
+        setup=_search_index,
+    ),
+    Scenario(
+        "app.set_active_tab.wallet",
+        AppState,
+        "set_active_tab",
+        args=lambda i: ("Wallet & Staking",),
+        fresh=True,
+    ),
+    Scenario(
+        "app.set_active_tab.profile",
+        AppState,
+        "set_active_tab",
+        args=lambda i: ("Profile",),
+        fresh=True,
+    ),
+    Scenario(
+        "app.vote_on_proposal",
+        AppState,
+        "vote_on_proposal",
+        args=_open_proposal,
+        setup=_voter,
+        fresh=True,
+    ),
+    Scenario("chat.load_chat", ChatState, "load_chat", setup=_chat),
+    Scenario(
+        "chat.send_message",
+        ChatState,
+        "send_message",
+        args=lambda i: ({"message": f"benchmark message {i}"},),
+        setup=_chat,
+    ),
+    Scenario(
+        "wallet.scroll_transactions",
+        WalletState,
+        "scroll_transactions",
+        args=lambda i: (float(i * TX_ROW_HEIGHT * 10),),
+        setup=_wallet,
+    ),
+    Scenario(
+        "wallet.mock_transaction",
+        WalletState,
+        "mock_transaction",
+        args=lambda i: ({"amount": "25"},),
+        setup=_wallet,
+    ),
+    Scenario(
+        "projects.open_dispute_modal",
+        ProjectsState,
+        "open_dispute_modal",
+        args=_project,
+        setup=_projects,
+    ),
+    Scenario(
+        "projects.submit_dispute",
+        ProjectsState,
+        "submit_dispute",
+        args=lambda i: ({"reason": "Benchmark dispute"},),
+        setup=_projects,
+        before_call=_open_dispute,
+    ),
+    Scenario(
+        "profile.toggle_section",
+        ProfileState,
+        "toggle_section",
+        args=lambda i: ("job_history",),
+    ),
+    Scenario(
+        "profile.load_section",
+        ProfileState,
+        "load_section",
+        args=lambda i: ("tx_history",),
+        fresh=True,
+    ),
+]
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def measure(scenario: Scenario, repeat: int = REPEAT) -> dict:
+    session = None
+
+    async def prepare(i: int) -> Session:
+        nonlocal session
+        if session is None or scenario.fresh:
+            session = Session(TOKEN)
+            if scenario.setup is not None:
+                await scenario.setup(session)
+        if scenario.before_call is not None:
+            await scenario.before_call(session, i)
+        session.take_delta_bytes()
+        return session
+
+    async def call(session: Session, i: int):
+        await session.call(scenario.state, scenario.handler, *scenario.args(i))
+
+    # Warm-up: imports, caches and lazily built indexes are not measured.
+    await call(await prepare(0), 0)
+    latencies, delta_bytes = [], 0
+    for i in range(1, repeat + 1):
+        current = await prepare(i)
+        started = time.perf_counter()
+        await call(current, i)
+        latencies.append(time.perf_counter() - started)
+        delta_bytes = current.take_delta_bytes()
+
+    current = await prepare(repeat + 1)
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    await call(current, repeat + 1)
+    allocated, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "alloc_peak_kb": round((peak - baseline) / 1024, 1),
+        "alloc_retained_kb": round((allocated - baseline) / 1024, 1),
+        "delta_bytes": delta_bytes,
+        "state_bytes": current.serialized_bytes(scenario.state),
+    }
+
+
+def _calibration_work():
+    rows = [{"id": i, "name": f"row {i}", "tags": [i % 7, i % 11]} for i in range(2000)]
+    rows.sort(key=lambda row: (row["tags"][1], -row["id"]))
+    json.dumps(rows)
+
+
+def calibrate(repeat: int = CALIBRATION_REPEAT) -> dict:
+    """Timings of the calibration work, in the same form as `measure`.
+
+    The collector is off meanwhile: its passes scale with the heap, i.e.
+    with ASSURA_SCALE, and the unit has to depend on the machine alone.
+    """
+    _calibration_work()
+    latencies = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            _calibration_work()
+            latencies.append(time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return {
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+async def main(names: list[str]) -> dict:
+    results = {CALIBRATION: calibrate()}
+    for scenario in SCENARIOS:
+        if names and scenario.name not in names:
+            continue
+        print(f"scale {SCALE:g}: {scenario.name}", file=sys.stderr)
+        results[scenario.name] = await measure(scenario)
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(main(sys.argv[1:]))))